@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 import os
+import random
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Iterable
 
+from sqlalchemy import bindparam, cast, event, func, inspect, literal, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import object_session
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import Session, select
 
-from models import ArCaptureAsset, ArConversionJob, Item
+from metrics import LONG_SECONDS_BUCKETS, registry as metrics_registry, seconds_since
+from models import ArCaptureAsset, ArConversionJob, ArProviderEvent, Item
 
 
 AR_PROVIDER_KIRI = "kiri"
@@ -38,6 +45,37 @@ KIRI_STATUS_SUCCESS = 2
 KIRI_STATUS_QUEUING = 3
 KIRI_STATUS_EXPIRED = 4
 
+# Provider status polling: base delay per status, doubled for every consecutive
+# poll that returns the same status, capped, with +/-10% jitter.
+KIRI_POLL_BASE_DELAY_SECONDS = {
+    KIRI_STATUS_UPLOADING: 10.0,
+    KIRI_STATUS_PROCESSING: 20.0,
+    KIRI_STATUS_QUEUING: 30.0,
+}
+KIRI_POLL_DEFAULT_DELAY_SECONDS = 30.0
+KIRI_POLL_MAX_DELAY_SECONDS = 300.0
+KIRI_POLL_ERROR_BASE_DELAY_SECONDS = 15.0
+KIRI_POLL_ERROR_MAX_DELAY_SECONDS = 600.0
+
+PROVIDER_EVENT_PENDING = "pending"
+PROVIDER_EVENT_PROCESSING = "processing"
+PROVIDER_EVENT_PROCESSED = "processed"
+PROVIDER_EVENT_FAILED = "failed"
+
+AR_TERMINAL_STAGES = frozenset({AR_STAGE_READY, AR_STAGE_FAILED, AR_STAGE_CANCELED})
+
+AR_STAGE_TRANSITIONS_TOTAL = metrics_registry.counter(
+    "menuvium_ar_stage_transitions_total",
+    "Flushed Item.ar_stage changes by previous (\"unknown\" if not loaded) and new stage.",
+    ("from_stage", "to_stage"),
+)
+AR_JOB_SECONDS = metrics_registry.histogram(
+    "menuvium_ar_job_seconds",
+    "Time from queuing an AR job to its terminal stage.",
+    ("stage",),
+    buckets=LONG_SECONDS_BUCKETS,
+)
+
 KIRI_WEBHOOK_HEADER_CANDIDATES = (
     "x-kiri-signature",
     "x-kiri-secret",
@@ -46,6 +84,29 @@ KIRI_WEBHOOK_HEADER_CANDIDATES = (
 )
 
 
+@event.listens_for(Item, "before_update")
+def _record_ar_stage_transition(mapper, connection, target: Item):
+    # Counted at flush (from the attribute history), so intermediate
+    # assignments within one unit of work collapse into one transition.
+    # The previous stage is only known if it was loaded before the
+    # assignment; otherwise it is labelled "unknown" rather than paying a
+    # SELECT per write just to label a counter.
+    history = inspect(target).attrs.ar_stage.history
+    if not history.added:
+        return
+    stage = history.added[0]
+    if history.deleted:
+        previous = history.deleted[0]
+        if stage == previous:
+            return
+        from_stage = previous or "none"
+    else:
+        from_stage = "unknown"
+    AR_STAGE_TRANSITIONS_TOTAL.inc(from_stage=from_stage, to_stage=stage or "none")
+    if stage in AR_TERMINAL_STAGES and target.ar_created_at is not None:
+        AR_JOB_SECONDS.observe(seconds_since(target.ar_created_at), stage=stage)
+
+
 def kiri_api_key() -> str | None:
     return os.getenv("KIRI_API_KEY")
 
@@ -54,6 +115,11 @@ def kiri_enabled() -> bool:
     return bool(kiri_api_key())
 
 
+def ar_webhook_apply_inline() -> bool:
+    """Apply KIRI webhooks on the request path instead of leaving them to the AR workers."""
+    return os.getenv("AR_WEBHOOK_APPLY_INLINE") == "1"
+
+
 def converter_worker_token() -> str | None:
     return os.getenv("AR_CONVERTER_TOKEN")
 
@@ -68,6 +134,38 @@ def set_item_ar_metadata(item: Item, metadata: dict | None) -> None:
     item.ar_metadata_json = metadata or None
 
 
+def item_ar_metadata_patch_statement(item_id, updates: dict):
+    """UPDATE merging `updates` into the stored JSONB document (None values remove keys)."""
+    column = Item.__table__.c.ar_metadata_json
+    document = func.coalesce(column, cast(literal("{}"), JSONB))
+    patch = {key: value for key, value in updates.items() if value is not None}
+    if patch:
+        document = document.op("||")(bindparam("ar_metadata_patch", patch, type_=JSONB))
+    for key, value in updates.items():
+        if value is None:
+            document = document.op("-")(literal(key))
+    return update(Item.__table__).where(Item.__table__.c.id == item_id).values(ar_metadata_json=document)
+
+
+def _patch_item_ar_metadata_in_place(item: Item, updates: dict, merged: dict) -> bool:
+    """Apply `updates` with a partial JSONB update on Postgres instead of rewriting the document.
+
+    Returns False (caller does a full rewrite) off Postgres, for unsaved items,
+    or when the document already has unflushed changes in this session.
+    """
+    session = object_session(item)
+    if session is None:
+        return False
+    state = inspect(item)
+    if not state.persistent or state.attrs.ar_metadata_json.history.has_changes():
+        return False
+    if session.get_bind().dialect.name != "postgresql":
+        return False
+    session.execute(item_ar_metadata_patch_statement(item.id, updates))
+    set_committed_value(item, "ar_metadata_json", merged or None)
+    return True
+
+
 def update_item_ar_metadata(item: Item, **updates) -> dict:
     metadata = get_item_ar_metadata(item)
     for key, value in updates.items():
@@ -75,10 +173,41 @@ def update_item_ar_metadata(item: Item, **updates) -> dict:
             metadata.pop(key, None)
         else:
             metadata[key] = value
-    set_item_ar_metadata(item, metadata)
+    if _patch_item_ar_metadata_in_place(item, updates, metadata):
+        if "serialize" in updates:
+            item.ar_provider_serialize = metadata.get("serialize")
+    else:
+        set_item_ar_metadata(item, metadata)
     return metadata
 
 
+def schedule_item_ar_poll(item: Item, *, delay_seconds: float = 0.0) -> None:
+    """Mark the item's provider job as due for a status poll after delay_seconds."""
+    item.ar_next_poll_at = datetime.utcnow() + timedelta(seconds=max(0.0, delay_seconds))
+
+
+def _jittered(delay: float) -> float:
+    return delay * random.uniform(0.9, 1.1)
+
+
+def next_provider_poll_delay(provider_status: int | None, attempt: int) -> float:
+    """Delay before re-polling a job whose provider status has been unchanged for `attempt` polls."""
+    base = KIRI_POLL_BASE_DELAY_SECONDS.get(provider_status, KIRI_POLL_DEFAULT_DELAY_SECONDS)
+    return _jittered(min(KIRI_POLL_MAX_DELAY_SECONDS, base * (2 ** min(max(attempt, 0), 10))))
+
+
+def next_provider_poll_error_delay(consecutive_errors: int) -> float:
+    """Delay before retrying after `consecutive_errors` failed status polls in a row."""
+    exponent = min(max(consecutive_errors - 1, 0), 10)
+    return _jittered(min(KIRI_POLL_ERROR_MAX_DELAY_SECONDS, KIRI_POLL_ERROR_BASE_DELAY_SECONDS * (2 ** exponent)))
+
+
+def clear_item_ar_poll(item: Item) -> None:
+    item.ar_next_poll_at = None
+    item.ar_lease_owner = None
+    item.ar_lease_expires_at = None
+
+
 def sorted_capture_assets(captures: Iterable[ArCaptureAsset]) -> list[ArCaptureAsset]:
     return sorted(captures, key=lambda capture: (capture.position, capture.created_at, str(capture.id)))
 
@@ -141,11 +270,14 @@ def queue_kiri_generation(
     item.ar_created_at = now
     item.ar_updated_at = now
     item.ar_job_id = uuid.uuid4()
+    clear_item_ar_poll(item)
     reset_ar_outputs(item, preserve_usdz=False)
     update_item_ar_metadata(
         item,
         serialize=None,
         provider_status=None,
+        provider_poll_attempt=None,
+        provider_poll_errors=None,
         provider_message=None,
         provider_calculate_type=None,
         provider_input_kind=None,
@@ -195,6 +327,7 @@ def queue_conversion_from_existing_usdz(
 
     item.ar_status = "processing"
     item.ar_error_message = None
+    item.ar_next_poll_at = None
     item.ar_stage = AR_STAGE_CONVERSION_QUEUED
     item.ar_stage_detail = detail or "Queued GLB conversion"
     item.ar_progress = max(float(item.ar_progress or 0.0), 0.8)
@@ -225,6 +358,7 @@ def fail_item_ar(
 ) -> None:
     item.ar_status = "failed"
     item.ar_error_message = error_message[:4000]
+    item.ar_next_poll_at = None
     item.ar_stage = stage
     item.ar_stage_detail = detail
     item.ar_progress = None
@@ -234,3 +368,87 @@ def fail_item_ar(
 
 def is_item_ar_active(item: Item) -> bool:
     return item.ar_status in {"pending", "processing"} and item.ar_stage != AR_STAGE_CANCELED
+
+
+def provider_event_dedupe_key(
+    provider: str,
+    serialize: str,
+    provider_status: int,
+    *,
+    delivery_id: str | None = None,
+    previous_event_id: uuid.UUID | None = None,
+) -> str:
+    """Inbox key shared by redeliveries of one provider notification.
+
+    With a provider event id the key is exact (timestamps are not used: they
+    can change between redeliveries).
+    Without one, a redelivery is the same status arriving right after itself,
+    so the key names the serialize's previous event: a status that legitimately
+    comes back later (processing -> queuing -> processing) gets a new row.
+    """
+    if delivery_id:
+        return f"{provider}:{serialize}:{provider_status}:{delivery_id}"
+    return f"{provider}:{serialize}:{provider_status}:after:{previous_event_id or 'none'}"
+
+
+def record_provider_event(
+    session: Session,
+    *,
+    provider: str,
+    serialize: str,
+    provider_status: int,
+    payload: dict | None = None,
+    delivery_id: str | None = None,
+) -> tuple[ArProviderEvent, bool]:
+    """Insert a webhook delivery into the inbox; returns (event, created).
+
+    A duplicate returns the existing row. A duplicate of an event that
+    previously exhausted its attempts is re-queued.
+    """
+    existing = None
+    previous_event_id = None
+    if not delivery_id:
+        latest = session.exec(
+            select(ArProviderEvent)
+            .where(ArProviderEvent.provider == provider)
+            .where(ArProviderEvent.serialize == serialize)
+            .order_by(ArProviderEvent.received_at.desc())
+            .limit(1)
+        ).first()
+        if latest is not None and latest.provider_status == provider_status:
+            existing = latest
+        elif latest is not None:
+            previous_event_id = latest.id
+    dedupe_key = provider_event_dedupe_key(
+        provider,
+        serialize,
+        provider_status,
+        delivery_id=delivery_id,
+        previous_event_id=previous_event_id,
+    )
+    if existing is None:
+        existing = session.exec(select(ArProviderEvent).where(ArProviderEvent.dedupe_key == dedupe_key)).first()
+    if existing is None:
+        event = ArProviderEvent(
+            provider=provider,
+            dedupe_key=dedupe_key,
+            serialize=serialize,
+            provider_status=provider_status,
+            payload_json=payload,
+        )
+        session.add(event)
+        try:
+            session.commit()
+            return event, True
+        except IntegrityError:
+            # A concurrent redelivery inserted it first.
+            session.rollback()
+            existing = session.exec(select(ArProviderEvent).where(ArProviderEvent.dedupe_key == dedupe_key)).one()
+
+    if existing.status == PROVIDER_EVENT_FAILED:
+        existing.status = PROVIDER_EVENT_PENDING
+        existing.attempts = 0
+        existing.available_at = datetime.utcnow()
+        session.add(existing)
+        session.commit()
+    return existing, False
@@ -0,0 +1,179 @@
+"""
+Admission control for local AR video processing.
+
+Frame extraction is CPU- and disk-heavy and runs inside the API process, so
+jobs queue here instead of all starting ffmpeg at once:
+
+- at most AR_VIDEO_MAX_CONCURRENT_JOBS jobs run at a time (default: one per
+  four usable cores, at least one);
+- the scratch space reserved by running jobs stays under
+  AR_VIDEO_SCRATCH_BUDGET_MB (a job larger than the budget runs alone);
+- each job's ffmpeg thread count is derived from the cores left after
+  AR_VIDEO_RESERVED_CORES are kept for the API itself.
+
+Waiters are admitted in arrival order. snapshot() exposes queue depth.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+
+MB = 1024 * 1024
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def available_cores() -> int:
+    """Cores this process may run on (respects CPU affinity / cpusets)."""
+    try:
+        return max(len(os.sched_getaffinity(0)), 1)
+    except (AttributeError, OSError):
+        return max(os.cpu_count() or 1, 1)
+
+
+@dataclass
+class VideoJobSlot:
+    job_id: str
+    threads: int
+    scratch_bytes: int
+    waited_seconds: float
+
+
+class VideoJobScheduler:
+    def __init__(
+        self,
+        *,
+        max_jobs: int,
+        scratch_budget_bytes: int,
+        worker_cores: int,
+        fixed_threads: Optional[int] = None,
+    ):
+        self.max_jobs = max(1, max_jobs)
+        self.scratch_budget_bytes = max(0, scratch_budget_bytes)
+        self.worker_cores = max(1, worker_cores)
+        self.fixed_threads = fixed_threads
+        self._condition = threading.Condition()
+        self._tickets = itertools.count()
+        self._queue: list[int] = []
+        self._running: dict[str, int] = {}
+        self._scratch_reserved = 0
+        self._completed = 0
+
+    @classmethod
+    def from_env(cls) -> "VideoJobScheduler":
+        cores = available_cores()
+        reserved = max(_env_int("AR_VIDEO_RESERVED_CORES", 1), 0)
+        worker_cores = max(cores - reserved, 1)
+        fixed_threads = _env_int("AR_VIDEO_FFMPEG_THREADS", 0) or None
+        return cls(
+            max_jobs=_env_int("AR_VIDEO_MAX_CONCURRENT_JOBS", max(worker_cores // 4, 1)),
+            scratch_budget_bytes=_env_int("AR_VIDEO_SCRATCH_BUDGET_MB", 8192) * MB,
+            worker_cores=worker_cores,
+            fixed_threads=fixed_threads,
+        )
+
+    def threads_per_job(self) -> int:
+        if self.fixed_threads:
+            return max(self.fixed_threads, 1)
+        return max(self.worker_cores // self.max_jobs, 1)
+
+    def _can_admit(self, ticket: int, scratch_bytes: int) -> bool:
+        if not self._queue or self._queue[0] != ticket:
+            return False
+        if len(self._running) >= self.max_jobs:
+            return False
+        if not self._running:
+            return True
+        return self._scratch_reserved + scratch_bytes <= self.scratch_budget_bytes
+
+    @contextmanager
+    def admit(
+        self,
+        job_id: str,
+        *,
+        scratch_bytes: int = 0,
+        on_wait: Optional[Callable[[int], None]] = None,
+        wait_report_seconds: float = 15.0,
+    ) -> Iterator[VideoJobSlot]:
+        """Block until the job may run; on_wait(jobs_ahead) is called while queued."""
+        started = time.monotonic()
+        with self._condition:
+            ticket = next(self._tickets)
+            self._queue.append(ticket)
+            last_reported: Optional[int] = None
+            try:
+                while not self._can_admit(ticket, scratch_bytes):
+                    ahead = self._queue.index(ticket) + len(self._running)
+                    if on_wait is not None and ahead != last_reported:
+                        last_reported = ahead
+                        self._condition.release()
+                        try:
+                            on_wait(ahead)
+                        finally:
+                            self._condition.acquire()
+                        continue
+                    self._condition.wait(timeout=wait_report_seconds)
+            finally:
+                self._queue.remove(ticket)
+                self._condition.notify_all()
+            self._running[job_id] = scratch_bytes
+            self._scratch_reserved += scratch_bytes
+
+        slot = VideoJobSlot(
+            job_id=job_id,
+            threads=self.threads_per_job(),
+            scratch_bytes=scratch_bytes,
+            waited_seconds=time.monotonic() - started,
+        )
+        try:
+            yield slot
+        finally:
+            with self._condition:
+                self._scratch_reserved -= self._running.pop(job_id, 0)
+                self._completed += 1
+                self._condition.notify_all()
+
+    def snapshot(self) -> dict[str, int]:
+        with self._condition:
+            return {
+                "running": len(self._running),
+                "queued": len(self._queue),
+                "max_jobs": self.max_jobs,
+                "threads_per_job": self.threads_per_job(),
+                "scratch_reserved_bytes": self._scratch_reserved,
+                "scratch_budget_bytes": self.scratch_budget_bytes,
+                "completed": self._completed,
+            }
+
+
+_scheduler: Optional[VideoJobScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_video_scheduler() -> VideoJobScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = VideoJobScheduler.from_env()
+    return _scheduler
+
+
+def default_scratch_bytes() -> int:
+    """Scratch reserved per video job (source copy plus candidate and selected frames)."""
+    return max(_env_int("AR_VIDEO_SCRATCH_PER_JOB_MB", 1024), 1) * MB
@@ -1,24 +1,31 @@
 from __future__ import annotations
 
-import shutil
+import asyncio
+import socket
 import tempfile
 import threading
 import time
 import traceback
 import uuid
 import zipfile
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import os
 import requests
+from sqlalchemy import and_, delete, func, or_
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
 from ar_pipeline import (
     AR_CAPTURE_MODE_FEATURELESS,
     AR_PROVIDER_KIRI,
+    AR_STAGE_CANCELED,
     AR_STAGE_CONVERSION_QUEUED,
+    AR_STAGE_CONVERTING_GLB,
     AR_STAGE_DOWNLOADING_USDZ,
     AR_STAGE_KIRI_PROCESSING,
     AR_STAGE_UPLOADING_TO_KIRI,
@@ -28,18 +35,27 @@ from ar_pipeline import (
     KIRI_STATUS_QUEUING,
     KIRI_STATUS_SUCCESS,
     KIRI_STATUS_UPLOADING,
+    PROVIDER_EVENT_FAILED,
+    PROVIDER_EVENT_PENDING,
+    PROVIDER_EVENT_PROCESSED,
+    PROVIDER_EVENT_PROCESSING,
     fail_item_ar,
     get_item_ar_metadata,
     is_item_ar_active,
     kiri_api_key,
     kiri_enabled,
+    next_provider_poll_delay,
+    next_provider_poll_error_delay,
     queue_conversion_from_existing_usdz,
+    schedule_item_ar_poll,
     select_generation_input,
     update_item_ar_metadata,
 )
+from ar_video_scheduler import default_scratch_bytes, get_video_scheduler
 from database import get_engine
-from kiri_client import KiriApiError, KiriClient
-from models import Category, Item, Menu
+from kiri_client import AsyncKiriClient, KiriApiError, KiriClient, KiriModelStatus
+from metrics import registry as metrics_registry
+from models import ArProviderEvent, Category, Item, Menu
 from storage_keys import (
     item_ar_current_usdz_key,
     item_ar_run_frames_key,
@@ -47,17 +63,115 @@ from storage_keys import (
     item_ar_run_provider_original_usdz_key,
     item_ar_run_source_video_key,
 )
-from storage_utils import copy_storage_key, materialize_storage_key_to_path, store_file_from_path
+from storage_utils import copy_storage_key, materialize_storage_key_to_path, store_file_from_path, store_fileobj
 from video_frame_extractor import extract_video_frames_to_images
 
 
 POLL_INTERVAL_SECONDS = 5
+LEASE_SECONDS = 120
+PROVIDER_EVENT_MAX_ATTEMPTS = 5
+PROVIDER_EVENT_PRUNE_INTERVAL_SECONDS = 3600
+# Stages where the provider job is finished and the converter owns the item.
+_NON_POLLABLE_STAGES = (AR_STAGE_CONVERSION_QUEUED, AR_STAGE_CONVERTING_GLB, AR_STAGE_CANCELED)
+
+AR_WORKER_ITERATIONS_TOTAL = metrics_registry.counter(
+    "menuvium_ar_worker_iterations_total",
+    "AR worker loop iterations by the work they did (idle iterations sleep).",
+    ("work",),
+)
 
 
 def _log(message: str) -> None:
     print(f"[ar-worker] {message}")
 
 
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def _worker_concurrency() -> int:
+    return max(1, _env_int("AR_WORKER_CONCURRENCY", 2))
+
+
+def _submit_pending_enabled() -> bool:
+    # Pending scans are normally claimed by the external AR worker through
+    # /ar-jobs/generations/claim; the in-process path is opt-in.
+    return os.getenv("AR_WORKER_SUBMIT_PENDING") == "1"
+
+
+def _provider_event_retention_days() -> int:
+    return max(1, _env_int("AR_PROVIDER_EVENT_RETENTION_DAYS", 7))
+
+
+def _poll_batch_size() -> int:
+    return max(1, _env_int("AR_WORKER_POLL_BATCH", 25))
+
+
+def _transfer_concurrency() -> int:
+    return max(1, _env_int("AR_TRANSFER_CONCURRENCY", 8))
+
+
+_transfer_pool: ThreadPoolExecutor | None = None
+_transfer_pool_lock = threading.Lock()
+
+
+def _transfer_executor() -> ThreadPoolExecutor:
+    """Shared pool for storage transfers; only leaf upload/download calls run on it."""
+    global _transfer_pool
+    if _transfer_pool is None:
+        with _transfer_pool_lock:
+            if _transfer_pool is None:
+                _transfer_pool = ThreadPoolExecutor(
+                    max_workers=_transfer_concurrency(),
+                    thread_name_prefix="ar-transfer",
+                )
+    return _transfer_pool
+
+
+def _materialize_captures(capture_refs: list[dict], temp_path: Path) -> list[Path]:
+    destinations = [
+        temp_path / f"{capture['position']:04d}-{Path(capture['s3_key']).name}"
+        for capture in capture_refs
+    ]
+    futures = [
+        _transfer_executor().submit(
+            materialize_storage_key_to_path,
+            key=capture["s3_key"],
+            destination=destination,
+        )
+        for capture, destination in zip(capture_refs, destinations)
+    ]
+    try:
+        for future in futures:
+            future.result()
+    finally:
+        _drain_futures(futures)
+    return destinations
+
+
+def _drain_futures(futures: list[Future]) -> None:
+    """Cancel what has not started and wait for the rest, ignoring their errors.
+
+    Transfers read from the job's temp directory, so they must be finished
+    before it is removed.
+    """
+    for future in futures:
+        future.cancel()
+    for future in futures:
+        if future.cancelled():
+            continue
+        try:
+            future.result()
+        except Exception:
+            pass
+
+
 def start_worker():
     if os.getenv("MENUVIUM_DISABLE_AR_WORKER") == "1":
         _log("Disabled by MENUVIUM_DISABLE_AR_WORKER=1")
@@ -65,24 +179,145 @@ def start_worker():
     if not kiri_enabled():
         _log("Provider API key not configured; AR status worker not started")
         return None
-    thread = threading.Thread(target=_worker_loop, daemon=True, name="kiri-ar-worker")
-    thread.start()
-    _log(f"Background AR status worker started with poll interval {POLL_INTERVAL_SECONDS}s")
-    return thread
+    concurrency = _worker_concurrency()
+    host_id = f"{socket.gethostname()}:{os.getpid()}"
+    threads = []
+    for index in range(concurrency):
+        worker_id = f"{host_id}:{index}"
+        thread = threading.Thread(
+            target=_worker_loop,
+            args=(worker_id,),
+            daemon=True,
+            name=f"kiri-ar-worker-{index}",
+        )
+        thread.start()
+        threads.append(thread)
+    _log(
+        f"Background AR status workers started: concurrency={concurrency} "
+        f"poll interval {POLL_INTERVAL_SECONDS}s lease {LEASE_SECONDS}s"
+    )
+    return threads
 
 
-def _worker_loop():
+def _worker_loop(worker_id: str):
     while True:
         try:
-            if _poll_next_processing_job():
+            if _process_provider_events(worker_id):
+                AR_WORKER_ITERATIONS_TOTAL.inc(work="provider_events")
                 continue
-            time.sleep(POLL_INTERVAL_SECONDS)
+            if _poll_next_processing_job(worker_id):
+                AR_WORKER_ITERATIONS_TOTAL.inc(work="poll")
+                continue
+            if _submit_pending_enabled() and _submit_next_pending_job(worker_id):
+                AR_WORKER_ITERATIONS_TOTAL.inc(work="submit")
+                continue
+            AR_WORKER_ITERATIONS_TOTAL.inc(work="idle")
+            _prune_provider_events()
+            time.sleep(_idle_sleep_seconds())
         except Exception as exc:
-            _log(f"Worker error: {exc}")
+            _log(f"Worker {worker_id} error: {exc}")
             traceback.print_exc()
             time.sleep(POLL_INTERVAL_SECONDS)
 
 
+# ---------------------------------------------------------------------------
+# Leases
+# ---------------------------------------------------------------------------
+
+def _lease_available_clause(now: datetime):
+    return or_(Item.ar_lease_expires_at.is_(None), Item.ar_lease_expires_at < now)
+
+
+def _renew_lease(item_id, worker_id: str) -> bool:
+    engine = get_engine()
+    with Session(engine) as session:
+        item = session.get(Item, item_id)
+        if not item or item.ar_lease_owner != worker_id:
+            return False
+        item.ar_lease_expires_at = datetime.utcnow() + timedelta(seconds=LEASE_SECONDS)
+        session.add(item)
+        session.commit()
+        return True
+
+
+def _release_lease(item_id, worker_id: str, *, next_poll_delay: float | None = None) -> None:
+    """Drop the lease if this worker still holds it.
+
+    If the item is still overdue (the poll bailed out before rescheduling it),
+    push its next poll out by next_poll_delay so it is not reclaimed in a hot loop.
+    """
+    engine = get_engine()
+    with Session(engine) as session:
+        item = session.get(Item, item_id)
+        if not item or item.ar_lease_owner != worker_id:
+            return
+        item.ar_lease_owner = None
+        item.ar_lease_expires_at = None
+        if (
+            next_poll_delay is not None
+            and item.ar_next_poll_at is not None
+            and item.ar_next_poll_at <= datetime.utcnow()
+        ):
+            schedule_item_ar_poll(item, delay_seconds=next_poll_delay)
+        session.add(item)
+        session.commit()
+
+
+def _acquire_item_lease(item_id, worker_id: str) -> bool:
+    """Take the item lease unless another worker holds it (re-entrant for this worker)."""
+    engine = get_engine()
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        item = session.exec(
+            select(Item)
+            .where(Item.id == item_id)
+            .where(or_(_lease_available_clause(now), Item.ar_lease_owner == worker_id))
+            .with_for_update(skip_locked=True)
+        ).first()
+        if not item:
+            return False
+        item.ar_lease_owner = worker_id
+        item.ar_lease_expires_at = now + timedelta(seconds=LEASE_SECONDS)
+        session.add(item)
+        session.commit()
+        return True
+
+
+@contextmanager
+def _lease_heartbeat(item_id, worker_id: str):
+    """Keep renewing the item lease while long work (uploads, finalization) runs."""
+    with _batch_lease_heartbeat([item_id], worker_id):
+        yield
+
+
+@contextmanager
+def _batch_lease_heartbeat(item_ids: list, worker_id: str):
+    """Keep renewing every lease in a claimed batch until the block exits.
+
+    A lease that was lost (taken over after expiry) is dropped from the beat.
+    """
+    stop = threading.Event()
+    held = list(item_ids)
+
+    def _beat():
+        while held and not stop.wait(LEASE_SECONDS / 3):
+            for item_id in list(held):
+                try:
+                    if not _renew_lease(item_id, worker_id):
+                        held.remove(item_id)
+                except Exception as exc:
+                    _log(f"Lease heartbeat failed for item {item_id}: {exc}")
+
+    label = item_ids[0] if len(item_ids) == 1 else f"batch-{len(item_ids)}"
+    thread = threading.Thread(target=_beat, daemon=True, name=f"ar-lease-{label}")
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join(timeout=1)
+
+
 def _kiri_client() -> KiriClient:
     api_key = kiri_api_key()
     if not api_key:
@@ -90,6 +325,50 @@ def _kiri_client() -> KiriClient:
     return KiriClient(api_key=api_key)
 
 
+_poll_loop: asyncio.AbstractEventLoop | None = None
+_async_kiri: AsyncKiriClient | None = None
+_async_kiri_key: str | None = None
+_poll_loop_lock = threading.Lock()
+
+
+def _kiri_poll_loop() -> asyncio.AbstractEventLoop:
+    """Event loop thread shared by all workers so status polls reuse one connection pool."""
+    global _poll_loop
+    if _poll_loop is None:
+        with _poll_loop_lock:
+            if _poll_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, daemon=True, name="kiri-poll-loop")
+                thread.start()
+                _poll_loop = loop
+    return _poll_loop
+
+
+def _async_kiri_client() -> AsyncKiriClient:
+    global _async_kiri, _async_kiri_key
+    api_key = kiri_api_key()
+    if not api_key:
+        raise RuntimeError("KIRI_API_KEY is not configured")
+    with _poll_loop_lock:
+        if _async_kiri is None or _async_kiri_key != api_key:
+            _async_kiri = AsyncKiriClient(api_key=api_key)
+            _async_kiri_key = api_key
+        return _async_kiri
+
+
+def _fetch_kiri_statuses(serializes: list[str]) -> dict[str, KiriModelStatus | KiriApiError]:
+    """Run a concurrent, rate-limited status batch on the shared loop and wait for it."""
+    client = _async_kiri_client()
+    future = asyncio.run_coroutine_threadsafe(client.get_statuses(serializes), _kiri_poll_loop())
+    # Generous bound: every request is itself capped by timeouts and retry attempts.
+    try:
+        return future.result(timeout=LEASE_SECONDS)
+    except FutureTimeoutError:
+        # Stop the abandoned batch from holding rate-limit tokens and connections.
+        future.cancel()
+        raise
+
+
 def _format_kiri_submission_error(exc: KiriApiError, *, capture_input_kind: str) -> str:
     if capture_input_kind == "video":
         if exc.code == 2009:
@@ -134,15 +413,15 @@ def _photo_scan_submission_options() -> dict[str, int]:
     }
 
 
-def _persist_extracted_frames(
+def _start_frame_persistence(
     *,
     org_id,
     item_id,
     run_id: str,
     frame_paths: list[Path],
-) -> dict[str, object]:
-    storage_prefix = f"orgs/{org_id}/items/{item_id}/ar/runs/{run_id}/input/frames_all"
-    persisted_frames: list[dict[str, object]] = []
+) -> list[tuple[dict[str, object], Future]]:
+    """Queue one upload per extracted frame; collect with _collect_persisted_frames."""
+    pending: list[tuple[dict[str, object], Future]] = []
     for index, frame_path in enumerate(frame_paths, start=1):
         key = item_ar_run_frames_key(
             org_id,
@@ -151,23 +430,99 @@ def _persist_extracted_frames(
             f"frame-{index:04d}{frame_path.suffix or '.jpg'}",
             selected=False,
         )
-        url = store_file_from_path(
+        future = _transfer_executor().submit(
+            store_file_from_path,
             source_path=frame_path,
             key=key,
             content_type="image/jpeg",
         )
-        persisted_frames.append(
-            {
-                "index": index,
-                "filename": frame_path.name,
-                "s3_key": key,
-                "url": url,
-            }
+        pending.append(
+            (
+                {
+                    "index": index,
+                    "filename": frame_path.name,
+                    "s3_key": key,
+                },
+                future,
+            )
         )
-    return {
+    return pending
+
+
+def _collect_persisted_frames(
+    *,
+    org_id,
+    item_id,
+    run_id: str,
+    pending: list[tuple[dict[str, object], Future]],
+) -> dict[str, object]:
+    storage_prefix = f"orgs/{org_id}/items/{item_id}/ar/runs/{run_id}/input/frames_all"
+    persisted_frames: list[dict[str, object]] = []
+    errors: list[str] = []
+    for frame, future in pending:
+        try:
+            url = future.result()
+        except Exception as exc:
+            errors.append(f"{frame['filename']}: {_sanitize_provider_error_text(exc)}")
+            continue
+        persisted_frames.append({**frame, "url": url})
+    result: dict[str, object] = {
         "storage_prefix": storage_prefix,
         "persisted_frames": persisted_frames,
     }
+    if errors:
+        # Debug frames are best effort once the provider has the scan.
+        result["persist_error"] = f"{len(errors)} frame(s) failed to upload; first: {errors[0]}"
+    return result
+
+
+class _UploadProgressReporter:
+    """Maps provider upload bytes onto ar_progress 0.12 -> 0.2, writing at most every few seconds."""
+
+    START = 0.12
+    END = 0.2
+    MIN_INTERVAL_SECONDS = 2.0
+
+    def __init__(self, item_id):
+        self.item_id = item_id
+        self._last_write = 0.0
+        self._last_percent = -1
+
+    def __call__(self, bytes_sent: int, total_bytes: int) -> None:
+        if total_bytes <= 0:
+            return
+        percent = min(int(bytes_sent * 100 / total_bytes), 100)
+        now = time.monotonic()
+        if percent == self._last_percent:
+            return
+        if percent < 100 and now - self._last_write < self.MIN_INTERVAL_SECONDS:
+            return
+        self._last_percent = percent
+        self._last_write = now
+        try:
+            with Session(get_engine()) as session:
+                item = session.get(Item, self.item_id)
+                if not item or item.ar_stage != AR_STAGE_UPLOADING_TO_KIRI:
+                    return
+                item.ar_progress = round(self.START + (self.END - self.START) * percent / 100, 3)
+                item.ar_stage_detail = f"Uploading scan data ({percent}%)"
+                item.ar_updated_at = datetime.utcnow()
+                session.add(item)
+                session.commit()
+        except Exception as exc:
+            # Progress is cosmetic; never fail the upload over it.
+            _log(f"Upload progress update failed for item {self.item_id}: {exc}")
+
+
+def _mark_waiting_for_video_slot(item_id, jobs_ahead: int) -> None:
+    with Session(get_engine()) as session:
+        item = session.get(Item, item_id)
+        if not item or item.ar_status != "processing":
+            return
+        item.ar_stage_detail = f"Waiting for a video processing slot ({jobs_ahead} ahead)"
+        item.ar_updated_at = datetime.utcnow()
+        session.add(item)
+        session.commit()
 
 
 def _item_org_id(session: Session, item: Item):
@@ -180,15 +535,18 @@ def _item_org_id(session: Session, item: Item):
     return menu.org_id
 
 
-def _submit_next_pending_job() -> bool:
+def _submit_next_pending_job(worker_id: str) -> bool:
     engine = get_engine()
+    now = datetime.utcnow()
     with Session(engine) as session:
         item = session.exec(
             select(Item)
             .where(Item.ar_provider == AR_PROVIDER_KIRI)
             .where(Item.ar_status == "pending")
+            .where(_lease_available_clause(now))
             .order_by(Item.ar_created_at)
             .limit(1)
+            .with_for_update(skip_locked=True)
         ).first()
         if not item:
             return False
@@ -196,42 +554,285 @@ def _submit_next_pending_job() -> bool:
         item.ar_stage = AR_STAGE_UPLOADING_TO_KIRI
         item.ar_stage_detail = "Preparing scan upload"
         item.ar_progress = 0.05
-        item.ar_updated_at = datetime.utcnow()
+        item.ar_updated_at = now
+        item.ar_lease_owner = worker_id
+        item.ar_lease_expires_at = now + timedelta(seconds=LEASE_SECONDS)
         session.add(item)
         session.commit()
         item_id = item.id
 
-    _process_pending_item(item_id)
+    try:
+        with _lease_heartbeat(item_id, worker_id):
+            _process_pending_item(item_id)
+    finally:
+        _release_lease(item_id, worker_id)
     return True
 
 
-def _poll_next_processing_job() -> bool:
+def _claim_due_polls(worker_id: str, limit: int) -> list[tuple[object, str]]:
+    """Lease up to `limit` items whose provider polls are due, most overdue first.
+
+    Uses the same skip-locked claim as the external worker endpoints, so API
+    replicas never poll the provider for the same item concurrently.
+    """
+    engine = get_engine()
+    while True:
+        now = datetime.utcnow()
+        with Session(engine) as session:
+            items = session.exec(
+                select(Item)
+                .where(Item.ar_provider == AR_PROVIDER_KIRI)
+                .where(Item.ar_status == "processing")
+                .where(Item.ar_next_poll_at.is_not(None))
+                .where(Item.ar_next_poll_at <= now)
+                .where(or_(Item.ar_stage.is_(None), Item.ar_stage.not_in(_NON_POLLABLE_STAGES)))
+                .where(_lease_available_clause(now))
+                .order_by(Item.ar_next_poll_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not items:
+                return []
+            claimed: list[tuple[object, str]] = []
+            for item in items:
+                serialize = get_item_ar_metadata(item).get("serialize")
+                if not serialize:
+                    # Nothing submitted to the provider yet; wait for a submission to reschedule it.
+                    item.ar_next_poll_at = None
+                else:
+                    item.ar_lease_owner = worker_id
+                    item.ar_lease_expires_at = now + timedelta(seconds=LEASE_SECONDS)
+                    claimed.append((item.id, serialize))
+                session.add(item)
+            session.commit()
+            if not claimed:
+                continue
+            _log(f"Worker {worker_id} leased {len(claimed)} item(s) for provider polling")
+            return claimed
+
+
+def _claim_next_poll(worker_id: str) -> tuple[object, str] | None:
+    """Lease the single most overdue poll."""
+    claimed = _claim_due_polls(worker_id, 1)
+    return claimed[0] if claimed else None
+
+
+def _idle_sleep_seconds() -> float:
+    """Sleep until the earliest scheduled poll or inbox event is due, at most POLL_INTERVAL_SECONDS."""
     engine = get_engine()
     with Session(engine) as session:
-        items = session.exec(
-            select(Item)
+        next_poll = session.exec(
+            select(func.min(Item.ar_next_poll_at))
             .where(Item.ar_provider == AR_PROVIDER_KIRI)
             .where(Item.ar_status == "processing")
-            .order_by(Item.ar_updated_at)
-            .limit(20)
+        ).first()
+        next_event = session.exec(
+            select(func.min(ArProviderEvent.available_at)).where(ArProviderEvent.status == PROVIDER_EVENT_PENDING)
+        ).first()
+    candidates = [due for due in (next_poll, next_event) if due is not None]
+    if not candidates:
+        return POLL_INTERVAL_SECONDS
+    next_due = min(candidates)
+    remaining = (next_due - datetime.utcnow()).total_seconds()
+    return max(0.5, min(POLL_INTERVAL_SECONDS, remaining))
+
+
+def _poll_next_processing_job(worker_id: str) -> bool:
+    """Claim a batch of due polls, fetch their statuses concurrently, then apply them.
+
+    The whole batch is heartbeated from the status fetch until every result
+    is applied: the fetch may wait up to a lease length, and one SUCCESS
+    finalization (download, USDZ store, conversion enqueue) can outlast the
+    leases of the items waiting behind it. Cheap status updates go first for
+    the same reason.
+    """
+    claimed = _claim_due_polls(worker_id, _poll_batch_size())
+    if not claimed:
+        return False
+    try:
+        with _batch_lease_heartbeat([item_id for item_id, _ in claimed], worker_id):
+            try:
+                results = _fetch_kiri_statuses([serialize for _, serialize in claimed])
+            except Exception as exc:
+                results = {serialize: KiriApiError(f"Status batch failed: {exc}") for _, serialize in claimed}
+
+            def _finalizes(entry: tuple[object, str]) -> bool:
+                result = results.get(entry[1])
+                return isinstance(result, KiriModelStatus) and result.status == KIRI_STATUS_SUCCESS
+
+            for item_id, serialize in sorted(claimed, key=_finalizes):
+                if not _renew_lease(item_id, worker_id):
+                    _log(f"Worker {worker_id} lost lease on item {item_id}; skipping stale poll result")
+                    continue
+                _apply_poll_result(item_id, serialize, results.get(serialize))
+    finally:
+        for item_id, _ in claimed:
+            _release_lease(item_id, worker_id, next_poll_delay=POLL_INTERVAL_SECONDS)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Webhook inbox
+# ---------------------------------------------------------------------------
+
+def _claim_provider_events(worker_id: str, limit: int, *, event_id=None) -> list[tuple[object, str, int]]:
+    """Lease due inbox events (and events whose worker died mid-apply), oldest first.
+
+    With event_id, claims just that event even if its retry is not due yet.
+    """
+    engine = get_engine()
+    now = datetime.utcnow()
+    pending = ArProviderEvent.status == PROVIDER_EVENT_PENDING
+    if event_id is None:
+        pending = and_(pending, ArProviderEvent.available_at <= now)
+    statement = select(ArProviderEvent).where(
+        or_(
+            pending,
+            and_(
+                ArProviderEvent.status == PROVIDER_EVENT_PROCESSING,
+                ArProviderEvent.lease_expires_at < now,
+            ),
+        )
+    )
+    if event_id is not None:
+        statement = statement.where(ArProviderEvent.id == event_id)
+    with Session(engine) as session:
+        events = session.exec(
+            statement
+            .order_by(ArProviderEvent.received_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
         ).all()
+        claimed = []
+        for event in events:
+            event.status = PROVIDER_EVENT_PROCESSING
+            event.lease_owner = worker_id
+            event.lease_expires_at = now + timedelta(seconds=LEASE_SECONDS)
+            event.attempts += 1
+            session.add(event)
+            claimed.append((event.id, event.serialize, event.provider_status))
+        session.commit()
+    return claimed
 
-        for item in items:
-            if item.ar_stage in {AR_STAGE_CONVERSION_QUEUED, "converting_glb"}:
-                continue
-            metadata = get_item_ar_metadata(item)
-            serialize = metadata.get("serialize")
-            if serialize:
-                item_id = item.id
-                _log(
-                    f"Polling item {item.id} serialize={serialize} stage={item.ar_stage} provider_status={metadata.get('provider_status')}"
-                )
-                break
-        else:
-            return False
 
-    _poll_item_status(item_id)
-    return True
+def _finish_provider_event(
+    event_id,
+    worker_id: str,
+    *,
+    status: str,
+    matched: bool | None = None,
+    error: str | None = None,
+    retry_in: float | None = None,
+    count_attempt: bool = True,
+) -> None:
+    engine = get_engine()
+    with Session(engine) as session:
+        event = session.get(ArProviderEvent, event_id)
+        if not event:
+            return
+        if status == PROVIDER_EVENT_PENDING and event.lease_owner != worker_id:
+            # Another worker took the event over; let it decide.
+            return
+        event.status = status
+        event.lease_owner = None
+        event.lease_expires_at = None
+        if not count_attempt:
+            event.attempts = max(event.attempts - 1, 0)
+        if matched is not None:
+            event.matched = matched
+        if error is not None:
+            event.last_error = error[:4000]
+        if retry_in is not None:
+            event.available_at = datetime.utcnow() + timedelta(seconds=retry_in)
+        if status == PROVIDER_EVENT_PROCESSED:
+            event.processed_at = datetime.utcnow()
+        session.add(event)
+        session.commit()
+
+
+def _apply_provider_event(event_id, serialize: str, provider_status: int, worker_id: str) -> None:
+    engine = get_engine()
+    with Session(engine) as session:
+        item = _find_item_by_serialize(session=session, serialize=serialize)
+        item_id = item.id if item else None
+        attempts = session.get(ArProviderEvent, event_id).attempts
+    if item_id is None:
+        _finish_provider_event(event_id, worker_id, status=PROVIDER_EVENT_PROCESSED, matched=False)
+        return
+
+    # The item lease serializes webhook events with status polls, so a webhook and
+    # a poll reporting success never finalize the same model twice.
+    if not _acquire_item_lease(item_id, worker_id):
+        _finish_provider_event(
+            event_id,
+            worker_id,
+            status=PROVIDER_EVENT_PENDING,
+            retry_in=POLL_INTERVAL_SECONDS,
+            count_attempt=False,
+        )
+        return
+
+    try:
+        with _lease_heartbeat(item_id, worker_id):
+            matched = handle_kiri_status_update(serialize=serialize, provider_status=provider_status, source="webhook")
+    except Exception as exc:
+        _log(f"Webhook event {event_id} for serialize={serialize} failed (attempt {attempts}): {exc}")
+        exhausted = attempts >= PROVIDER_EVENT_MAX_ATTEMPTS
+        _finish_provider_event(
+            event_id,
+            worker_id,
+            status=PROVIDER_EVENT_FAILED if exhausted else PROVIDER_EVENT_PENDING,
+            error=_sanitize_provider_error_text(exc),
+            retry_in=None if exhausted else next_provider_poll_error_delay(attempts),
+        )
+    else:
+        _finish_provider_event(event_id, worker_id, status=PROVIDER_EVENT_PROCESSED, matched=matched)
+    finally:
+        _release_lease(item_id, worker_id, next_poll_delay=POLL_INTERVAL_SECONDS)
+
+
+def _process_provider_events(worker_id: str) -> bool:
+    claimed = _claim_provider_events(worker_id, _poll_batch_size())
+    for event_id, serialize, provider_status in claimed:
+        _apply_provider_event(event_id, serialize, provider_status, worker_id)
+    return bool(claimed)
+
+
+def apply_provider_event_inline(event_id) -> bool:
+    """Apply one inbox event in the calling thread; returns whether it was processed.
+
+    Used by the webhook when AR_WEBHOOK_APPLY_INLINE=1 (deployments without
+    AR workers). An event that could not be applied stays in the inbox for a
+    redelivery or a worker to pick up.
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:webhook-{threading.get_ident()}"
+    for claimed_id, serialize, provider_status in _claim_provider_events(worker_id, 1, event_id=event_id):
+        _apply_provider_event(claimed_id, serialize, provider_status, worker_id)
+    engine = get_engine()
+    with Session(engine) as session:
+        event = session.get(ArProviderEvent, event_id)
+        return event is not None and event.status == PROVIDER_EVENT_PROCESSED
+
+
+_last_event_prune = 0.0
+
+
+def _prune_provider_events() -> None:
+    """Drop applied inbox events past the retention window (at most once an hour per process)."""
+    global _last_event_prune
+    now = time.monotonic()
+    if _last_event_prune and now - _last_event_prune < PROVIDER_EVENT_PRUNE_INTERVAL_SECONDS:
+        return
+    _last_event_prune = now
+    cutoff = datetime.utcnow() - timedelta(days=_provider_event_retention_days())
+    engine = get_engine()
+    with Session(engine) as session:
+        session.exec(
+            delete(ArProviderEvent)
+            .where(ArProviderEvent.status == PROVIDER_EVENT_PROCESSED)
+            .where(ArProviderEvent.processed_at < cutoff)
+        )
+        session.commit()
 
 
 def _load_item_with_captures(session: Session, item_id) -> Item | None:
@@ -278,20 +879,29 @@ def _process_pending_item(item_id) -> None:
         session.add(item)
         session.commit()
 
-    with tempfile.TemporaryDirectory(prefix=f"menuvium-kiri-{item_id}-") as temp_dir:
+    if capture_input_kind == "video":
+        admission = get_video_scheduler().admit(
+            str(item_id),
+            scratch_bytes=default_scratch_bytes(),
+            on_wait=lambda ahead: _mark_waiting_for_video_slot(item_id, ahead),
+        )
+    else:
+        admission = nullcontext(None)
+
+    with admission as video_slot, tempfile.TemporaryDirectory(prefix=f"menuvium-kiri-{item_id}-") as temp_dir:
         temp_path = Path(temp_dir)
-        materialized_paths = []
         provider_input_kind = capture_input_kind
         frame_extraction_metadata = None
+        background: list[Future] = []
+        frame_uploads: list[tuple[dict[str, object], Future]] = []
         try:
-            for capture in selected_capture_refs:
-                destination = temp_path / f"{capture['position']:04d}-{Path(capture['s3_key']).name}"
-                materialize_storage_key_to_path(key=capture["s3_key"], destination=destination)
-                materialized_paths.append(destination)
+            materialized_paths = _materialize_captures(selected_capture_refs, temp_path)
 
             submission_paths = materialized_paths
             if capture_input_kind == "video":
-                store_file_from_path(
+                # Archive the source video while ffmpeg works on the local copy.
+                source_upload = _transfer_executor().submit(
+                    store_file_from_path,
                     source_path=materialized_paths[0],
                     key=item_ar_run_source_video_key(
                         org_id,
@@ -301,10 +911,13 @@ def _process_pending_item(item_id) -> None:
                     ),
                     content_type="video/mp4",
                 )
+                background.append(source_upload)
                 extracted = extract_video_frames_to_images(
                     video_path=materialized_paths[0],
                     output_dir=temp_path / "extracted-frames",
+                    threads=video_slot.threads,
                 )
+                source_upload.result()
                 submission_paths = extracted.frame_paths
                 provider_input_kind = "images"
                 frame_extraction_metadata = {
@@ -315,42 +928,57 @@ def _process_pending_item(item_id) -> None:
                     "submitted_frame_count": len(extracted.frame_paths),
                     "used_normalized_video": extracted.used_normalized_video,
                 }
-                frame_extraction_metadata.update(
-                    _persist_extracted_frames(
-                        org_id=org_id,
-                        item_id=item_id,
-                        run_id=job_run_id,
-                        frame_paths=extracted.frame_paths,
-                    )
+                # Frame archival overlaps the provider upload and is collected afterwards.
+                frame_uploads = _start_frame_persistence(
+                    org_id=org_id,
+                    item_id=item_id,
+                    run_id=job_run_id,
+                    frame_paths=extracted.frame_paths,
                 )
+                background.extend(future for _, future in frame_uploads)
 
             client = _kiri_client()
             photo_scan_options = _photo_scan_submission_options()
+            upload_progress = _UploadProgressReporter(item_id)
             if capture_mode == AR_CAPTURE_MODE_FEATURELESS:
                 if provider_input_kind == "images":
                     submitted = client.submit_featureless_images(
                         image_paths=submission_paths,
                         file_format="usdz",
+                        progress_callback=upload_progress,
                     )
                 else:
                     submitted = client.submit_featureless_video(
                         video_path=submission_paths[0],
                         file_format="usdz",
+                        progress_callback=upload_progress,
                     )
             else:
                 if provider_input_kind == "images":
                     submitted = client.submit_photo_images(
                         image_paths=submission_paths,
                         file_format="usdz",
+                        progress_callback=upload_progress,
                         **photo_scan_options,
                     )
                 else:
                     submitted = client.submit_photo_video(
                         video_path=submission_paths[0],
                         file_format="usdz",
+                        progress_callback=upload_progress,
                         **photo_scan_options,
                     )
+            if frame_uploads:
+                frame_extraction_metadata.update(
+                    _collect_persisted_frames(
+                        org_id=org_id,
+                        item_id=item_id,
+                        run_id=job_run_id,
+                        pending=frame_uploads,
+                    )
+                )
         except KiriApiError as exc:
+            _drain_futures(background)
             with Session(engine) as session:
                 item = session.get(Item, item_id)
                 if item:
@@ -372,6 +1000,7 @@ def _process_pending_item(item_id) -> None:
                     session.commit()
             return
         except Exception as exc:
+            _drain_futures(background)
             with Session(engine) as session:
                 item = session.get(Item, item_id)
                 if item:
@@ -407,6 +1036,7 @@ def _process_pending_item(item_id) -> None:
         item.ar_stage_detail = "Waiting for the model to finish processing"
         item.ar_progress = 0.2
         item.ar_updated_at = datetime.utcnow()
+        schedule_item_ar_poll(item, delay_seconds=next_provider_poll_delay(KIRI_STATUS_QUEUING, 0))
         update_item_ar_metadata(
             item,
             serialize=submitted.serialize,
@@ -420,31 +1050,38 @@ def _process_pending_item(item_id) -> None:
         session.commit()
 
 
-def _poll_item_status(item_id) -> None:
+def _apply_poll_result(item_id, serialize: str, result: KiriModelStatus | KiriApiError | None) -> None:
     engine = get_engine()
     with Session(engine) as session:
         item = session.get(Item, item_id)
         if not item or item.ar_provider != AR_PROVIDER_KIRI or item.ar_status != "processing":
             return
-        metadata = get_item_ar_metadata(item)
-        serialize = metadata.get("serialize")
-        if not serialize:
+        if get_item_ar_metadata(item).get("serialize") != serialize:
+            # Resubmitted while the batch was in flight; the next poll picks up the new job.
             return
 
-    try:
-        status = _kiri_client().get_status(serialize=serialize)
-        _log(f"Polled serialize={serialize} -> provider_status={status.status}")
-    except KiriApiError as exc:
-        with Session(engine) as session:
-            item = session.get(Item, item_id)
-            if item and is_item_ar_active(item):
-                update_item_ar_metadata(item, provider_message=f"Status poll failed: {exc}")
-                item.ar_updated_at = datetime.utcnow()
-                session.add(item)
-                session.commit()
+    if not isinstance(result, KiriModelStatus):
+        _record_poll_error(item_id, result or KiriApiError("No status returned"))
         return
+    _log(f"Polled serialize={serialize} -> provider_status={result.status}")
+    handle_kiri_status_update(serialize=result.serialize, provider_status=result.status, source="poll")
 
-    handle_kiri_status_update(serialize=status.serialize, provider_status=status.status, source="poll")
+
+def _record_poll_error(item_id, exc: Exception) -> None:
+    engine = get_engine()
+    with Session(engine) as session:
+        item = session.get(Item, item_id)
+        if item and is_item_ar_active(item):
+            errors = int(get_item_ar_metadata(item).get("provider_poll_errors") or 0) + 1
+            update_item_ar_metadata(
+                item,
+                provider_message=f"Status poll failed: {exc}",
+                provider_poll_errors=errors,
+            )
+            schedule_item_ar_poll(item, delay_seconds=next_provider_poll_error_delay(errors))
+            item.ar_updated_at = datetime.utcnow()
+            session.add(item)
+            session.commit()
 
 
 def handle_kiri_status_update(*, serialize: str, provider_status: int, source: str) -> bool:
@@ -454,7 +1091,18 @@ def handle_kiri_status_update(*, serialize: str, provider_status: int, source: s
         if not item:
             return False
 
-        update_item_ar_metadata(item, provider_status=provider_status)
+        metadata = get_item_ar_metadata(item)
+        # A webhook or a status change is fresh information, so the backoff restarts.
+        if source == "poll" and metadata.get("provider_status") == provider_status:
+            poll_attempt = int(metadata.get("provider_poll_attempt") or 0) + 1
+        else:
+            poll_attempt = 0
+        update_item_ar_metadata(
+            item,
+            provider_status=provider_status,
+            provider_poll_attempt=poll_attempt,
+            provider_poll_errors=None if source == "poll" else metadata.get("provider_poll_errors"),
+        )
         item.ar_updated_at = datetime.utcnow()
 
         if not is_item_ar_active(item):
@@ -462,6 +1110,8 @@ def handle_kiri_status_update(*, serialize: str, provider_status: int, source: s
             session.commit()
             return True
 
+        schedule_item_ar_poll(item, delay_seconds=next_provider_poll_delay(provider_status, poll_attempt))
+
         _log(
             f"Status update for item {item.id} serialize={serialize}: provider_status={provider_status} source={source} stage_before={item.ar_stage}"
         )
@@ -474,6 +1124,8 @@ def handle_kiri_status_update(*, serialize: str, provider_status: int, source: s
             item.ar_stage_detail = "Processing the 3D model"
             item.ar_progress = max(float(item.ar_progress or 0.0), 0.45 if provider_status == KIRI_STATUS_QUEUING else 0.65)
         elif provider_status == KIRI_STATUS_SUCCESS:
+            # Finalization clears the schedule; this only fires if it dies midway.
+            schedule_item_ar_poll(item, delay_seconds=LEASE_SECONDS * 5)
             session.add(item)
             session.commit()
             _finalize_successful_kiri_job(item.id, serialize=serialize, source=source)
@@ -536,49 +1188,35 @@ def _finalize_successful_kiri_job(item_id, *, serialize: str, source: str) -> No
 
     try:
         with tempfile.TemporaryDirectory(prefix=f"menuvium-kiri-model-{item_id}-") as temp_dir:
-            temp_path = Path(temp_dir)
-            zip_path = temp_path / "model.zip"
-            extract_dir = temp_path / "unzipped"
-            extract_dir.mkdir(parents=True, exist_ok=True)
-
-            with requests.get(model_zip.model_url, stream=True, timeout=300) as response:
-                response.raise_for_status()
-                with zip_path.open("wb") as handle:
-                    shutil.copyfileobj(response.raw, handle)
+            zip_path = Path(temp_dir) / "model.zip"
+            _download_to_path(model_zip.model_url, zip_path)
             _log(f"Downloaded model zip for item {item_id} serialize={serialize}")
 
-            with zipfile.ZipFile(zip_path) as archive:
-                archive.extractall(extract_dir)
-
+            # The archive copy and the USDZ extraction upload in parallel.
             zip_storage_key = item_ar_run_provider_model_zip_key(org_id, item_id, run_id, zip_path.name)
-            store_file_from_path(
+            zip_upload = _transfer_executor().submit(
+                store_file_from_path,
                 source_path=zip_path,
                 key=zip_storage_key,
                 content_type="application/zip",
             )
-
-            usdz_candidates = sorted(extract_dir.rglob("*.usdz"))
-            if not usdz_candidates:
-                raise RuntimeError("The model provider returned a model zip without a USDZ file")
-
-            usdz_path = usdz_candidates[0]
-            provider_usdz_key = item_ar_run_provider_original_usdz_key(
-                org_id,
-                item_id,
-                run_id,
-                "original.usdz",
-            )
-            provider_usdz_url = store_file_from_path(
-                source_path=usdz_path,
-                key=provider_usdz_key,
-                content_type="model/vnd.usdz+zip",
-            )
-            current_usdz_key = item_ar_current_usdz_key(org_id, item_id)
-            current_usdz_url = copy_storage_key(
-                source_key=provider_usdz_key,
-                destination_key=current_usdz_key,
-                content_type="model/vnd.usdz+zip",
-            )
+            try:
+                provider_usdz_key = item_ar_run_provider_original_usdz_key(
+                    org_id,
+                    item_id,
+                    run_id,
+                    "original.usdz",
+                )
+                provider_usdz_url = _store_usdz_member(zip_path, key=provider_usdz_key)
+                current_usdz_key = item_ar_current_usdz_key(org_id, item_id)
+                current_usdz_url = copy_storage_key(
+                    source_key=provider_usdz_key,
+                    destination_key=current_usdz_key,
+                    content_type="model/vnd.usdz+zip",
+                )
+                zip_upload.result()
+            finally:
+                _drain_futures([zip_upload])
             _log(f"Stored provider USDZ for item {item_id} at {provider_usdz_key} and refreshed {current_usdz_key}")
     except Exception as exc:
         with Session(engine) as session:
@@ -618,15 +1256,32 @@ def _finalize_successful_kiri_job(item_id, *, serialize: str, source: str) -> No
         session.commit()
 
 
+def _download_to_path(url: str, destination: Path) -> None:
+    with requests.get(url, stream=True, timeout=300) as response:
+        response.raise_for_status()
+        with destination.open("wb") as handle:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                handle.write(chunk)
+
+
+def _store_usdz_member(zip_path: Path, *, key: str) -> str:
+    """Upload the archive's first .usdz member straight from the zip, without unpacking the rest."""
+    with zipfile.ZipFile(zip_path) as archive:
+        members = sorted(
+            (info for info in archive.infolist() if not info.is_dir() and info.filename.lower().endswith(".usdz")),
+            key=lambda info: info.filename,
+        )
+        if not members:
+            raise RuntimeError("The model provider returned a model zip without a USDZ file")
+        with archive.open(members[0]) as usdz_stream:
+            return store_fileobj(fileobj=usdz_stream, key=key, content_type="model/vnd.usdz+zip")
+
+
 def _find_item_by_serialize(*, session: Session, serialize: str) -> Item | None:
-    items = session.exec(
+    return session.exec(
         select(Item)
+        .where(Item.ar_provider_serialize == serialize)
         .where(Item.ar_provider == AR_PROVIDER_KIRI)
         .where(Item.ar_status.in_(["pending", "processing", "failed"]))
         .options(selectinload(Item.ar_capture_assets))
-    ).all()
-    for item in items:
-        metadata = get_item_ar_metadata(item)
-        if metadata.get("serialize") == serialize:
-            return item
-    return None
+    ).first()
@@ -0,0 +1,11 @@
+"""
+Benchmarks for the API's hot paths.
+
+Run from services/api, e.g.
+
+    python -m benchmarks.public_menu --preset typical --out bench.json
+    python -m benchmarks.public_menu --baseline bench.json
+
+Results are written as JSON (with the git commit and environment) so runs can
+be compared across commits; --baseline exits non-zero on a regression.
+"""
@@ -0,0 +1,174 @@
+"""
+Timing, result storage and baseline comparison shared by the benchmark suites.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+
+RESULTS_SCHEMA_VERSION = 1
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = pct / 100.0 * (len(ordered) - 1)
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    p95_ms: float
+    max_ms: float
+    stdev_ms: float
+    ops_per_second: float
+    extra: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_samples(cls, name: str, samples_ms: list[float], **extra) -> "BenchmarkResult":
+        median = statistics.median(samples_ms)
+        return cls(
+            name=name,
+            iterations=len(samples_ms),
+            min_ms=round(min(samples_ms), 4),
+            median_ms=round(median, 4),
+            mean_ms=round(statistics.fmean(samples_ms), 4),
+            p95_ms=round(percentile(samples_ms, 95), 4),
+            max_ms=round(max(samples_ms), 4),
+            stdev_ms=round(statistics.pstdev(samples_ms), 4),
+            ops_per_second=round(1000.0 / median, 2) if median > 0 else 0.0,
+            extra=extra,
+        )
+
+
+def run_benchmark(
+    name: str,
+    function: Callable[[], object],
+    *,
+    iterations: int,
+    warmup: int = 3,
+    setup: Optional[Callable[[], None]] = None,
+) -> BenchmarkResult:
+    """Time `function` over `iterations` runs after `warmup` untimed runs.
+
+    `setup` runs before every call (warmups included) outside the timed
+    region. GC is disabled while timing so collections do not land on
+    arbitrary samples.
+    """
+    for _ in range(max(warmup, 0)):
+        if setup is not None:
+            setup()
+        function()
+    samples: list[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(max(iterations, 1)):
+            if setup is not None:
+                setup()
+            started = time.perf_counter_ns()
+            function()
+            samples.append((time.perf_counter_ns() - started) / 1_000_000)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return BenchmarkResult.from_samples(name, samples)
+
+
+# ---------------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def environment_info() -> dict:
+    return {
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def build_report(suite: str, *, config: dict, results: list[BenchmarkResult]) -> dict:
+    return {
+        "schema": RESULTS_SCHEMA_VERSION,
+        "suite": suite,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment_info(),
+        "config": config,
+        "results": {result.name: asdict(result) for result in results},
+    }
+
+
+def write_report(path: Path, report: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def load_report(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+def compare_reports(current: dict, baseline: dict, *, tolerance: float) -> list[str]:
+    """Benchmarks whose median slowed down by more than `tolerance` (0.2 = 20%)."""
+    regressions = []
+    for name, result in current.get("results", {}).items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("median_ms"):
+            continue
+        ratio = result["median_ms"] / previous["median_ms"]
+        if ratio > 1.0 + tolerance:
+            regressions.append(
+                f"{name}: median {previous['median_ms']:.3f}ms -> {result['median_ms']:.3f}ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def format_table(results: list[BenchmarkResult]) -> str:
+    header = f"{'benchmark':<36} {'iters':>6} {'median ms':>10} {'p95 ms':>10} {'ops/s':>10}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        lines.append(
+            f"{result.name:<36} {result.iterations:>6} {result.median_ms:>10.3f} "
+            f"{result.p95_ms:>10.3f} {result.ops_per_second:>10.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,378 @@
+"""
+Menu importer pipeline benchmark over recorded restaurant sites.
+
+Every cassette directory under benchmarks/fixtures/importer/ (see
+importer/replay.py) is replayed through worker._process_job against a
+temporary SQLite database, together with a cassette built on the fly from the
+bundled demo_menu export (a synthetic site for "The Gilded Fork" parsed by
+the no-OpenAI fallback path). Per cassette the report holds wall time, time
+per pipeline stage and per dish stage, CPU time, and the tracemalloc peak
+(measured in a separate pass, since tracing slows the run down).
+
+Recording a new cassette runs a live import with whatever API keys are set:
+
+    python benchmarks/importer_pipeline.py record NAME --restaurant "..." [--location ...] [--website ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from html import escape
+from pathlib import Path
+from typing import Iterator, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from benchmarks.harness import BenchmarkResult, build_report, compare_reports, format_table, load_report, write_report
+from importer import replay, utils, worker
+from importer.ai_chunker import clear_response_cache
+from models import ImportJob
+
+
+SUITE = "importer_pipeline"
+FIXTURES_DIR = ROOT / "benchmarks" / "fixtures" / "importer"
+DEMO_MENU_DIR = ROOT.parents[1] / "demo_menu"
+DEMO_SITE = "https://gilded-fork.example"
+LOCAL_OUTPUT_DIR = Path("/tmp/menu-importer")
+
+# Latencies given to the synthetic demo site, roughly what a small restaurant
+# site on shared hosting answers with.
+DEMO_PAGE_LATENCY_S = 0.15
+DEMO_IMAGE_LATENCY_S = 0.4
+
+PIPELINE_STAGES = ("resolve_website", "extract_menu", "dish_stages", "build_manifest", "finish_zip", "store_zip")
+DISH_STAGES = ("search", "enhance", "zip")
+
+
+# ---------------------------------------------------------------------------
+# Cassettes
+# ---------------------------------------------------------------------------
+
+def _demo_pages(manifest: dict, images: dict[str, str]) -> tuple[str, str]:
+    title = escape(manifest["menu_name"])
+    home = (
+        f"<html><head><title>{title}</title></head><body>"
+        f"<nav><a href=\"/\">Home</a> <a href=\"/menu\">Our Menu</a></nav>"
+        f"<main><h1>{title}</h1><p>Seasonal cooking in the heart of the city.</p></main>"
+        "</body></html>"
+    )
+    sections = []
+    for category in manifest["categories"]:
+        rows = [f"<h2>{escape(category['name'].upper())}</h2>"]
+        for item in category["items"]:
+            name = escape(item["name"])
+            rows.append("<div class=\"dish\">")
+            if item["name"] in images:
+                rows.append(f"<img src=\"{images[item['name']]}\" alt=\"{name}\">")
+            rows.append(f"<p>{name} ${item['price']:.2f}</p>")
+            if item.get("description"):
+                rows.append(f"<p>{escape(item['description'])}</p>")
+            rows.append("</div>")
+        sections.append("<section>" + "".join(rows) + "</section>")
+    menu = f"<html><head><title>{title} Menu</title></head><body><main id=\"menu\">{''.join(sections)}</main></body></html>"
+    return home, menu
+
+
+def build_demo_cassette(directory: Path, demo_dir: Path = DEMO_MENU_DIR) -> replay.Cassette:
+    """Write a cassette serving demo_menu as a two-page restaurant site."""
+    manifest = json.loads((demo_dir / "manifest.json").read_text())
+    cassette = replay.Cassette(
+        directory,
+        meta={
+            "name": "demo_menu",
+            "restaurant_name": manifest["menu_name"],
+            "location_hint": None,
+            "website_override": DEMO_SITE.removeprefix("https://"),
+            # Only the demo's own photos: dishes without one stay imageless
+            # instead of missing DuckDuckGo lookups.
+            "env": {"IMPORTER_WEBSITE_IMAGES_ONLY": "1"},
+        },
+    )
+    images = {}
+    for category in manifest["categories"]:
+        for item in category["items"]:
+            for photo in item.get("photos", []):
+                source = demo_dir / photo["filename"]
+                if not source.is_file():
+                    continue
+                path = f"/{photo['filename']}"
+                images[item["name"]] = path
+                cassette.put(
+                    "fetch",
+                    f"{DEMO_SITE}{path}",
+                    {
+                        "status": 200,
+                        "headers": {"content-type": "image/png"},
+                        "body": cassette.write_body(source.read_bytes()),
+                        "latency_s": DEMO_IMAGE_LATENCY_S,
+                    },
+                )
+                break
+    home, menu = _demo_pages(manifest, images)
+    for url, html in ((DEMO_SITE, home), (f"{DEMO_SITE}/menu", menu)):
+        cassette.put(
+            "fetch",
+            url,
+            {
+                "status": 200,
+                "headers": {"content-type": "text/html; charset=utf-8"},
+                "body": cassette.write_body(html.encode("utf-8")),
+                "latency_s": DEMO_PAGE_LATENCY_S,
+            },
+        )
+    cassette.save()
+    return cassette
+
+
+def discover_cassettes(fixtures_dir: Path = FIXTURES_DIR) -> list[Path]:
+    if not fixtures_dir.is_dir():
+        return []
+    return sorted(path.parent for path in fixtures_dir.glob("*/cassette.json"))
+
+
+# ---------------------------------------------------------------------------
+# Running jobs
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def _scratch_database() -> Iterator:
+    scratch_dir = Path(tempfile.mkdtemp(prefix="menuvium-import-bench-"))
+    engine = create_engine(f"sqlite:///{scratch_dir / 'bench.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    original_get_engine = worker.get_engine
+    worker.get_engine = lambda: engine
+    previous_local = os.environ.get("LOCAL_UPLOADS")
+    os.environ["LOCAL_UPLOADS"] = "1"
+    try:
+        yield engine
+    finally:
+        worker.get_engine = original_get_engine
+        if previous_local is None:
+            os.environ.pop("LOCAL_UPLOADS", None)
+        else:
+            os.environ["LOCAL_UPLOADS"] = previous_local
+        engine.dispose()
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def _stage_totals() -> dict[str, float]:
+    totals = {f"stage:{stage}": worker.IMPORT_STAGE_SECONDS.sum(stage=stage) for stage in PIPELINE_STAGES}
+    for stage in DISH_STAGES:
+        totals[f"dish:{stage}"] = worker.IMPORT_DISH_STAGE_SECONDS.sum(stage=stage)
+    return totals
+
+
+def _run_job(engine, meta: dict) -> ImportJob:
+    with Session(engine) as session:
+        job = ImportJob(
+            restaurant_name=meta["restaurant_name"],
+            location_hint=meta.get("location_hint"),
+            website_override=meta.get("website_override"),
+            status="RUNNING",
+            created_by="benchmark",
+        )
+        session.add(job)
+        session.commit()
+        job_id = job.id
+    # Fresh per-run state: every run sees a cold completion cache, and the
+    # fetch semaphore must not outlive the event loop it was created on.
+    clear_response_cache()
+    utils._semaphore = None
+    asyncio.run(worker._process_job(job_id))
+    with Session(engine) as session:
+        job = session.get(ImportJob, job_id)
+        session.expunge(job)
+    shutil.rmtree(LOCAL_OUTPUT_DIR / "imports" / str(job_id), ignore_errors=True)
+    return job
+
+
+def replay_import(
+    cassette: replay.Cassette,
+    *,
+    latency_scale: float = 1.0,
+    trace_memory: bool = False,
+) -> dict:
+    """Replay one import job and return its timings and outcome."""
+    with _scratch_database() as engine, replay.use_cassette(cassette, latency_scale=latency_scale):
+        if trace_memory:
+            tracemalloc.start()
+        before = _stage_totals()
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        try:
+            job = _run_job(engine, cassette.meta)
+            wall = time.perf_counter() - started
+            cpu = time.process_time() - cpu_started
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+        after = _stage_totals()
+    metadata = job.metadata_json or {}
+    return {
+        "status": job.status,
+        "error": job.error_message,
+        "wall_ms": wall * 1000,
+        "cpu_ms": cpu * 1000,
+        "peak_memory_bytes": peak,
+        "stages_ms": {name: (after[name] - before[name]) * 1000 for name in after if after[name] > before[name]},
+        "items": metadata.get("items_count", 0),
+        "images": metadata.get("images_count", 0),
+        "zip_bytes": metadata.get("zip_size_bytes", 0),
+    }
+
+
+def benchmark_cassette(name: str, cassette: replay.Cassette, *, runs: int, latency_scale: float) -> BenchmarkResult:
+    outcomes = [replay_import(cassette, latency_scale=latency_scale) for _ in range(max(runs, 1))]
+    memory = replay_import(cassette, latency_scale=0.0, trace_memory=True)
+    stages: dict[str, list[float]] = {}
+    for outcome in outcomes:
+        for stage, value in outcome["stages_ms"].items():
+            stages.setdefault(stage, []).append(value)
+    last = outcomes[-1]
+    return BenchmarkResult.from_samples(
+        f"import_{name}",
+        [outcome["wall_ms"] for outcome in outcomes],
+        status=last["status"],
+        error=last["error"],
+        items=last["items"],
+        images=last["images"],
+        zip_bytes=last["zip_bytes"],
+        cpu_ms=round(sum(outcome["cpu_ms"] for outcome in outcomes) / len(outcomes), 3),
+        peak_memory_mb=round(memory["peak_memory_bytes"] / (1024 * 1024), 2),
+        stages_ms={stage: round(sum(values) / len(values), 3) for stage, values in sorted(stages.items())},
+        replay_hits=cassette.stats.hits,
+        replay_misses=sorted(set(cassette.stats.misses)),
+    )
+
+
+def run_suite(
+    *,
+    cassettes: Optional[list[Path]] = None,
+    include_demo: bool = True,
+    runs: int = 3,
+    latency_scale: float = 1.0,
+) -> dict:
+    paths = discover_cassettes() if cassettes is None else cassettes
+    results = []
+    scratch_dir = Path(tempfile.mkdtemp(prefix="menuvium-demo-cassette-"))
+    try:
+        if include_demo:
+            demo = build_demo_cassette(scratch_dir / "demo_menu")
+            results.append(benchmark_cassette("demo_menu", demo, runs=runs, latency_scale=latency_scale))
+        for path in paths:
+            results.append(benchmark_cassette(path.name, replay.Cassette.load(path), runs=runs, latency_scale=latency_scale))
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+    config = {
+        "cassettes": (["demo_menu"] if include_demo else []) + [path.name for path in paths],
+        "runs": runs,
+        "latency_scale": latency_scale,
+    }
+    return build_report(SUITE, config=config, results=results)
+
+
+def record_cassette(
+    directory: Path,
+    *,
+    restaurant_name: str,
+    location_hint: Optional[str] = None,
+    website_override: Optional[str] = None,
+) -> dict:
+    """Run one live import, saving every external call into `directory`."""
+    meta = {
+        "name": directory.name,
+        "restaurant_name": restaurant_name,
+        "location_hint": location_hint,
+        "website_override": website_override,
+    }
+    cassette = replay.Cassette(directory, meta=meta)
+    with _scratch_database() as engine, replay.use_cassette(cassette, mode=replay.MODE_RECORD):
+        job = _run_job(engine, meta)
+    return {"status": job.status, "error": job.error_message, "entries": len(cassette)}
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def _print_stages(results: list[BenchmarkResult]) -> None:
+    for result in results:
+        extra = result.extra
+        print(
+            f"\n{result.name}: {extra['status']}, {extra['items']} items, {extra['images']} images, "
+            f"cpu {extra['cpu_ms']:.1f}ms, peak {extra['peak_memory_mb']:.1f}MB"
+        )
+        for stage, value in extra["stages_ms"].items():
+            print(f"  {stage:<28} {value:>10.1f} ms")
+        if extra["replay_misses"]:
+            print(f"  {len(extra['replay_misses'])} call(s) missing from the cassette")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subcommands = parser.add_subparsers(dest="command")
+
+    record = subcommands.add_parser("record", help="record a live import into a new cassette")
+    record.add_argument("name", help="cassette directory name under the fixtures directory")
+    record.add_argument("--restaurant", required=True)
+    record.add_argument("--location", default=None)
+    record.add_argument("--website", default=None)
+    record.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+
+    parser.add_argument("--cassette", type=Path, action="append", default=None, help="replay only these cassettes")
+    parser.add_argument("--no-demo", action="store_true", help="skip the bundled demo_menu cassette")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiplier on recorded latencies (0 = none)")
+    parser.add_argument("--out", type=Path, default=None, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, default=None, help="compare medians against this JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed median slowdown vs baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        outcome = record_cassette(
+            args.fixtures / args.name,
+            restaurant_name=args.restaurant,
+            location_hint=args.location,
+            website_override=args.website,
+        )
+        print(f"Recorded {outcome['entries']} calls into {args.fixtures / args.name} (job {outcome['status']})")
+        return 0 if outcome["status"] == "COMPLETED" else 1
+
+    report = run_suite(
+        cassettes=args.cassette,
+        include_demo=not args.no_demo,
+        runs=args.runs,
+        latency_scale=args.latency_scale,
+    )
+    results = [BenchmarkResult(**entry) for entry in report["results"].values()]
+    print(f"{SUITE} ({args.runs} runs, latency x{args.latency_scale})")
+    print(format_table(results))
+    _print_stages(results)
+    if args.out:
+        write_report(args.out, report)
+        print(f"Wrote {args.out}")
+    if args.baseline:
+        regressions = compare_reports(report, load_report(args.baseline), tolerance=args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
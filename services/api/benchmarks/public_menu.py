@@ -0,0 +1,349 @@
+"""
+Public menu (QR-scan path) benchmark suite.
+
+Micro-benchmarks call the route functions directly with a fresh Session per
+iteration, as a request would get:
+
+- get_public_menu, its compact variant and list_categories end to end;
+- _is_visible_with_rules over a batch of generated rules;
+- MenuRead.model_validate of a fully loaded menu.
+
+The HTTP scenario drives the in-process ASGI app with concurrent clients
+(no sockets, no lifespan workers) and reports throughput and latency
+percentiles. SQLite (a temporary file database) is used unless
+--database-url points at a scratch Postgres database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, SQLModel, create_engine, select
+from starlette.requests import Request
+from starlette.responses import Response
+
+from benchmarks.harness import (
+    BenchmarkResult,
+    build_report,
+    compare_reports,
+    format_table,
+    load_report,
+    percentile,
+    run_benchmark,
+    write_report,
+)
+from benchmarks.synthetic import PRESETS, MenuShape, SyntheticMenu, build_visibility_rules, create_synthetic_menu
+from models import Category, Item, ItemOption, ItemOptionGroup, Menu, MenuRead
+
+
+SUITE = "public_menu"
+# What a mobile browser sends; the compression middleware picks brotli or gzip.
+DEFAULT_ACCEPT_ENCODING = "gzip, deflate, br"
+
+
+def make_request(path: str = "/", host: str = "bench.local") -> Request:
+    """A minimal starlette Request for calling route functions directly."""
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "headers": [(b"host", host.encode())],
+            "server": (host, 80),
+            "client": ("127.0.0.1", 12345),
+        }
+    )
+
+
+def create_benchmark_engine(database_url: Optional[str]) -> tuple[Engine, str, Optional[Path]]:
+    """Engine, dialect label and the scratch directory to remove afterwards (SQLite only)."""
+    scratch_dir = None
+    if database_url:
+        engine = create_engine(database_url, pool_size=20, max_overflow=20, pool_pre_ping=True)
+    else:
+        scratch_dir = Path(tempfile.mkdtemp(prefix="menuvium-bench-"))
+        engine = create_engine(f"sqlite:///{scratch_dir / 'bench.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    return engine, engine.dialect.name, scratch_dir
+
+
+def _load_full_menu(session: Session, menu_id) -> Menu:
+    return session.exec(
+        select(Menu)
+        .where(Menu.id == menu_id)
+        .options(
+            selectinload(Menu.categories).selectinload(Category.items).selectinload(Item.dietary_tags),
+            selectinload(Menu.categories).selectinload(Category.items).selectinload(Item.allergens),
+            selectinload(Menu.categories).selectinload(Category.items).selectinload(Item.photos),
+            selectinload(Menu.categories).selectinload(Category.items).selectinload(Item.visibility_rules),
+            selectinload(Menu.categories)
+            .selectinload(Category.items)
+            .selectinload(Item.option_groups)
+            .selectinload(ItemOptionGroup.options)
+            .selectinload(ItemOption.visibility_rules),
+        )
+    ).one()
+
+
+# ---------------------------------------------------------------------------
+# Micro-benchmarks
+# ---------------------------------------------------------------------------
+
+def run_micro_benchmarks(engine: Engine, synthetic: SyntheticMenu, *, iterations: int) -> list[BenchmarkResult]:
+    from routers.categories import list_categories
+    from routers.menus import _is_visible_with_rules, get_public_menu, get_public_menu_compact
+
+    request = make_request()
+    results: list[BenchmarkResult] = []
+    holder: dict[str, Session] = {}
+
+    def fresh_session() -> None:
+        previous = holder.pop("session", None)
+        if previous is not None:
+            previous.close()
+        holder["session"] = Session(engine)
+
+    try:
+        results.append(
+            run_benchmark(
+                "get_public_menu",
+                lambda: get_public_menu(synthetic.menu_id, request, session=holder["session"]),
+                iterations=iterations,
+                setup=fresh_session,
+            )
+        )
+        results.append(
+            run_benchmark(
+                "get_public_menu_compact",
+                lambda: get_public_menu_compact(synthetic.menu_id, request, fields=None, session=holder["session"]),
+                iterations=iterations,
+                setup=fresh_session,
+            )
+        )
+        results.append(
+            run_benchmark(
+                "list_categories",
+                lambda: list_categories(
+                    synthetic.menu_id,
+                    request,
+                    Response(),
+                    view="full",
+                    limit=None,
+                    cursor=None,
+                    session=holder["session"],
+                ),
+                iterations=iterations,
+                setup=fresh_session,
+            )
+        )
+    finally:
+        leftover = holder.pop("session", None)
+        if leftover is not None:
+            leftover.close()
+
+    rules = build_visibility_rules(1000, seed=synthetic.shape.seed)
+    rule_batches = [rules[index:index + 4] for index in range(0, len(rules), 4)]
+    now_local = datetime.now()
+
+    def check_rules() -> None:
+        for batch in rule_batches:
+            _is_visible_with_rules(batch, now_local)
+
+    visibility = run_benchmark("is_visible_with_rules_x250", check_rules, iterations=iterations)
+    visibility.extra["rule_sets_per_iteration"] = len(rule_batches)
+    results.append(visibility)
+
+    with Session(engine) as session:
+        menu = _load_full_menu(session, synthetic.menu_id)
+        results.append(run_benchmark("menu_read_model_validate", lambda: MenuRead.model_validate(menu), iterations=iterations))
+    return results
+
+
+# ---------------------------------------------------------------------------
+# HTTP load scenario
+# ---------------------------------------------------------------------------
+
+async def _http_load(app, paths: list[str], *, requests: int, concurrency: int, accept_encoding: str) -> dict:
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    body_bytes: list[int] = []
+    wire_bytes: list[int] = []
+    counter = iter(range(requests))
+    transport = httpx.ASGITransport(app=app)
+
+    headers = {"Accept-Encoding": accept_encoding}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench.local", headers=headers) as client:
+        async def worker() -> None:
+            for index in counter:
+                started = time.perf_counter()
+                response = await client.get(paths[index % len(paths)])
+                latencies.append((time.perf_counter() - started) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                body_bytes.append(len(response.content))
+                wire_bytes.append(response.num_bytes_downloaded)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "elapsed_s": elapsed,
+        "latencies_ms": latencies,
+        "statuses": statuses,
+        "mean_body_bytes": statistics.fmean(body_bytes) if body_bytes else 0.0,
+        "mean_wire_bytes": statistics.fmean(wire_bytes) if wire_bytes else 0.0,
+    }
+
+
+def run_http_load(
+    engine: Engine,
+    synthetic: SyntheticMenu,
+    *,
+    requests: int,
+    concurrency: int,
+    accept_encoding: str = DEFAULT_ACCEPT_ENCODING,
+) -> list[BenchmarkResult]:
+    from database import get_session
+    from main import app
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    scenarios = {
+        "http_get_public_menu": [f"/menus/public/{synthetic.menu_id}"],
+        "http_get_public_menu_compact": [f"/menus/public/{synthetic.menu_id}/compact"],
+        "http_list_categories": [f"/categories/{synthetic.menu_id}"],
+    }
+    previous_override = app.dependency_overrides.get(get_session)
+    app.dependency_overrides[get_session] = session_override
+    results = []
+    try:
+        for name, paths in scenarios.items():
+            outcome = asyncio.run(
+                _http_load(app, paths, requests=requests, concurrency=concurrency, accept_encoding=accept_encoding)
+            )
+            result = BenchmarkResult.from_samples(
+                name,
+                outcome["latencies_ms"],
+                concurrency=concurrency,
+                throughput_rps=round(len(outcome["latencies_ms"]) / outcome["elapsed_s"], 2),
+                p99_ms=round(percentile(outcome["latencies_ms"], 99), 4),
+                statuses={str(code): count for code, count in sorted(outcome["statuses"].items())},
+                mean_body_bytes=round(outcome["mean_body_bytes"], 1),
+                mean_wire_bytes=round(outcome["mean_wire_bytes"], 1),
+            )
+            results.append(result)
+    finally:
+        if previous_override is None:
+            app.dependency_overrides.pop(get_session, None)
+        else:
+            app.dependency_overrides[get_session] = previous_override
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def run_suite(
+    *,
+    shape: MenuShape,
+    database_url: Optional[str] = None,
+    iterations: int = 50,
+    http_requests: int = 200,
+    concurrency: int = 8,
+    accept_encoding: str = DEFAULT_ACCEPT_ENCODING,
+) -> dict:
+    engine, database_label, scratch_dir = create_benchmark_engine(database_url)
+    try:
+        with Session(engine) as session:
+            synthetic = create_synthetic_menu(session, shape)
+        results = run_micro_benchmarks(engine, synthetic, iterations=iterations)
+        if http_requests > 0:
+            results.extend(
+                run_http_load(
+                    engine,
+                    synthetic,
+                    requests=http_requests,
+                    concurrency=concurrency,
+                    accept_encoding=accept_encoding,
+                )
+            )
+    finally:
+        engine.dispose()
+        if scratch_dir is not None:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+    config = {
+        "database": database_label,
+        "shape": shape.as_dict(),
+        "rows": synthetic.rows,
+        "iterations": iterations,
+        "http_requests": http_requests,
+        "concurrency": concurrency,
+        "accept_encoding": accept_encoding,
+    }
+    return build_report(SUITE, config=config, results=results)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="typical")
+    parser.add_argument("--seed", type=int, default=None, help="override the preset's generator seed")
+    parser.add_argument("--database-url", default=None, help="scratch database to use instead of temporary SQLite")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--http-requests", type=int, default=200, help="0 skips the HTTP scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--accept-encoding", default=DEFAULT_ACCEPT_ENCODING, help="'identity' measures uncompressed")
+    parser.add_argument("--out", type=Path, default=None, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, default=None, help="compare medians against this JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed median slowdown vs baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    shape = PRESETS[args.preset]
+    if args.seed is not None:
+        shape = MenuShape(**{**shape.as_dict(), "seed": args.seed})
+    report = run_suite(
+        shape=shape,
+        database_url=args.database_url,
+        iterations=args.iterations,
+        http_requests=args.http_requests,
+        concurrency=args.concurrency,
+        accept_encoding=args.accept_encoding,
+    )
+    results = [BenchmarkResult(**entry) for entry in report["results"].values()]
+    print(f"{SUITE} on {report['config']['database']} ({args.preset}: {report['config']['rows']})")
+    print(format_table(results))
+    if args.out:
+        write_report(args.out, report)
+        print(f"Wrote {args.out}")
+    if args.baseline:
+        regressions = compare_reports(report, load_report(args.baseline), tolerance=args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,208 @@
+"""
+Synthetic menu data for benchmarks, built from the regular SQLModel models.
+
+MenuShape controls how wide each level of the menu tree is; generation is
+seeded, so the same shape and seed always produce the same menu contents
+(row ids are random UUIDs).
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from models import (
+    Allergen,
+    Category,
+    DietaryTag,
+    Item,
+    ItemOption,
+    ItemOptionGroup,
+    ItemPhoto,
+    Menu,
+    Organization,
+    VisibilityRule,
+)
+
+
+@dataclass(frozen=True)
+class MenuShape:
+    categories: int = 8
+    items_per_category: int = 15
+    option_groups_per_item: int = 2
+    options_per_group: int = 4
+    rules_per_item: int = 1
+    rules_per_option: int = 1
+    photos_per_item: int = 1
+    tags_per_item: int = 2
+    allergens_per_item: int = 1
+    tag_pool: int = 12
+    allergen_pool: int = 8
+    ar_ready_fraction: float = 0.2
+    show_item_images: bool = True
+    seed: int = 1234
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+    @property
+    def total_items(self) -> int:
+        return self.categories * self.items_per_category
+
+
+PRESETS = {
+    "small": MenuShape(categories=3, items_per_category=5, option_groups_per_item=1, options_per_group=3),
+    "typical": MenuShape(),
+    "large": MenuShape(
+        categories=20,
+        items_per_category=30,
+        option_groups_per_item=3,
+        options_per_group=6,
+        rules_per_item=2,
+        rules_per_option=1,
+        photos_per_item=2,
+        tags_per_item=3,
+        allergens_per_item=2,
+    ),
+}
+
+
+@dataclass
+class SyntheticMenu:
+    org_id: uuid.UUID
+    menu_id: uuid.UUID
+    shape: MenuShape
+    rows: dict
+
+
+def _visibility_rule(rng: random.Random, **target) -> VisibilityRule:
+    # Mostly broad include windows, with some exclusions, overnight windows
+    # and date ranges so every branch of the visibility check is exercised.
+    kind = "exclude" if rng.random() < 0.2 else "include"
+    start_hour = rng.randrange(0, 24)
+    duration = rng.choice((4, 8, 12, 16, 20))
+    end_hour = (start_hour + duration) % 24
+    today = date.today()
+    rule = VisibilityRule(
+        kind=kind,
+        days_of_week=sorted(rng.sample(range(7), rng.randint(3, 7))),
+        start_time_local=time(start_hour, 0),
+        end_time_local=time(end_hour, 30),
+        is_active=rng.random() > 0.05,
+        **target,
+    )
+    if rng.random() < 0.25:
+        rule.start_date = today - timedelta(days=rng.randint(0, 30))
+        rule.end_date = today + timedelta(days=rng.randint(0, 60))
+    return rule
+
+
+def _metadata_pool(session: Session, model, prefix: str, size: int) -> list:
+    names = [f"{prefix} {index:03d}" for index in range(size)]
+    existing = {row.name: row for row in session.exec(select(model).where(model.name.in_(names))).all()}
+    pool = []
+    for name in names:
+        row = existing.get(name)
+        if row is None:
+            row = model(name=name)
+            session.add(row)
+        pool.append(row)
+    return pool
+
+
+def build_visibility_rules(count: int, *, seed: int = 1234) -> list[VisibilityRule]:
+    """Unsaved rules for micro-benchmarking the visibility check in isolation."""
+    rng = random.Random(seed)
+    return [_visibility_rule(rng) for _ in range(count)]
+
+
+def create_synthetic_menu(
+    session: Session,
+    shape: MenuShape = MenuShape(),
+    *,
+    owner_id: str = "benchmark-owner",
+    name: Optional[str] = None,
+) -> SyntheticMenu:
+    """Insert an organization with one fully populated menu and commit it."""
+    rng = random.Random(shape.seed)
+    suffix = uuid.uuid4().hex[:8]
+    org = Organization(name=f"Benchmark {suffix}", slug=f"benchmark-{suffix}", owner_id=owner_id)
+    menu = Menu(
+        name=name or f"Benchmark menu {suffix}",
+        org_id=org.id,
+        show_item_images=shape.show_item_images,
+        banner_url=f"/uploads/orgs/{org.id}/branding/banner.jpg",
+        logo_url=f"/uploads/orgs/{org.id}/branding/logo.png",
+    )
+    session.add(org)
+    session.add(menu)
+    tags = _metadata_pool(session, DietaryTag, "Bench tag", shape.tag_pool)
+    allergens = _metadata_pool(session, Allergen, "Bench allergen", shape.allergen_pool)
+
+    counts = {"categories": 0, "items": 0, "option_groups": 0, "options": 0, "visibility_rules": 0, "photos": 0}
+    now = datetime.utcnow()
+    for category_index in range(shape.categories):
+        category = Category(name=f"Category {category_index + 1}", rank=category_index, menu_id=menu.id)
+        session.add(category)
+        counts["categories"] += 1
+        for item_index in range(shape.items_per_category):
+            item = Item(
+                name=f"Dish {category_index + 1}.{item_index + 1}",
+                description="Slow-cooked, seasonal, served with house sides. " * rng.randint(1, 3),
+                price=round(rng.uniform(4, 40), 2),
+                is_sold_out=rng.random() < 0.05,
+                position=item_index,
+                category_id=category.id,
+            )
+            if rng.random() < shape.ar_ready_fraction:
+                base = f"/uploads/orgs/{org.id}/items/{item.id}/ar/current"
+                item.ar_status = "ready"
+                item.ar_stage = "ready"
+                item.ar_updated_at = now
+                item.ar_model_glb_url = f"{base}/model.glb"
+                item.ar_model_usdz_url = f"{base}/model.usdz"
+                item.ar_model_poster_url = f"{base}/poster.jpg"
+            item.dietary_tags = rng.sample(tags, min(shape.tags_per_item, len(tags)))
+            item.allergens = rng.sample(allergens, min(shape.allergens_per_item, len(allergens)))
+            session.add(item)
+            counts["items"] += 1
+            for photo_index in range(shape.photos_per_item):
+                key = f"orgs/{org.id}/items/{item.id}/photos/{photo_index}.jpg"
+                session.add(ItemPhoto(s3_key=key, url=f"/uploads/{key}", item_id=item.id))
+                counts["photos"] += 1
+            for _ in range(shape.rules_per_item):
+                session.add(_visibility_rule(rng, item_id=item.id))
+                counts["visibility_rules"] += 1
+            for group_index in range(shape.option_groups_per_item):
+                group = ItemOptionGroup(
+                    item_id=item.id,
+                    name=f"Choice {group_index + 1}",
+                    selection_mode=rng.choice(("single", "multiple")),
+                    min_select=rng.randint(0, 1),
+                    max_select=rng.choice((None, 2, shape.options_per_group)),
+                    position=group_index,
+                    is_active=rng.random() > 0.05,
+                )
+                session.add(group)
+                counts["option_groups"] += 1
+                for option_index in range(shape.options_per_group):
+                    option = ItemOption(
+                        group_id=group.id,
+                        name=f"Option {option_index + 1}",
+                        badge=rng.choice((None, None, "Popular", "+$2")),
+                        position=option_index,
+                        is_default=option_index == 0,
+                        is_active=rng.random() > 0.05,
+                    )
+                    session.add(option)
+                    counts["options"] += 1
+                    for _ in range(shape.rules_per_option):
+                        session.add(_visibility_rule(rng, option_id=option.id))
+                        counts["visibility_rules"] += 1
+    session.commit()
+    return SyntheticMenu(org_id=org.id, menu_id=menu.id, shape=shape, rows=counts)
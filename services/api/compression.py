@@ -0,0 +1,339 @@
+"""
+Negotiated response compression (brotli or gzip).
+
+CompressionMiddleware compresses text-like responses (JSON, text/*, XML,
+SVG) of at least COMPRESSION_MIN_BYTES for clients that accept it:
+
+- single-message bodies are compressed in one shot;
+- streamed bodies are buffered up to the threshold, then compressed chunk
+  by chunk without Content-Length, so large exports never sit in memory;
+- bodies of public menu routes (COMPRESSION_CACHE_PATHS prefixes) are
+  compressed once per distinct body and served from a bounded LRU, so a hot
+  menu costs one compression per version per encoding.
+
+Responses that already carry a Content-Encoding, partial content, and
+non-text types (images, zips, GLB/USDZ) pass through untouched. A strong
+ETag on a compressed response is made weak (W/"..."), since the identity,
+gzip and br bodies are different representations; routes compare
+If-None-Match with etag_matches(), which accepts either form.
+RESPONSE_COMPRESSION=0 disables the middleware.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+import brotli
+
+from metrics import registry as metrics_registry
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def compression_enabled() -> bool:
+    return os.getenv("RESPONSE_COMPRESSION", "1") != "0"
+
+
+_COMPRESSIBLE_TYPES = ("application/json", "application/xml", "application/javascript", "image/svg+xml")
+_DEFAULT_CACHE_PATHS = "/menus/public/"
+
+COMPRESSION_BYTES_TOTAL = metrics_registry.counter(
+    "menuvium_http_compression_bytes_total",
+    "Response body bytes before (in) and after (out) compression, by encoding.",
+    ("encoding", "direction"),
+)
+COMPRESSION_CACHE_TOTAL = metrics_registry.counter(
+    "menuvium_http_compression_cache_total",
+    "Precompressed public menu variant lookups by result.",
+    ("result",),
+)
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith("text/") or media_type in _COMPRESSIBLE_TYPES or media_type.endswith("+json")
+
+
+def negotiate_encoding(accept_encoding: str, *, brotli_available: bool = True) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header, or None for identity."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[token] = weight
+    wildcard = weights.get("*", 0.0)
+    candidates = []
+    if brotli_available:
+        candidates.append(("br", weights.get("br", wildcard)))
+    candidates.append(("gzip", weights.get("gzip", wildcard)))
+    # Ties go to the first candidate, i.e. brotli.
+    encoding, weight = max(candidates, key=lambda candidate: candidate[1])
+    return encoding if weight > 0 else None
+
+
+# ---------------------------------------------------------------------------
+# Compressors
+# ---------------------------------------------------------------------------
+
+def compress_body(body: bytes, encoding: str, *, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    # mtime=0 keeps the output stable for identical bodies.
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str, *, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(chunk)
+        return self._zlib.compress(chunk)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class PrecompressedCache:
+    """LRU of compressed bodies keyed by (encoding, body digest)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compress(self, body: bytes, encoding: str, compress) -> bytes:
+        if self.max_entries <= 0:
+            return compress(body, encoding)
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+        if cached is not None:
+            COMPRESSION_CACHE_TOTAL.inc(result="hit")
+            return cached
+        COMPRESSION_CACHE_TOTAL.inc(result="miss")
+        compressed = compress(body, encoding)
+        with self._lock:
+            self._entries[key] = compressed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compressed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+precompressed_cache = PrecompressedCache(_env_int("COMPRESSION_CACHE_ENTRIES", 256))
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+def _with_vary(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    for index, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[index] = (name, value + b", Accept-Encoding")
+            return headers
+    headers.append((b"vary", b"Accept-Encoding"))
+    return headers
+
+
+def _with_weak_etag(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    return [
+        (name, b"W/" + value if name.lower() == b"etag" and value.startswith(b'"') else value)
+        for name, value in headers
+    ]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against a route's ETag (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def _without(headers: list[tuple[bytes, bytes]], *names: bytes) -> list[tuple[bytes, bytes]]:
+    return [(name, value) for name, value in headers if name.lower() not in names]
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app,
+        *,
+        minimum_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None,
+        cache_paths: Optional[tuple[str, ...]] = None,
+        cache: PrecompressedCache = precompressed_cache,
+    ):
+        self.app = app
+        self.minimum_size = _env_int("COMPRESSION_MIN_BYTES", 1024) if minimum_size is None else minimum_size
+        self.gzip_level = _env_int("COMPRESSION_GZIP_LEVEL", 6) if gzip_level is None else gzip_level
+        self.brotli_quality = _env_int("COMPRESSION_BROTLI_QUALITY", 5) if brotli_quality is None else brotli_quality
+        if cache_paths is None:
+            raw = os.getenv("COMPRESSION_CACHE_PATHS", _DEFAULT_CACHE_PATHS)
+            cache_paths = tuple(path.strip() for path in raw.split(",") if path.strip())
+        self.cache_paths = cache_paths
+        self.cache = cache
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        return compress_body(body, encoding, gzip_level=self.gzip_level, brotli_quality=self.brotli_quality)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = b""
+        for name, value in scope.get("headers") or []:
+            if name == b"accept-encoding":
+                accept = value
+                break
+        encoding = negotiate_encoding(accept.decode("latin-1")) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        cacheable = scope.get("method") == "GET" and scope.get("path", "").startswith(self.cache_paths)
+        responder = _CompressingResponder(self, send, encoding, cacheable=cacheable)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, middleware: CompressionMiddleware, send, encoding: str, *, cacheable: bool):
+        self.middleware = middleware
+        self._send = send
+        self.encoding = encoding
+        self.cacheable = cacheable
+        self.start: Optional[dict] = None
+        self.passthrough = False
+        self.buffer = bytearray()
+        self.compressor: Optional[_StreamCompressor] = None
+
+    def _eligible(self, message: dict) -> bool:
+        status = message["status"]
+        if status < 200 or status in (204, 206, 304):
+            return False
+        content_type = b""
+        for name, value in message.get("headers") or []:
+            lowered = name.lower()
+            if lowered == b"content-encoding":
+                return False
+            if lowered == b"content-type":
+                content_type = value
+        return bool(content_type) and _is_compressible(content_type.decode("latin-1"))
+
+    async def send(self, message: dict) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            if not self._eligible(message):
+                self.passthrough = True
+                await self._send(message)
+                return
+            self.start = message
+            return
+        if self.passthrough or message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is not None:
+            await self._send_chunk(body, more_body)
+            return
+        self.buffer.extend(body)
+        if not more_body:
+            await self._send_whole(bytes(self.buffer))
+        elif len(self.buffer) >= self.middleware.minimum_size:
+            await self._start_stream()
+
+    def _headers(self) -> list[tuple[bytes, bytes]]:
+        return _with_vary(list(self.start.get("headers") or []))
+
+    async def _send_whole(self, body: bytes) -> None:
+        headers = self._headers()
+        if len(body) < self.middleware.minimum_size:
+            await self._send({**self.start, "headers": headers})
+            await self._send({"type": "http.response.body", "body": body})
+            return
+        if self.cacheable and self.start["status"] == 200:
+            compressed = self.middleware.cache.get_or_compress(body, self.encoding, self.middleware._compress)
+        else:
+            compressed = self.middleware._compress(body, self.encoding)
+        COMPRESSION_BYTES_TOTAL.inc(len(body), encoding=self.encoding, direction="in")
+        COMPRESSION_BYTES_TOTAL.inc(len(compressed), encoding=self.encoding, direction="out")
+        headers = _with_weak_etag(_without(headers, b"content-length"))
+        headers += [(b"content-encoding", self.encoding.encode()), (b"content-length", str(len(compressed)).encode())]
+        await self._send({**self.start, "headers": headers})
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _start_stream(self) -> None:
+        self.compressor = _StreamCompressor(
+            self.encoding,
+            gzip_level=self.middleware.gzip_level,
+            brotli_quality=self.middleware.brotli_quality,
+        )
+        headers = _with_weak_etag(_without(self._headers(), b"content-length"))
+        headers.append((b"content-encoding", self.encoding.encode()))
+        await self._send({**self.start, "headers": headers})
+        buffered = bytes(self.buffer)
+        self.buffer.clear()
+        await self._send_chunk(buffered, True)
+
+    async def _send_chunk(self, chunk: bytes, more_body: bool) -> None:
+        output = self.compressor.compress(chunk) if chunk else b""
+        if not more_body:
+            output += self.compressor.finish()
+        COMPRESSION_BYTES_TOTAL.inc(len(chunk), encoding=self.encoding, direction="in")
+        COMPRESSION_BYTES_TOTAL.inc(len(output), encoding=self.encoding, direction="out")
+        if output or not more_body:
+            await self._send({"type": "http.response.body", "body": output, "more_body": more_body})
+
+
+def install_compression(app) -> bool:
+    """Attach CompressionMiddleware unless RESPONSE_COMPRESSION=0; returns whether it did."""
+    if not compression_enabled():
+        return False
+    app.add_middleware(CompressionMiddleware)
+    return True
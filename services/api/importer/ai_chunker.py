@@ -0,0 +1,274 @@
+"""
+AI chunking engine for the menu importer pipeline.
+
+Long menus are split on category boundaries, each chunk is sent to OpenAI
+concurrently (bounded, with retries), and every response is cached by a hash
+of model + prompt so a retried job never pays for the same tokens twice.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+
+MAX_TEXT_CHUNK_CHARS = int(os.getenv("IMPORTER_AI_CHUNK_CHARS", "12000"))
+MAX_ITEMS_PER_CHUNK = int(os.getenv("IMPORTER_AI_CHUNK_ITEMS", "60"))
+MAX_CONCURRENT_AI_CALLS = int(os.getenv("IMPORTER_AI_CONCURRENCY", "4"))
+MAX_AI_RETRIES = 3
+RESPONSE_CACHE_MAX_ENTRIES = 512
+
+# Separator extract_menu() places between text pulled from different pages.
+SOURCE_SEPARATOR = "\n\n---\n\n"
+
+_price_re = re.compile(r"[\$€£]?\s*\d{1,4}[.,]\d{2}")
+
+
+# ---------------------------------------------------------------------------
+# Chunking
+# ---------------------------------------------------------------------------
+
+def _looks_like_category_header(line: str) -> bool:
+    """Same header heuristic as the regex fallback parser."""
+    line = line.strip()
+    if not line:
+        return False
+    return (
+        (line.isupper() and 3 < len(line) < 50 and not _price_re.search(line))
+        or (line.endswith(":") and len(line) < 40)
+        or (line.startswith("#") and len(line) < 50)
+    )
+
+
+def _split_into_sections(text: str) -> list[str]:
+    """Split one source's text into sections that each start at a category header."""
+    sections: list[str] = []
+    current: list[str] = []
+    for line in text.split("\n"):
+        if _looks_like_category_header(line) and any(l.strip() for l in current):
+            sections.append("\n".join(current))
+            current = []
+        current.append(line)
+    if any(l.strip() for l in current):
+        sections.append("\n".join(current))
+    return sections
+
+
+def _split_oversized_section(section: str, max_chars: int) -> list[str]:
+    """Break a single section that exceeds max_chars on line boundaries."""
+    pieces: list[str] = []
+    current = ""
+    for line in section.split("\n"):
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > max_chars:
+            pieces.append(current)
+            current = line
+        else:
+            current = candidate
+    if current.strip():
+        pieces.append(current)
+    return pieces
+
+
+def split_menu_text(text: str, max_chars: int = MAX_TEXT_CHUNK_CHARS) -> list[str]:
+    """Split menu text into chunks of at most max_chars, preferring category boundaries.
+
+    Sections are packed greedily in document order so the output is deterministic.
+    """
+    sections: list[str] = []
+    for source_text in text.split(SOURCE_SEPARATOR):
+        for section in _split_into_sections(source_text):
+            if len(section) > max_chars:
+                sections.extend(_split_oversized_section(section, max_chars))
+            else:
+                sections.append(section)
+
+    chunks: list[str] = []
+    current = ""
+    for section in sections:
+        candidate = f"{current}\n\n{section}" if current else section
+        if current and len(candidate) > max_chars:
+            chunks.append(current)
+            current = section
+        else:
+            current = candidate
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def chunk_items(items: list[dict], max_items: int = MAX_ITEMS_PER_CHUNK) -> list[list[dict]]:
+    """Group prompt items into chunks of at most max_items without splitting a category.
+
+    A category larger than max_items is the only case that gets split.
+    """
+    groups: list[list[dict]] = []
+    for item in items:
+        if groups and groups[-1][0].get("category") == item.get("category"):
+            groups[-1].append(item)
+        else:
+            groups.append([item])
+
+    chunks: list[list[dict]] = []
+    current: list[dict] = []
+    for group in groups:
+        if len(group) > max_items:
+            if current:
+                chunks.append(current)
+                current = []
+            for start in range(0, len(group), max_items):
+                chunks.append(group[start:start + max_items])
+            continue
+        if current and len(current) + len(group) > max_items:
+            chunks.append(current)
+            current = []
+        current.extend(group)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+class _ResponseCache:
+    """Thread-safe LRU of raw OpenAI responses, optionally mirrored to disk.
+
+    Set IMPORTER_AI_CACHE_DIR to keep responses across worker restarts.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        directory = (os.getenv("IMPORTER_AI_CACHE_DIR") or "").strip()
+        if not directory:
+            return None
+        return Path(directory) / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            content = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        self._remember(key, content)
+        return content
+
+    def set(self, key: str, content: str) -> None:
+        self._remember(key, content)
+        path = self._disk_path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: str, content: str) -> None:
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+_response_cache = _ResponseCache(RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def response_cache_key(model: str, prompt: str) -> str:
+    """Hash of model + prompt identifying a cacheable completion."""
+    return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+def clear_response_cache() -> None:
+    """Drop in-memory cached responses (disk entries are left alone)."""
+    _response_cache.clear()
+
+
+# ---------------------------------------------------------------------------
+# OpenAI calls
+# ---------------------------------------------------------------------------
+
+async def chat_json(
+    client,
+    prompt: str,
+    *,
+    model: str,
+    temperature: float,
+    timeout: float,
+    max_retries: int = MAX_AI_RETRIES,
+) -> tuple[dict, int]:
+    """Run a JSON-mode chat completion with caching and retries.
+
+    Returns (parsed JSON, tokens spent). Cache hits report 0 tokens.
+    """
+    key = response_cache_key(model, prompt)
+    cached = _response_cache.get(key)
+    if cached is not None:
+        return json.loads(cached), 0
+
+    last_exc: Optional[Exception] = None
+    for attempt in range(max_retries):
+        try:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                response_format={"type": "json_object"},
+                timeout=timeout,
+            )
+            content = response.choices[0].message.content
+            result = json.loads(content)
+            tokens = response.usage.total_tokens if response.usage else 0
+            _response_cache.set(key, content)
+            return result, tokens
+        except Exception as exc:
+            last_exc = exc
+            if attempt < max_retries - 1:
+                await asyncio.sleep(2 ** attempt)
+    raise last_exc or RuntimeError("OpenAI request failed")
+
+
+async def run_chunked(
+    chunks: list,
+    call: Callable[[Any], Awaitable[Any]],
+    *,
+    limit: int = MAX_CONCURRENT_AI_CALLS,
+) -> list:
+    """Run call(chunk) for every chunk with at most `limit` in flight.
+
+    Results are returned in chunk order; a failed chunk yields its exception.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def _run(chunk):
+        async with semaphore:
+            return await call(chunk)
+
+    return await asyncio.gather(*(_run(chunk) for chunk in chunks), return_exceptions=True)
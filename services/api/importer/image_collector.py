@@ -204,12 +204,8 @@ async def _search_duckduckgo_image(
     try:
         # Run synchronous ddgs in a thread pool to avoid blocking the event loop
         import asyncio
-        from ddgs import DDGS
 
-        def _sync_search():
-            return list(DDGS().images(query, max_results=5))
-
-        results = await asyncio.to_thread(_sync_search)
+        results = await asyncio.to_thread(_ddgs_image_results, query)
 
         for result in results:
             img_url = result.get("image")
@@ -230,6 +226,13 @@ async def _search_duckduckgo_image(
     return None
 
 
+def _ddgs_image_results(query: str) -> list[dict]:
+    """Blocking DuckDuckGo image search (the importer replay layer swaps this out)."""
+    from ddgs import DDGS
+
+    return list(DDGS().images(query, max_results=5))
+
+
 def _get_image_extension(url: str, data: bytes) -> str:
     """Determine image file extension from URL or magic bytes."""
     path = urlparse(url).path.lower()
@@ -13,6 +13,7 @@ All images get the same treatment for visual consistency:
 9. Export as WebP
 """
 
+import asyncio
 import io
 import math
 from typing import Optional
@@ -51,7 +52,8 @@ async def enhance_image(
         log_fn = lambda msg: None
 
     log_fn(f"Enhancing {filename}")
-    return _local_enhance(data)
+    # Pillow work is CPU-bound; keep it off the event loop so other stages keep flowing.
+    return await asyncio.to_thread(_local_enhance, data)
 
 
 # ---------------------------------------------------------------------------
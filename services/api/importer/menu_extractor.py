@@ -17,6 +17,7 @@ from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
 
+from importer.ai_chunker import chat_json, chunk_items, run_chunked, split_menu_text
 from importer.utils import fetch_url_text, fetch_url_bytes, normalize_url
 
 
@@ -497,62 +498,107 @@ def _ocr_image_bytes(data: bytes) -> str:
         return ""
 
 
+def _build_parse_prompt(text: str) -> str:
+    return (
+        "You are a menu parser. Given the following restaurant menu text, extract all menu items "
+        "and organize them into categories. Return valid JSON with this exact structure:\n"
+        '{"categories": [{"name": "Category Name", "items": [{"name": "Item Name", '
+        '"description": "Description or null", "price": 12.99}]}]}\n\n'
+        "Rules:\n"
+        "- Group items into their natural categories (Appetizers, Mains, Desserts, etc.)\n"
+        "- Price should be a float or null if not found\n"
+        "- Description should be the item description or null\n"
+        "- If categories aren't clear, use 'Menu Items' as the default category\n"
+        "- Return ONLY valid JSON, no markdown formatting\n\n"
+        f"Menu text:\n{text}"
+    )
+
+
+def _categories_from_parse_result(result: dict) -> list[ParsedCategory]:
+    categories = []
+    for cat in result.get("categories", []):
+        items = []
+        for item in cat.get("items", []):
+            items.append(ParsedItem(
+                name=item.get("name", "Unknown"),
+                description=item.get("description"),
+                price=item.get("price"),
+            ))
+        categories.append(ParsedCategory(name=cat.get("name", "Menu Items"), items=items))
+    return categories
+
+
+def _merge_parsed_categories(chunk_categories: list[list[ParsedCategory]]) -> list[ParsedCategory]:
+    """Merge per-chunk categories in chunk order.
+
+    Categories with the same name (case-insensitive) are combined, and an item
+    repeated with the same name and price (e.g. a menu seen on two pages) is kept once.
+    """
+    merged: dict[str, ParsedCategory] = {}
+    seen_items: dict[str, set[tuple[str, Optional[float]]]] = {}
+    for categories in chunk_categories:
+        for cat in categories:
+            key = cat.name.strip().lower()
+            if key not in merged:
+                merged[key] = ParsedCategory(name=cat.name)
+                seen_items[key] = set()
+            for item in cat.items:
+                item_key = (item.name.strip().lower(), item.price)
+                if item_key in seen_items[key]:
+                    continue
+                seen_items[key].add(item_key)
+                merged[key].items.append(item)
+    return [cat for cat in merged.values() if cat.items]
+
+
 async def _parse_with_openai(text: str, log_fn) -> ParsedMenu:
-    """Use OpenAI to parse menu text into structured categories and items."""
+    """Use OpenAI to parse menu text into structured categories and items.
+
+    Long text is split on category boundaries and the chunks are parsed
+    concurrently; a chunk that still fails after retries falls back to the
+    regex parser on its own.
+    """
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         log_fn("OPENAI_API_KEY not set — using regex fallback parser")
         return _fallback_parse(text)
 
     model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-    log_fn(f"Requesting OpenAI parse with model {model}...")
+    chunks = split_menu_text(text)
+    log_fn(f"Requesting OpenAI parse with model {model} ({len(chunks)} chunk(s))...")
 
     try:
         from openai import AsyncOpenAI
         client = AsyncOpenAI(api_key=api_key)
+    except Exception as e:
+        log_fn(f"OpenAI client unavailable: {e}, using fallback")
+        return _fallback_parse(text)
 
-        prompt = (
-            "You are a menu parser. Given the following restaurant menu text, extract all menu items "
-            "and organize them into categories. Return valid JSON with this exact structure:\n"
-            '{"categories": [{"name": "Category Name", "items": [{"name": "Item Name", '
-            '"description": "Description or null", "price": 12.99}]}]}\n\n'
-            "Rules:\n"
-            "- Group items into their natural categories (Appetizers, Mains, Desserts, etc.)\n"
-            "- Price should be a float or null if not found\n"
-            "- Description should be the item description or null\n"
-            "- If categories aren't clear, use 'Menu Items' as the default category\n"
-            "- Return ONLY valid JSON, no markdown formatting\n\n"
-            f"Menu text:\n{text[:16000]}"
-        )
-
-        response = await client.chat.completions.create(
+    outcomes = await run_chunked(
+        chunks,
+        lambda chunk: chat_json(
+            client,
+            _build_parse_prompt(chunk),
             model=model,
-            messages=[{"role": "user", "content": prompt}],
             temperature=0.1,
-            response_format={"type": "json_object"},
             timeout=60.0,
-        )
+        ),
+    )
 
-        import json
-        result = json.loads(response.choices[0].message.content)
-        categories = []
-        for cat in result.get("categories", []):
-            items = []
-            for item in cat.get("items", []):
-                items.append(ParsedItem(
-                    name=item.get("name", "Unknown"),
-                    description=item.get("description"),
-                    price=item.get("price"),
-                ))
-            categories.append(ParsedCategory(name=cat.get("name", "Menu Items"), items=items))
-
-        tokens = response.usage.total_tokens if response.usage else 0
-        log_fn(f"Parsed {sum(len(c.items) for c in categories)} items in {len(categories)} categories ({tokens} tokens)")
-        return ParsedMenu(categories=categories, ai_tokens=tokens)
+    chunk_categories: list[list[ParsedCategory]] = []
+    tokens = 0
+    for i, (chunk, outcome) in enumerate(zip(chunks, outcomes)):
+        if isinstance(outcome, Exception):
+            log_fn(f"OpenAI parsing failed for chunk {i + 1}/{len(chunks)}: {outcome}, using fallback")
+            chunk_categories.append(_fallback_parse(chunk).categories)
+            continue
+        result, chunk_tokens = outcome
+        tokens += chunk_tokens
+        chunk_categories.append(_categories_from_parse_result(result))
 
-    except Exception as e:
-        log_fn(f"OpenAI parsing failed or timed out: {e}, using fallback")
-        return _fallback_parse(text)
+    categories = _merge_parsed_categories(chunk_categories)
+    log_fn(f"Parsed {sum(len(c.items) for c in categories)} items in {len(categories)} categories ({tokens} tokens)")
+    return ParsedMenu(categories=categories, ai_tokens=tokens)
 
 
 def _fallback_parse(text: str) -> ParsedMenu:
@@ -625,6 +671,22 @@ def _fallback_parse(text: str) -> ParsedMenu:
     return ParsedMenu(categories=categories)
 
 
+def _build_enrich_prompt(items_for_prompt: list[dict]) -> str:
+    import json
+    return (
+        "You are a food expert. For each menu item below, provide:\n"
+        "- A short, appetizing description (1-2 sentences) ONLY if the description field is empty. "
+        "If a description already exists from the restaurant, keep it as-is.\n"
+        "- dietary_tags: array of relevant tags from [vegetarian, vegan, gluten-free, halal, spicy, "
+        "contains-nuts, dairy-free, seafood, keto, sugar-free]\n"
+        "- allergens: array from [dairy, nuts, gluten, shellfish, eggs, soy, fish, sesame, mustard]\n\n"
+        "Return valid JSON: {\"items\": [{\"idx\": 0, \"description\": \"...\", "
+        "\"dietary_tags\": [...], \"allergens\": [...]}]}\n\n"
+        "ONLY return the JSON, no markdown.\n\n"
+        f"Menu items:\n{json.dumps(items_for_prompt, ensure_ascii=False)}"
+    )
+
+
 async def enrich_items_with_ai(parsed_menu: ParsedMenu, log_fn=None) -> ParsedMenu:
     """Use OpenAI to enrich menu items with descriptions, dietary_tags, and allergens.
 
@@ -654,55 +716,57 @@ async def enrich_items_with_ai(parsed_menu: ParsedMenu, log_fn=None) -> ParsedMe
             "price": item.price,
         })
 
-    import json
-    prompt = (
-        "You are a food expert. For each menu item below, provide:\n"
-        "- A short, appetizing description (1-2 sentences) ONLY if the description field is empty. "
-        "If a description already exists from the restaurant, keep it as-is.\n"
-        "- dietary_tags: array of relevant tags from [vegetarian, vegan, gluten-free, halal, spicy, "
-        "contains-nuts, dairy-free, seafood, keto, sugar-free]\n"
-        "- allergens: array from [dairy, nuts, gluten, shellfish, eggs, soy, fish, sesame, mustard]\n\n"
-        "Return valid JSON: {\"items\": [{\"idx\": 0, \"description\": \"...\", "
-        "\"dietary_tags\": [...], \"allergens\": [...]}]}\n\n"
-        "ONLY return the JSON, no markdown.\n\n"
-        f"Menu items:\n{json.dumps(items_for_prompt[:80], ensure_ascii=False)}"
-    )
+    chunks = chunk_items(items_for_prompt)
+    if len(chunks) > 1:
+        log_fn(f"Enriching {len(items_for_prompt)} items in {len(chunks)} chunks")
 
     try:
         from openai import AsyncOpenAI
         client = AsyncOpenAI(api_key=api_key)
+    except Exception as e:
+        log_fn(f"AI enrichment failed: {e}")
+        return parsed_menu
 
-        response = await client.chat.completions.create(
+    outcomes = await run_chunked(
+        chunks,
+        lambda chunk: chat_json(
+            client,
+            _build_enrich_prompt(chunk),
             model=model,
-            messages=[{"role": "user", "content": prompt}],
             temperature=0.2,
-            response_format={"type": "json_object"},
             timeout=60.0,
-        )
-
-        result = json.loads(response.choices[0].message.content)
-        enriched = {item["idx"]: item for item in result.get("items", [])}
-
-        count = 0
-        desc_filled = 0
-        for i, (_, item) in enumerate(all_items):
-            if i in enriched:
-                e = enriched[i]
-                # Only use AI description if item has no website description
-                if not item.description and e.get("description"):
-                    item.description = e["description"]
-                    desc_filled += 1
-                # Always apply tags and allergens (website can't provide these)
-                item.dietary_tags = e.get("dietary_tags", [])
-                item.allergens = e.get("allergens", [])
-                count += 1
-
-        tokens = response.usage.total_tokens if response.usage else 0
-        parsed_menu.ai_tokens += tokens
-        log_fn(f"AI-enriched {count} items (tags/allergens), filled {desc_filled} missing descriptions ({tokens} tokens)")
+        ),
+    )
 
-    except Exception as e:
-        log_fn(f"AI enrichment failed: {e}")
+    # idx values are global across chunks, so merging is a plain dict update.
+    enriched: dict[int, dict] = {}
+    tokens = 0
+    for i, outcome in enumerate(outcomes):
+        if isinstance(outcome, Exception):
+            log_fn(f"AI enrichment failed for chunk {i + 1}/{len(chunks)}: {outcome}")
+            continue
+        result, chunk_tokens = outcome
+        tokens += chunk_tokens
+        for entry in result.get("items", []):
+            if isinstance(entry, dict) and isinstance(entry.get("idx"), int):
+                enriched[entry["idx"]] = entry
+
+    count = 0
+    desc_filled = 0
+    for i, (_, item) in enumerate(all_items):
+        if i in enriched:
+            e = enriched[i]
+            # Only use AI description if item has no website description
+            if not item.description and e.get("description"):
+                item.description = e["description"]
+                desc_filled += 1
+            # Always apply tags and allergens (website can't provide these)
+            item.dietary_tags = e.get("dietary_tags", [])
+            item.allergens = e.get("allergens", [])
+            count += 1
+
+    parsed_menu.ai_tokens += tokens
+    log_fn(f"AI-enriched {count} items (tags/allergens), filled {desc_filled} missing descriptions ({tokens} tokens)")
 
     return parsed_menu
 
@@ -731,7 +795,6 @@ async def generate_style_template(
 
     try:
         from openai import AsyncOpenAI
-        import json
 
         client = AsyncOpenAI(api_key=api_key)
 
@@ -751,17 +814,14 @@ async def generate_style_template(
             "warm lighting, 45 degree angle, shallow depth of field\", \"background\": \"dark\"}"
         )
 
-        response = await client.chat.completions.create(
+        result, tokens = await chat_json(
+            client,
+            prompt,
             model=model,
-            messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
-            response_format={"type": "json_object"},
             timeout=30.0,
         )
-
-        result = json.loads(response.choices[0].message.content)
         style = result.get("style", default_style)
-        tokens = response.usage.total_tokens if response.usage else 0
         log_fn(f"Generated style template: {style} ({tokens} tokens)")
         return style, tokens
 
@@ -0,0 +1,370 @@
+"""
+Record/replay of the importer's external calls, for offline runs and benchmarks.
+
+A cassette is a directory holding cassette.json (one entry per external call,
+with its outcome and observed latency) and bodies/ (response bodies, stored
+once per content hash). use_cassette() swaps the importer's network seams for
+recording or replaying versions:
+
+- importer.utils._fetch_url (every page, PDF and image download);
+- openai.AsyncOpenAI (menu parsing, enrichment and style template calls);
+- the website_resolver providers (Google Places, SerpAPI, DuckDuckGo);
+- importer.image_collector._ddgs_image_results (dish image search).
+
+Replays sleep for the recorded latency times latency_scale (0 disables it),
+still under the fetch semaphore, so concurrency changes can be measured
+without network access. Calls missing from the cassette fail like an offline
+network (or raise ReplayMiss when strict).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Iterator, Optional
+
+import httpx
+
+from importer import image_collector, utils, website_resolver
+from importer.ai_chunker import response_cache_key
+
+
+CASSETTE_VERSION = 1
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+# Environment switches that decide which code paths run; recorded so a replay
+# takes the same branches (values are placeholders, never the real secrets).
+_REPLAYED_ENV = ("OPENAI_API_KEY", "OPENAI_MODEL", "GOOGLE_PLACES_API_KEY", "SERPAPI_KEY", "IMPORTER_WEBSITE_IMAGES_ONLY")
+_SECRET_ENV = {"OPENAI_API_KEY", "GOOGLE_PLACES_API_KEY", "SERPAPI_KEY"}
+# The on-disk completion cache would hide OpenAI calls from both modes.
+_DISABLED_ENV = ("IMPORTER_AI_CACHE_DIR",)
+
+
+class ReplayMiss(RuntimeError):
+    pass
+
+
+@dataclass
+class CassetteStats:
+    hits: int = 0
+    misses: list[str] = field(default_factory=list)
+    recorded: int = 0
+
+
+class Cassette:
+    def __init__(self, path: Path, *, meta: Optional[dict] = None):
+        self.path = Path(path)
+        self.meta: dict = dict(meta or {})
+        self._entries: dict[tuple[str, str], dict] = {}
+        self._lock = threading.Lock()
+        self.stats = CassetteStats()
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        path = Path(path)
+        payload = json.loads((path / "cassette.json").read_text())
+        if payload.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {path}: {payload.get('version')}")
+        cassette = cls(path, meta=payload.get("meta"))
+        for entry in payload.get("entries", []):
+            cassette._entries[(entry["kind"], entry["key"])] = entry
+        return cassette
+
+    def save(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda entry: (entry["kind"], entry["key"]))
+        payload = {"version": CASSETTE_VERSION, "meta": self.meta, "entries": entries}
+        (self.path / "cassette.json").write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, kind: str, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is None:
+                self.stats.misses.append(f"{kind}:{key}")
+            else:
+                self.stats.hits += 1
+            return entry
+
+    def put(self, kind: str, key: str, entry: dict) -> None:
+        with self._lock:
+            # The first outcome wins: later calls for the same key are usually
+            # cache-busting retries of an identical request.
+            if (kind, key) not in self._entries:
+                self._entries[(kind, key)] = {"kind": kind, "key": key, **entry}
+                self.stats.recorded += 1
+
+    def write_body(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        relative = f"bodies/{digest[:2]}/{digest}.bin"
+        target = self.path / relative
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+        return relative
+
+    def read_body(self, relative: Optional[str]) -> bytes:
+        if not relative:
+            return b""
+        return (self.path / relative).read_bytes()
+
+
+# ---------------------------------------------------------------------------
+# Recording and replaying seams
+# ---------------------------------------------------------------------------
+
+class _Session:
+    def __init__(self, cassette: Cassette, mode: str, *, latency_scale: float, strict: bool, originals: dict):
+        self.cassette = cassette
+        self.mode = mode
+        self.latency_scale = max(latency_scale, 0.0)
+        self.strict = strict
+        self.originals = originals
+
+    def lookup(self, kind: str, key: str) -> Optional[dict]:
+        entry = self.cassette.get(kind, key)
+        if entry is None and self.strict:
+            raise ReplayMiss(f"No recorded {kind} call for {key!r}")
+        return entry
+
+    async def wait(self, entry: dict) -> None:
+        delay = float(entry.get("latency_s") or 0.0) * self.latency_scale
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def wait_blocking(self, entry: dict) -> None:
+        delay = float(entry.get("latency_s") or 0.0) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+
+    # -- fetch -------------------------------------------------------------
+
+    async def fetch(self, url: str, *, timeout: float, max_retries: int, headers: Optional[dict]) -> httpx.Response:
+        if self.mode == MODE_RECORD:
+            return await self._record_fetch(url, timeout=timeout, max_retries=max_retries, headers=headers)
+        request = httpx.Request("GET", url)
+        entry = self.lookup("fetch", url)
+        if entry is None:
+            raise httpx.ConnectError(f"{url} is not in the cassette", request=request)
+        async with utils._get_semaphore():
+            await self.wait(entry)
+        if entry.get("error"):
+            raise httpx.ConnectError(entry["error"], request=request)
+        response = httpx.Response(
+            entry["status"],
+            headers=entry.get("headers") or {},
+            content=self.cassette.read_body(entry.get("body")),
+            request=httpx.Request("GET", entry.get("final_url") or url),
+        )
+        if response.status_code >= 400:
+            raise httpx.HTTPStatusError(f"HTTP {response.status_code}", request=request, response=response)
+        return response
+
+    async def _record_fetch(self, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self.originals["fetch"](url, **kwargs)
+        except httpx.HTTPStatusError as exc:
+            self._put_response(url, exc.response, time.perf_counter() - started)
+            raise
+        except Exception as exc:
+            self.cassette.put(
+                "fetch",
+                url,
+                {"error": f"{type(exc).__name__}: {exc}", "latency_s": time.perf_counter() - started},
+            )
+            raise
+        self._put_response(url, response, time.perf_counter() - started)
+        return response
+
+    def _put_response(self, url: str, response: httpx.Response, latency: float) -> None:
+        content_type = response.headers.get("content-type")
+        self.cassette.put(
+            "fetch",
+            url,
+            {
+                "status": response.status_code,
+                "headers": {"content-type": content_type} if content_type else {},
+                "final_url": str(response.request.url) if response.request is not None else url,
+                "body": self.cassette.write_body(response.content),
+                "latency_s": latency,
+            },
+        )
+
+    # -- OpenAI ------------------------------------------------------------
+
+    async def chat_completion(self, real_client, **kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        key = response_cache_key(kwargs["model"], prompt)
+        if self.mode == MODE_RECORD:
+            started = time.perf_counter()
+            response = await real_client.chat.completions.create(**kwargs)
+            self.cassette.put(
+                "openai",
+                key,
+                {
+                    "model": kwargs["model"],
+                    "content": response.choices[0].message.content,
+                    "total_tokens": response.usage.total_tokens if response.usage else 0,
+                    "latency_s": time.perf_counter() - started,
+                },
+            )
+            return response
+        entry = self.lookup("openai", key)
+        if entry is None:
+            raise ReplayMiss(f"No recorded completion for prompt {key[:12]}")
+        await self.wait(entry)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=entry["content"]))],
+            usage=SimpleNamespace(total_tokens=entry.get("total_tokens", 0)),
+        )
+
+    def openai_client_class(self):
+        session = self
+        real_class = self.originals["openai_client"]
+
+        class _Completions:
+            def __init__(self, real_client):
+                self._real_client = real_client
+
+            async def create(self, **kwargs):
+                return await session.chat_completion(self._real_client, **kwargs)
+
+        class CassetteAsyncOpenAI:
+            def __init__(self, *args, **kwargs):
+                real_client = real_class(*args, **kwargs) if session.mode == MODE_RECORD else None
+                self.chat = SimpleNamespace(completions=_Completions(real_client))
+
+        return CassetteAsyncOpenAI
+
+    # -- resolvers and image search ------------------------------------------
+
+    def resolver(self, provider: str):
+        original = self.originals[f"resolver:{provider}"]
+
+        async def _resolve(*args, **kwargs):
+            query = kwargs.get("search_query") or (args[0] if args else "")
+            key = f"{provider}:{query}"
+            if self.mode == MODE_RECORD:
+                started = time.perf_counter()
+                result = await original(*args, **kwargs)
+                self.cassette.put("resolver", key, {"value": result, "latency_s": time.perf_counter() - started})
+                return result
+            entry = self.lookup("resolver", key)
+            if entry is None:
+                return None
+            await self.wait(entry)
+            return entry.get("value")
+
+        return _resolve
+
+    def ddgs_image_results(self, query: str) -> list[dict]:
+        if self.mode == MODE_RECORD:
+            started = time.perf_counter()
+            results = self.originals["ddgs_images"](query)
+            self.cassette.put(
+                "ddgs_images",
+                query,
+                {"value": [{"image": result.get("image")} for result in results], "latency_s": time.perf_counter() - started},
+            )
+            return results
+        entry = self.lookup("ddgs_images", query)
+        if entry is None:
+            return []
+        self.wait_blocking(entry)
+        return list(entry.get("value") or [])
+
+
+_RESOLVERS = {
+    "google_places": "_resolve_via_google_places",
+    "serpapi": "_resolve_via_serpapi",
+    "ddgs": "_resolve_via_ddgs",
+}
+
+
+def _recorded_env() -> dict:
+    env = {}
+    for name in _REPLAYED_ENV:
+        value = os.getenv(name)
+        if value:
+            env[name] = "replay" if name in _SECRET_ENV else value
+    return env
+
+
+@contextmanager
+def _patched_env(names: tuple[str, ...], values: dict) -> Iterator[None]:
+    previous = {name: os.environ.get(name) for name in (*names, *values)}
+    for name in names:
+        os.environ.pop(name, None)
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+@contextmanager
+def use_cassette(
+    cassette: Cassette,
+    *,
+    mode: str = MODE_REPLAY,
+    latency_scale: float = 1.0,
+    strict: bool = False,
+) -> Iterator[Cassette]:
+    """Route the importer's external calls through `cassette` for the duration.
+
+    Recording saves the cassette on exit. Not safe to nest or to use while
+    a real import job runs in the same process.
+    """
+    if mode not in (MODE_RECORD, MODE_REPLAY):
+        raise ValueError(f"Unknown cassette mode: {mode}")
+    import openai
+
+    originals: dict[str, Any] = {
+        "fetch": utils._fetch_url,
+        "openai_client": openai.AsyncOpenAI,
+        "ddgs_images": image_collector._ddgs_image_results,
+    }
+    for provider, attribute in _RESOLVERS.items():
+        originals[f"resolver:{provider}"] = getattr(website_resolver, attribute)
+    session = _Session(cassette, mode, latency_scale=latency_scale, strict=strict, originals=originals)
+
+    if mode == MODE_RECORD:
+        cassette.meta.setdefault("env", _recorded_env())
+
+    utils._fetch_url = session.fetch
+    openai.AsyncOpenAI = session.openai_client_class()
+    image_collector._ddgs_image_results = session.ddgs_image_results
+    for provider, attribute in _RESOLVERS.items():
+        setattr(website_resolver, attribute, session.resolver(provider))
+    if mode == MODE_RECORD:
+        env = _patched_env(_DISABLED_ENV, {})
+    else:
+        env = _patched_env((*_REPLAYED_ENV, *_DISABLED_ENV), cassette.meta.get("env") or {})
+    try:
+        with env:
+            yield cassette
+    finally:
+        utils._fetch_url = originals["fetch"]
+        openai.AsyncOpenAI = originals["openai_client"]
+        image_collector._ddgs_image_results = originals["ddgs_images"]
+        for provider, attribute in _RESOLVERS.items():
+            setattr(website_resolver, attribute, originals[f"resolver:{provider}"])
+        if mode == MODE_RECORD:
+            cassette.save()
@@ -13,6 +13,8 @@ from urllib.robotparser import RobotFileParser
 
 import httpx
 
+from metrics import registry as metrics_registry
+
 # ---------------------------------------------------------------------------
 # Slugify
 # ---------------------------------------------------------------------------
@@ -52,6 +54,17 @@ def slugify(text: str) -> str:
 
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
 MAX_CONCURRENT = 2
+
+FETCH_SECONDS = metrics_registry.histogram(
+    "menuvium_importer_fetch_seconds",
+    "fetch_url latency including retries and rate-limit waits, by outcome.",
+    ("outcome",),
+)
+FETCH_RETRIES_TOTAL = metrics_registry.counter(
+    "menuvium_importer_fetch_retries_total",
+    "fetch_url retries by cause (server_error or transport_error).",
+    ("reason",),
+)
 _semaphore: Optional[asyncio.Semaphore] = None
 
 def _get_semaphore() -> asyncio.Semaphore:
@@ -141,6 +154,14 @@ async def _fetch_with_cloudscraper(
         return None
 
 
+def _fetch_outcome(exc: Exception) -> str:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return "client_error" if exc.response.status_code < 500 else "server_error"
+    if isinstance(exc, httpx.RequestError):
+        return "transport_error"
+    return "error"
+
+
 async def fetch_url(
     url: str,
     *,
@@ -149,6 +170,24 @@ async def fetch_url(
     headers: Optional[dict] = None,
 ) -> httpx.Response:
     """Fetch a URL with rate limiting, retries, and backoff."""
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        return await _fetch_url(url, timeout=timeout, max_retries=max_retries, headers=headers)
+    except Exception as exc:
+        outcome = _fetch_outcome(exc)
+        raise
+    finally:
+        FETCH_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
+
+
+async def _fetch_url(
+    url: str,
+    *,
+    timeout: float,
+    max_retries: int,
+    headers: Optional[dict],
+) -> httpx.Response:
     sem = _get_semaphore()
     req_headers = {
         "User-Agent": USER_AGENT,
@@ -197,10 +236,14 @@ async def fetch_url(
                 if 400 <= exc.response.status_code < 500:
                     raise
                 last_exc = exc
+                if attempt < max_retries - 1:
+                    FETCH_RETRIES_TOTAL.inc(reason="server_error")
                 wait = 2 ** attempt
                 await asyncio.sleep(wait)
             except httpx.RequestError as exc:
                 last_exc = exc
+                if attempt < max_retries - 1:
+                    FETCH_RETRIES_TOTAL.inc(reason="transport_error")
                 wait = 2 ** attempt
                 await asyncio.sleep(wait)
     raise last_exc or RuntimeError(f"Failed to fetch {url}")
@@ -3,7 +3,8 @@ Background worker for menu importer jobs.
 
 Runs as a background thread inside the FastAPI process.
 Polls the database every 5 seconds for QUEUED jobs and processes them
-through the dish-first pipeline.
+through the dish-first pipeline. Per-dish image search, enhancement and
+zip writing run as overlapped stages connected by bounded queues.
 """
 
 import asyncio
@@ -11,12 +12,14 @@ import json
 import threading
 import time
 import traceback
+from dataclasses import dataclass
 from datetime import datetime
 from urllib.parse import urlparse
 
 from sqlmodel import Session, select
 
 from database import get_engine
+from metrics import registry as metrics_registry, seconds_since
 from models import ImportJob
 
 from importer.website_resolver import resolve_website
@@ -24,11 +27,38 @@ from importer.menu_extractor import extract_menu, enrich_items_with_ai, generate
 from importer.image_collector import find_dish_image, _html_cache, _get_image_extension
 from importer.image_enhancer import enhance_image
 from importer.manifest_builder import build_manifest
-from importer.zipper import create_zip, store_zip
+from importer.zipper import ZipBuilder, store_zip
 from importer.utils import slugify, fetch_url_bytes
 
 
 POLL_INTERVAL = 5  # seconds
+IMAGE_SEARCH_CONCURRENCY = 4
+IMAGE_ENHANCE_CONCURRENCY = 2
+STAGE_QUEUE_SIZE = 8  # bound on in-flight images between stages
+
+_STAGE_DONE = object()
+
+_STAGE_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+IMPORT_JOBS_TOTAL = metrics_registry.counter(
+    "menuvium_import_jobs_total", "Finished importer jobs by final status.", ("status",)
+)
+IMPORT_JOB_SECONDS = metrics_registry.histogram(
+    "menuvium_import_job_seconds", "Importer job run time by final status.", ("status",), buckets=_STAGE_BUCKETS
+)
+IMPORT_STAGE_SECONDS = metrics_registry.histogram(
+    "menuvium_import_stage_seconds", "Time spent in each importer pipeline step.", ("stage",), buckets=_STAGE_BUCKETS
+)
+IMPORT_DISH_STAGE_SECONDS = metrics_registry.histogram(
+    "menuvium_import_dish_stage_seconds", "Per-dish image search, enhancement and zip time.", ("stage",)
+)
+IMPORT_QUEUE_WAIT_SECONDS = metrics_registry.histogram(
+    "menuvium_import_queue_wait_seconds", "Time importer jobs spent QUEUED before a worker picked them.",
+    buckets=_STAGE_BUCKETS,
+)
+IMPORT_JOBS_RUNNING = metrics_registry.gauge(
+    "menuvium_import_jobs_running", "Importer jobs currently being processed by this process."
+)
 
 
 def start_worker():
@@ -49,7 +79,9 @@ def _worker_loop():
             job = _pick_next_job()
             if job:
                 print(f"[menu-importer] Processing job {job.id}: {job.restaurant_name}")
-                loop.run_until_complete(_process_job(job.id))
+                IMPORT_QUEUE_WAIT_SECONDS.observe(seconds_since(job.created_at, now=job.started_at))
+                with IMPORT_JOBS_RUNNING.track_inprogress():
+                    loop.run_until_complete(_process_job(job.id))
             else:
                 time.sleep(POLL_INTERVAL)
         except Exception as e:
@@ -120,6 +152,204 @@ def _log_and_update(job_id, message: str, progress: int, current_step: str):
     _update_job(job_id, progress=progress, current_step=current_step)
 
 
+class _StageTimer:
+    """Times consecutive pipeline steps: entering a step closes the previous one."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._stage: str | None = None
+        self._stage_started = self.started
+
+    def enter(self, stage: str | None) -> None:
+        now = time.perf_counter()
+        if self._stage is not None:
+            IMPORT_STAGE_SECONDS.observe(now - self._stage_started, stage=self._stage)
+        self._stage = stage
+        self._stage_started = now
+
+    def finish(self, status: str) -> None:
+        self.enter(None)
+        IMPORT_JOBS_TOTAL.inc(status=status)
+        IMPORT_JOB_SECONDS.observe(time.perf_counter() - self.started, status=status)
+
+
+@dataclass
+class _StageCounters:
+    """Counters for the overlapped dish stages; job progress is derived from them."""
+
+    total_items: int
+    enrichment_done: bool = False
+    style_done: bool = False
+    searched: int = 0
+    images_found: int = 0
+    enhanced: int = 0
+    zipped: int = 0
+
+    def finished_items(self) -> int:
+        # Dishes without an image are finished as soon as their search is.
+        return (self.searched - self.images_found) + self.zipped
+
+    def progress(self) -> int:
+        total = max(self.total_items, 1)
+        pct = 35
+        pct += 5 * int(self.enrichment_done) + 5 * int(self.style_done)
+        pct += int(35 * self.searched / total)
+        pct += int(10 * self.finished_items() / total)
+        return min(pct, 90)
+
+    def current_step(self) -> str:
+        if self.searched < self.total_items:
+            return f"Finding dish images ({self.searched}/{self.total_items})"
+        if self.enhanced < self.images_found:
+            return f"Enhancing images ({self.enhanced}/{self.images_found})"
+        if not self.enrichment_done:
+            return "AI enrichment"
+        return "Creating zip"
+
+
+def _progress_reporter(job_id, counters: _StageCounters):
+    """Return a callback that writes progress only when it actually changes."""
+    last = {"state": None}
+
+    def report():
+        state = (counters.progress(), counters.current_step())
+        if state != last["state"]:
+            last["state"] = state
+            _update_job(job_id, progress=state[0], current_step=state[1])
+
+    return report
+
+
+async def _find_item_image(item, *, website_url, restaurant_name, page_urls, seen_hashes, style_task, log):
+    """Find an image for one dish: native source URL first, then website/search."""
+    # 1. Direct source image URL (from specific extractors like Mealsy)
+    if item.source_image_url:
+        try:
+            data = await fetch_url_bytes(item.source_image_url)
+            if len(data) > 3000:
+                ext = _get_image_extension(item.source_image_url, data)
+                log(f"Downloaded native image for '{item.name}'")
+                return {"data": data, "ext": ext, "source": "native"}
+        except Exception as e:
+            log(f"Failed to download native image for '{item.name}': {e}")
+
+    # 2. General fallback: search website HTML then image search
+    style_template, _ = await style_task
+    return await find_dish_image(
+        dish_name=item.name,
+        website_url=website_url,
+        restaurant_name=restaurant_name,
+        page_urls=page_urls,
+        seen_hashes=seen_hashes,
+        style_template=style_template,
+        log_fn=log,
+    )
+
+
+async def _run_dish_stages(
+    all_items,
+    *,
+    website_url,
+    restaurant_name,
+    page_urls,
+    style_task,
+    zip_builder: ZipBuilder,
+    counters: _StageCounters,
+    report,
+    log,
+):
+    """Stream dishes through image search → enhancement → zip via bounded queues."""
+    search_queue: asyncio.Queue = asyncio.Queue()
+    for entry in enumerate(all_items):
+        search_queue.put_nowait(entry)
+    enhance_queue: asyncio.Queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+    zip_queue: asyncio.Queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+    seen_hashes: set[str] = set()
+
+    async def search_worker():
+        while True:
+            try:
+                i, (_, item) = search_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            img_result = await _find_item_image(
+                item,
+                website_url=website_url,
+                restaurant_name=restaurant_name,
+                page_urls=page_urls,
+                seen_hashes=seen_hashes,
+                style_task=style_task,
+                log=log,
+            )
+            IMPORT_DISH_STAGE_SECONDS.observe(time.perf_counter() - started, stage="search")
+            counters.searched += 1
+            if img_result:
+                fname = f"dish_{i + 1:03d}{img_result['ext']}"
+                item.image_filename = fname
+                counters.images_found += 1
+                log(f"Found image for '{item.name}' ({img_result.get('source', 'unknown')}): {fname}")
+                await enhance_queue.put((item, fname, img_result["data"]))
+            else:
+                log(f"No image found for '{item.name}'")
+            report()
+
+    async def enhance_worker():
+        while True:
+            entry = await enhance_queue.get()
+            if entry is _STAGE_DONE:
+                return
+            item, fname, data = entry
+            started = time.perf_counter()
+            try:
+                data = await enhance_image(data, fname, log_fn=log)
+                # Convert to webp filename
+                fname = f"{fname.rsplit('.', 1)[0]}.webp"
+                item.image_filename = fname
+            except Exception as e:
+                log(f"Failed to enhance {fname}: {e}")
+                # Keep original
+            IMPORT_DISH_STAGE_SECONDS.observe(time.perf_counter() - started, stage="enhance")
+            counters.enhanced += 1
+            await zip_queue.put((fname, data))
+
+    async def zip_worker():
+        while True:
+            entry = await zip_queue.get()
+            if entry is _STAGE_DONE:
+                return
+            fname, data = entry
+            with IMPORT_DISH_STAGE_SECONDS.time(stage="zip"):
+                await asyncio.to_thread(zip_builder.add_image, fname, data)
+            counters.zipped += 1
+            report()
+
+    async def run_stage(workers, downstream: asyncio.Queue, downstream_workers: int):
+        await asyncio.gather(*workers)
+        for _ in range(downstream_workers):
+            await downstream.put(_STAGE_DONE)
+
+    stages = [
+        asyncio.create_task(run_stage(
+            [search_worker() for _ in range(IMAGE_SEARCH_CONCURRENCY)],
+            enhance_queue,
+            IMAGE_ENHANCE_CONCURRENCY,
+        )),
+        asyncio.create_task(run_stage(
+            [enhance_worker() for _ in range(IMAGE_ENHANCE_CONCURRENCY)],
+            zip_queue,
+            1,
+        )),
+        asyncio.create_task(zip_worker()),
+    ]
+    try:
+        await asyncio.gather(*stages)
+    except BaseException:
+        for task in stages:
+            task.cancel()
+        raise
+
+
 async def _process_job(job_id):
     """Execute the dish-first import pipeline for a single job."""
     engine = get_engine()
@@ -139,9 +369,12 @@ async def _process_job(job_id):
 
     # Clear HTML cache between jobs
     _html_cache.clear()
+    stages = _StageTimer()
+    status = "FAILED"
 
     try:
         # ---- Step 1: Resolve website (0 → 10%) ----
+        stages.enter("resolve_website")
         _log_and_update(job_id, "Resolving restaurant website...", 0, "Resolving website")
 
         website_url = await resolve_website(
@@ -155,6 +388,7 @@ async def _process_job(job_id):
                 5,
                 "Needs website URL",
             )
+            status = "NEEDS_INPUT"
             _update_job(
                 job_id,
                 status="NEEDS_INPUT",
@@ -171,6 +405,7 @@ async def _process_job(job_id):
         )
 
         # ---- Step 2: Extract menu text (10 → 35%) ----
+        stages.enter("extract_menu")
         _log_and_update(job_id, "Extracting menu data...", 10, "Extracting menu")
 
         parsed_menu = await extract_menu(website_url, log_fn=log)
@@ -214,24 +449,16 @@ async def _process_job(job_id):
             },
         )
 
-        # ---- Step 3: AI-enrich items (35 → 42%) ----
-        _log_and_update(job_id, "Enriching items with AI (descriptions, tags, allergens)...", 35, "AI enrichment")
-
-        parsed_menu = await enrich_items_with_ai(parsed_menu, log_fn=log)
-        total_ai_tokens = getattr(parsed_menu, "ai_tokens", total_ai_tokens)
-        _update_job(job_id, progress=42, current_step="Creating style template")
-
-        # ---- Step 3b: Generate consistent style template (42 → 45%) ----
-        # Determine cuisine from category names
-        category_names = ", ".join(cat.name for cat in parsed_menu.categories[:5])
-        style_template, style_tokens = await generate_style_template(
-            restaurant_name, category_names, log_fn=log
+        # ---- Steps 3-5: Overlapped dish stages (35 → 90%) ----
+        # AI enrichment and the style template run alongside per-dish image
+        # search; found images stream through enhancement straight into the zip.
+        stages.enter("dish_stages")
+        _log_and_update(
+            job_id,
+            "Enriching items with AI and finding dish images...",
+            35,
+            "AI enrichment",
         )
-        total_ai_tokens += style_tokens
-        _update_job(job_id, progress=45, current_step="Finding dish images")
-
-        # ---- Step 4: Per-dish image search (45 → 80%) ----
-        _log_and_update(job_id, "Finding images for each dish...", 45, "Finding dish images")
 
         # Build list of pages to scan for images (website + menu source pages)
         parsed_base = urlparse(website_url)
@@ -245,93 +472,65 @@ async def _process_job(job_id):
             page_urls.append(base_origin)
 
         all_items = [(cat, item) for cat in parsed_menu.categories for item in cat.items]
-        seen_hashes: set[str] = set()
-        images_found = 0
-        images_data: list[dict] = []  # {filename, data}
-
-        for i, (cat, item) in enumerate(all_items):
-            img_result = None
-            
-            # 1. Direct source image URL (from specific extractors like Mealsy)
-            if item.source_image_url:
-                try:
-                    data = await fetch_url_bytes(item.source_image_url)
-                    if len(data) > 3000:
-                        ext = _get_image_extension(item.source_image_url, data)
-                        img_result = {"data": data, "ext": ext, "source": "native"}
-                        log(f"Downloaded native image for '{item.name}'")
-                except Exception as e:
-                    log(f"Failed to download native image for '{item.name}': {e}")
-                    
-            # 2. General fallback: search website HTML then Google
-            if not img_result:
-                img_result = await find_dish_image(
-                    dish_name=item.name,
-                    website_url=website_url,
-                    restaurant_name=restaurant_name,
-                    page_urls=page_urls,
-                    seen_hashes=seen_hashes,
-                    style_template=style_template,
-                    log_fn=log,
-                )
-
-            if img_result:
-                fname = f"dish_{i + 1:03d}{img_result['ext']}"
-                item.image_filename = fname
-                images_data.append({"filename": fname, "data": img_result["data"]})
-                images_found += 1
-                source = img_result.get("source", "unknown")
-                log(f"Found image for '{item.name}' ({source}): {fname}")
-            else:
-                log(f"No image found for '{item.name}'")
-
-            # Update progress proportionally
-            pct = 45 + int(35 * (i + 1) / max(len(all_items), 1))
-            _update_job(job_id, progress=min(pct, 80))
-
+        counters = _StageCounters(total_items=len(all_items))
+        report = _progress_reporter(job_id, counters)
+
+        async def _enrich():
+            await enrich_items_with_ai(parsed_menu, log_fn=log)
+            counters.enrichment_done = True
+            report()
+
+        async def _style():
+            # Determine cuisine from category names
+            category_names = ", ".join(cat.name for cat in parsed_menu.categories[:5])
+            result = await generate_style_template(restaurant_name, category_names, log_fn=log)
+            counters.style_done = True
+            report()
+            return result
+
+        enrich_task = asyncio.create_task(_enrich())
+        style_task = asyncio.create_task(_style())
+        zip_builder = ZipBuilder(restaurant_name)
+        try:
+            await _run_dish_stages(
+                all_items,
+                website_url=website_url,
+                restaurant_name=restaurant_name,
+                page_urls=page_urls,
+                style_task=style_task,
+                zip_builder=zip_builder,
+                counters=counters,
+                report=report,
+                log=log,
+            )
+            await enrich_task
+            _, style_tokens = await style_task
+        finally:
+            for task in (enrich_task, style_task):
+                if not task.done():
+                    task.cancel()
+
+        total_ai_tokens = getattr(parsed_menu, "ai_tokens", total_ai_tokens) + style_tokens
+        images_found = counters.images_found
         log(f"Image search complete: {images_found}/{total_items} dishes have images")
-
-        # ---- Step 5: Enhance images (80 → 90%) ----
-        _log_and_update(job_id, "Enhancing images...", 80, "Enhancing images")
-
-        enhanced_images: list[dict] = []
-        for i, img in enumerate(images_data):
-            try:
-                enhanced_data = await enhance_image(img["data"], img["filename"], log_fn=log)
-                # Convert to webp filename
-                base_name = img["filename"].rsplit(".", 1)[0]
-                webp_fname = f"{base_name}.webp"
-                enhanced_images.append({"filename": webp_fname, "data": enhanced_data})
-
-                # Update the item's filename to webp
-                for cat in parsed_menu.categories:
-                    for item in cat.items:
-                        if item.image_filename == img["filename"]:
-                            item.image_filename = webp_fname
-                            break
-            except Exception as e:
-                log(f"Failed to enhance {img['filename']}: {e}")
-                # Keep original
-                enhanced_images.append(img)
-
-            pct = 80 + int(10 * (i + 1) / max(len(images_data), 1))
-            _update_job(job_id, progress=min(pct, 90))
-
-        log(f"Enhanced {len(enhanced_images)} images")
+        log(f"Enhanced {counters.enhanced} images")
 
         # ---- Step 6: Build manifest (90 → 93%) ----
+        stages.enter("build_manifest")
         _log_and_update(job_id, "Building manifest.json...", 90, "Building manifest")
 
         manifest_json = build_manifest(restaurant_name, parsed_menu)
         log("Manifest built successfully")
 
-        # ---- Step 7: Create zip (93 → 96%) ----
+        # ---- Step 7: Finish zip (93 → 96%) ----
+        stages.enter("finish_zip")
         _log_and_update(job_id, "Creating zip archive...", 93, "Creating zip")
 
-        zip_data = create_zip(restaurant_name, manifest_json, enhanced_images)
+        zip_data = zip_builder.finish(manifest_json)
         log(f"Zip created: {len(zip_data)} bytes")
 
         # ---- Step 8: Store zip (96 → 100%) ----
+        stages.enter("store_zip")
         _log_and_update(job_id, "Storing zip...", 96, "Storing result")
 
         storage_key = store_zip(zip_data, str(job_id), restaurant_name, org_id=org_id)
@@ -355,6 +554,7 @@ async def _process_job(job_id):
                 "ai_tokens": total_ai_tokens,
             },
         )
+        status = "COMPLETED"
         _append_log(job_id, "✅ Job completed successfully!")
 
     except Exception as e:
@@ -367,3 +567,5 @@ async def _process_job(job_id):
             finished_at=datetime.utcnow(),
         )
         traceback.print_exc()
+    finally:
+        stages.finish(status)
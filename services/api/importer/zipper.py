@@ -18,10 +18,32 @@ import zipfile
 from pathlib import Path
 from typing import Optional
 
-import boto3
-
 from importer.utils import slugify
+from storage_backend import LocalStorageBackend, StorageBackend, get_storage_backend
 from storage_keys import import_result_zip_key
+from storage_utils import record_storage_transfer
+
+
+class ZipBuilder:
+    """Incrementally writes the restaurant folder structure into a zip archive.
+
+    Images can be added as soon as they are ready; the manifest is written
+    last by finish(), which returns the zip bytes.
+    """
+
+    def __init__(self, restaurant_name: str):
+        self._slug = slugify(restaurant_name)
+        self._buffer = io.BytesIO()
+        self._zf = zipfile.ZipFile(self._buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=6)
+
+    def add_image(self, filename: str, data: bytes) -> None:
+        self._zf.writestr(f"{self._slug}/images/{filename}", data)
+
+    def finish(self, manifest_json: str) -> bytes:
+        # manifest.json at root of restaurant folder
+        self._zf.writestr(f"{self._slug}/manifest.json", manifest_json)
+        self._zf.close()
+        return self._buffer.getvalue()
 
 
 def create_zip(
@@ -33,18 +55,10 @@ def create_zip(
 
     Returns the zip bytes.
     """
-    slug = slugify(restaurant_name)
-    buffer = io.BytesIO()
-
-    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
-        # manifest.json at root of restaurant folder
-        zf.writestr(f"{slug}/manifest.json", manifest_json)
-
-        # Images
-        for img in images:
-            zf.writestr(f"{slug}/images/{img['filename']}", img["data"])
-
-    return buffer.getvalue()
+    builder = ZipBuilder(restaurant_name)
+    for img in images:
+        builder.add_image(img["filename"], img["data"])
+    return builder.finish(manifest_json)
 
 
 def store_zip(
@@ -62,8 +76,9 @@ def store_zip(
     slug = slugify(restaurant_name)
     filename = f"{slug}.zip"
 
-    if _use_s3():
-        return _store_to_s3(zip_data, job_id, filename, org_id=org_id)
+    backend = _object_store()
+    if backend is not None:
+        return _store_to_s3(backend, zip_data, job_id, filename, org_id=org_id)
     else:
         return _store_locally(zip_data, job_id, filename, org_id=org_id)
 
@@ -73,52 +88,44 @@ def get_zip_data(storage_key: str) -> Optional[bytes]:
 
     Returns bytes or None if not found.
     """
-    if _use_s3():
-        return _get_from_s3(storage_key)
+    backend = _object_store()
+    if backend is not None:
+        return _get_from_s3(backend, storage_key)
     else:
         return _get_from_local(storage_key)
 
 
-def _use_s3() -> bool:
-    """Check if S3 storage is configured."""
-    return bool(os.getenv("S3_BUCKET_NAME")) and os.getenv("LOCAL_UPLOADS") != "1"
+def _object_store() -> Optional[StorageBackend]:
+    """The configured object store, or None when zips stay on local disk."""
+    if os.getenv("LOCAL_UPLOADS") == "1":
+        return None
+    backend = get_storage_backend()
+    if backend is None or isinstance(backend, LocalStorageBackend):
+        return None
+    return backend
 
 
-def _store_to_s3(data: bytes, job_id: str, filename: str, *, org_id: str | None = None) -> str:
+def _store_to_s3(backend: StorageBackend, data: bytes, job_id: str, filename: str, *, org_id: str | None = None) -> str:
     """Upload zip to S3 and return the key."""
-    bucket = os.getenv("S3_BUCKET_NAME")
     key = import_result_zip_key(job_id, filename, org_id=org_id)
-
-    s3 = boto3.client(
-        "s3",
-        region_name=os.getenv("AWS_REGION", "us-east-1"),
-        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-    )
-    s3.put_object(
-        Bucket=bucket,
-        Key=key,
-        Body=data,
-        ContentType="application/zip",
-        ContentDisposition=f'attachment; filename="{filename}"',
+    backend.put_bytes(
+        key,
+        data,
+        content_type="application/zip",
+        content_disposition=f'attachment; filename="{filename}"',
     )
+    record_storage_transfer("upload", len(data))
     return key
 
 
-def _get_from_s3(key: str) -> Optional[bytes]:
+def _get_from_s3(backend: StorageBackend, key: str) -> Optional[bytes]:
     """Download zip from S3."""
-    bucket = os.getenv("S3_BUCKET_NAME")
     try:
-        s3 = boto3.client(
-            "s3",
-            region_name=os.getenv("AWS_REGION", "us-east-1"),
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        )
-        response = s3.get_object(Bucket=bucket, Key=key)
-        return response["Body"].read()
+        data = backend.get_bytes(key)
     except Exception:
         return None
+    record_storage_transfer("download", len(data))
+    return data
 
 
 def _store_locally(data: bytes, job_id: str, filename: str, *, org_id: str | None = None) -> str:
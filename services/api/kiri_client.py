@@ -1,13 +1,64 @@
 from __future__ import annotations
 
+import asyncio
+import mimetypes
+import os
+import random
+import time
+import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Callable, Iterable
 
+import httpx
 import requests
+from urllib3.exceptions import NewConnectionError
+
+from metrics import registry as metrics_registry
 
 
 KIRI_BASE_URL = "https://api.kiriengine.app/api"
+UPLOAD_RETRY_ATTEMPTS = 3
+UPLOAD_RETRY_BASE_DELAY_SECONDS = 2.0
+GET_RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY_SECONDS = 0.5
+RETRY_MAX_DELAY_SECONDS = 20.0
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+STATUS_TIMEOUT_SECONDS = 15.0
+
+# Called with (bytes_sent, total_bytes) while a submission body is streamed.
+UploadProgressCallback = Callable[[int, int], None]
+
+KIRI_REQUESTS_TOTAL = metrics_registry.counter(
+    "menuvium_kiri_requests_total",
+    "KIRI API request attempts by endpoint and HTTP status (or transport_error).",
+    ("endpoint", "status"),
+)
+KIRI_REQUEST_SECONDS = metrics_registry.histogram(
+    "menuvium_kiri_request_seconds",
+    "KIRI API request attempt latency by endpoint.",
+    ("endpoint",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+KIRI_RETRIES_TOTAL = metrics_registry.counter(
+    "menuvium_kiri_retries_total",
+    "KIRI API retries by endpoint and cause.",
+    ("endpoint", "reason"),
+)
+
+
+def _endpoint_label(path: str) -> str:
+    return path.rsplit("/", 1)[-1] or path
+
+
+def _record_kiri_attempt(path: str, started: float, status: int | str) -> None:
+    endpoint = _endpoint_label(path)
+    KIRI_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+    KIRI_REQUESTS_TOTAL.inc(endpoint=endpoint, status=str(status))
+
+
+def _record_kiri_retry(path: str, reason: str) -> None:
+    KIRI_RETRIES_TOTAL.inc(endpoint=_endpoint_label(path), reason=reason)
 
 
 class KiriApiError(RuntimeError):
@@ -41,117 +92,117 @@ class KiriModelZip:
     model_url: str
 
 
-class KiriClient:
-    def __init__(self, api_key: str, *, base_url: str = KIRI_BASE_URL, timeout: float = 300.0):
-        self.api_key = api_key
-        self.base_url = base_url.rstrip("/")
-        self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({"Authorization": f"Bearer {api_key}"})
-
-    def submit_photo_images(
-        self,
-        *,
-        image_paths: Iterable[Path],
-        file_format: str,
-        model_quality: int,
-        texture_quality: int,
-        texture_smoothing: int,
-        is_mask: int,
-    ) -> KiriSubmittedJob:
-        files = [("imagesFiles", (path.name, path.open("rb"))) for path in image_paths]
+def retry_delay_seconds(attempt: int, *, retry_after: str | None = None) -> float:
+    """Full-jitter exponential backoff; a numeric Retry-After header wins when present."""
+    if retry_after:
         try:
-            data = {
-                "fileFormat": file_format,
-                "modelQuality": str(model_quality),
-                "textureQuality": str(texture_quality),
-                "textureSmoothing": str(texture_smoothing),
-                "isMask": str(is_mask),
-            }
-            payload = self._post("/v1/open/photo/image", files=files, data=data)
-            return KiriSubmittedJob(
-                serialize=str(payload["serialize"]),
-                calculate_type=int(payload["calculateType"]),
-            )
-        finally:
-            for _, (_, handle) in files:
-                handle.close()
+            return min(max(float(retry_after), 0.0), RETRY_MAX_DELAY_SECONDS)
+        except ValueError:
+            pass
+    ceiling = min(RETRY_BASE_DELAY_SECONDS * (2 ** attempt), RETRY_MAX_DELAY_SECONDS)
+    return random.uniform(ceiling / 2, ceiling)
 
-    def submit_photo_video(
+
+class MultipartFileStream:
+    """multipart/form-data body that reads files lazily, one at a time.
+
+    requests sees a file-like object with a known length, so it sends a
+    Content-Length header and pulls the body through read() in small blocks:
+    only one frame is open at a time and memory stays constant regardless of
+    how many frames are submitted. reset() rewinds for a retry.
+    """
+
+    def __init__(
         self,
         *,
-        video_path: Path,
-        file_format: str,
-        model_quality: int,
-        texture_quality: int,
-        texture_smoothing: int,
-        is_mask: int,
-    ) -> KiriSubmittedJob:
-        with video_path.open("rb") as handle:
-            payload = self._post(
-                "/v1/open/photo/video",
-                files={"videoFile": (video_path.name, handle)},
-                data={
-                    "fileFormat": file_format,
-                    "modelQuality": str(model_quality),
-                    "textureQuality": str(texture_quality),
-                    "textureSmoothing": str(texture_smoothing),
-                    "isMask": str(is_mask),
-                },
-            )
-        return KiriSubmittedJob(
-            serialize=str(payload["serialize"]),
-            calculate_type=int(payload["calculateType"]),
-        )
-
-    def submit_featureless_images(self, *, image_paths: Iterable[Path], file_format: str) -> KiriSubmittedJob:
-        files = [("imagesFiles", (path.name, path.open("rb"))) for path in image_paths]
-        try:
-            payload = self._post(
-                "/v1/open/featureless/image",
-                files=files,
-                data={"fileFormat": file_format},
-            )
-            return KiriSubmittedJob(
-                serialize=str(payload["serialize"]),
-                calculate_type=int(payload["calculateType"]),
+        fields: dict[str, str],
+        files: list[tuple[str, Path]],
+        progress_callback: UploadProgressCallback | None = None,
+    ):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.progress_callback = progress_callback
+        # Segments are bytes or Paths, streamed in order.
+        self._segments: list[bytes | Path] = []
+        for name, value in fields.items():
+            self._segments.append(
+                (
+                    f"--{self.boundary}\r\n"
+                    f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                    f"{value}\r\n"
+                ).encode("utf-8")
             )
-        finally:
-            for _, (_, handle) in files:
-                handle.close()
-
-    def submit_featureless_video(self, *, video_path: Path, file_format: str) -> KiriSubmittedJob:
-        with video_path.open("rb") as handle:
-            payload = self._post(
-                "/v1/open/featureless/video",
-                files={"videoFile": (video_path.name, handle)},
-                data={"fileFormat": file_format},
+        for name, path in files:
+            file_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            self._segments.append(
+                (
+                    f"--{self.boundary}\r\n"
+                    f'Content-Disposition: form-data; name="{name}"; filename="{path.name}"\r\n'
+                    f"Content-Type: {file_type}\r\n\r\n"
+                ).encode("utf-8")
             )
-        return KiriSubmittedJob(
-            serialize=str(payload["serialize"]),
-            calculate_type=int(payload["calculateType"]),
+            self._segments.append(path)
+            self._segments.append(b"\r\n")
+        self._segments.append(f"--{self.boundary}--\r\n".encode("utf-8"))
+        self.total_bytes = sum(
+            len(segment) if isinstance(segment, bytes) else segment.stat().st_size
+            for segment in self._segments
         )
+        self.reset()
+
+    def reset(self) -> None:
+        self.close()
+        self._index = 0
+        self._offset = 0
+        self._handle: BinaryIO | None = None
+        self.bytes_sent = 0
+
+    def __len__(self) -> int:
+        return self.total_bytes
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.total_bytes
+        chunks: list[bytes] = []
+        remaining = size
+        while remaining > 0 and self._index < len(self._segments):
+            segment = self._segments[self._index]
+            if isinstance(segment, bytes):
+                chunk = segment[self._offset:self._offset + remaining]
+                self._offset += len(chunk)
+                if self._offset >= len(segment):
+                    self._index += 1
+                    self._offset = 0
+            else:
+                if self._handle is None:
+                    self._handle = segment.open("rb")
+                chunk = self._handle.read(remaining)
+                if not chunk:
+                    self._handle.close()
+                    self._handle = None
+                    self._index += 1
+                    continue
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        data = b"".join(chunks)
+        if data:
+            self.bytes_sent += len(data)
+            if self.progress_callback is not None:
+                self.progress_callback(self.bytes_sent, self.total_bytes)
+        return data
 
-    def get_status(self, *, serialize: str) -> KiriModelStatus:
-        payload = self._get("/v1/open/model/getStatus", params={"serialize": serialize})
-        return KiriModelStatus(serialize=str(payload["serialize"]), status=int(payload["status"]))
+    def close(self) -> None:
+        handle = getattr(self, "_handle", None)
+        if handle is not None:
+            handle.close()
+            self._handle = None
 
-    def get_model_zip(self, *, serialize: str) -> KiriModelZip:
-        payload = self._get("/v1/open/model/getModelZip", params={"serialize": serialize})
-        return KiriModelZip(serialize=str(payload["serialize"]), model_url=str(payload["modelUrl"]))
 
-    def _post(self, path: str, *, files, data: dict) -> dict:
-        response = self.session.post(
-            f"{self.base_url}{path}",
-            files=files,
-            data=data,
-            timeout=self.timeout,
-        )
-        return self._parse_response(response)
+class _KiriResponseParser:
+    """Response parsing shared by the blocking and asyncio clients.
 
-    def _get(self, path: str, *, params: dict) -> dict:
-        response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
-        return self._parse_response(response)
+    Works with anything exposing status_code and json() (requests and httpx).
+    """
 
     @staticmethod
     def _clean_message(value) -> str | None:
@@ -194,7 +245,7 @@ class KiriClient:
                 return False
         return None
 
-    def _parse_response(self, response: requests.Response) -> dict:
+    def _parse_response(self, response) -> dict:
         try:
             payload = response.json()
         except ValueError as exc:
@@ -257,3 +308,339 @@ class KiriClient:
                 status_code=response.status_code,
             )
         return data
+
+
+class KiriClient(_KiriResponseParser):
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        base_url: str = KIRI_BASE_URL,
+        timeout: float = 300.0,
+        status_timeout: float = STATUS_TIMEOUT_SECONDS,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.status_timeout = status_timeout
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {api_key}"})
+
+    def submit_photo_images(
+        self,
+        *,
+        image_paths: Iterable[Path],
+        file_format: str,
+        model_quality: int,
+        texture_quality: int,
+        texture_smoothing: int,
+        is_mask: int,
+        progress_callback: UploadProgressCallback | None = None,
+    ) -> KiriSubmittedJob:
+        payload = self._post_files(
+            "/v1/open/photo/image",
+            fields={
+                "fileFormat": file_format,
+                "modelQuality": str(model_quality),
+                "textureQuality": str(texture_quality),
+                "textureSmoothing": str(texture_smoothing),
+                "isMask": str(is_mask),
+            },
+            files=[("imagesFiles", Path(path)) for path in image_paths],
+            progress_callback=progress_callback,
+        )
+        return KiriSubmittedJob(
+            serialize=str(payload["serialize"]),
+            calculate_type=int(payload["calculateType"]),
+        )
+
+    def submit_photo_video(
+        self,
+        *,
+        video_path: Path,
+        file_format: str,
+        model_quality: int,
+        texture_quality: int,
+        texture_smoothing: int,
+        is_mask: int,
+        progress_callback: UploadProgressCallback | None = None,
+    ) -> KiriSubmittedJob:
+        payload = self._post_files(
+            "/v1/open/photo/video",
+            fields={
+                "fileFormat": file_format,
+                "modelQuality": str(model_quality),
+                "textureQuality": str(texture_quality),
+                "textureSmoothing": str(texture_smoothing),
+                "isMask": str(is_mask),
+            },
+            files=[("videoFile", Path(video_path))],
+            progress_callback=progress_callback,
+        )
+        return KiriSubmittedJob(
+            serialize=str(payload["serialize"]),
+            calculate_type=int(payload["calculateType"]),
+        )
+
+    def submit_featureless_images(
+        self,
+        *,
+        image_paths: Iterable[Path],
+        file_format: str,
+        progress_callback: UploadProgressCallback | None = None,
+    ) -> KiriSubmittedJob:
+        payload = self._post_files(
+            "/v1/open/featureless/image",
+            fields={"fileFormat": file_format},
+            files=[("imagesFiles", Path(path)) for path in image_paths],
+            progress_callback=progress_callback,
+        )
+        return KiriSubmittedJob(
+            serialize=str(payload["serialize"]),
+            calculate_type=int(payload["calculateType"]),
+        )
+
+    def submit_featureless_video(
+        self,
+        *,
+        video_path: Path,
+        file_format: str,
+        progress_callback: UploadProgressCallback | None = None,
+    ) -> KiriSubmittedJob:
+        payload = self._post_files(
+            "/v1/open/featureless/video",
+            fields={"fileFormat": file_format},
+            files=[("videoFile", Path(video_path))],
+            progress_callback=progress_callback,
+        )
+        return KiriSubmittedJob(
+            serialize=str(payload["serialize"]),
+            calculate_type=int(payload["calculateType"]),
+        )
+
+    def get_status(self, *, serialize: str) -> KiriModelStatus:
+        payload = self._get(
+            "/v1/open/model/getStatus",
+            params={"serialize": serialize},
+            timeout=self.status_timeout,
+        )
+        return KiriModelStatus(serialize=str(payload["serialize"]), status=int(payload["status"]))
+
+    def get_model_zip(self, *, serialize: str) -> KiriModelZip:
+        payload = self._get(
+            "/v1/open/model/getModelZip",
+            params={"serialize": serialize},
+            timeout=self.status_timeout,
+        )
+        return KiriModelZip(serialize=str(payload["serialize"]), model_url=str(payload["modelUrl"]))
+
+    def _post_files(
+        self,
+        path: str,
+        *,
+        fields: dict[str, str],
+        files: list[tuple[str, Path]],
+        progress_callback: UploadProgressCallback | None = None,
+    ) -> dict:
+        """Stream a multipart submission, retrying only when the connection could not be opened.
+
+        A reset after the body started going out is not retried: KIRI may
+        already have accepted the upload, and a second submission would be a
+        second paid job.
+        """
+        body = MultipartFileStream(fields=fields, files=files, progress_callback=progress_callback)
+        try:
+            for attempt in range(UPLOAD_RETRY_ATTEMPTS):
+                body.reset()
+                started = time.perf_counter()
+                try:
+                    response = self.session.post(
+                        f"{self.base_url}{path}",
+                        data=body,
+                        headers={"Content-Type": body.content_type},
+                        timeout=self.timeout,
+                    )
+                except requests.ConnectionError as exc:
+                    _record_kiri_attempt(path, started, "transport_error")
+                    if not _failed_before_send(exc) or attempt == UPLOAD_RETRY_ATTEMPTS - 1:
+                        raise
+                    _record_kiri_retry(path, "transport_error")
+                    time.sleep(UPLOAD_RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+                    continue
+                _record_kiri_attempt(path, started, response.status_code)
+                return self._parse_response(response)
+        finally:
+            body.close()
+        raise KiriApiError("KIRI upload did not complete")
+
+    def _get(self, path: str, *, params: dict, timeout: float | None = None) -> dict:
+        """GETs are idempotent, so 429/5xx and transport errors are retried with backoff."""
+        for attempt in range(GET_RETRY_ATTEMPTS):
+            started = time.perf_counter()
+            try:
+                response = self.session.get(
+                    f"{self.base_url}{path}",
+                    params=params,
+                    timeout=timeout or self.timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                _record_kiri_attempt(path, started, "transport_error")
+                if attempt == GET_RETRY_ATTEMPTS - 1:
+                    raise KiriApiError(f"KIRI request failed: {exc}") from exc
+                _record_kiri_retry(path, "transport_error")
+                time.sleep(retry_delay_seconds(attempt))
+                continue
+            _record_kiri_attempt(path, started, response.status_code)
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < GET_RETRY_ATTEMPTS - 1:
+                _record_kiri_retry(path, str(response.status_code))
+                time.sleep(retry_delay_seconds(attempt, retry_after=response.headers.get("Retry-After")))
+                continue
+            return self._parse_response(response)
+        raise KiriApiError("KIRI request did not complete")
+
+
+def _failed_before_send(exc: BaseException) -> bool:
+    """True when a requests error means no byte of the request reached the server."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    seen: set[int] = set()
+    pending: list[BaseException | None] = [exc]
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, NewConnectionError):
+            return True
+        pending.extend([getattr(current, "reason", None), current.__cause__, current.__context__])
+        pending.extend(arg for arg in current.args if isinstance(arg, BaseException))
+    return False
+
+
+class AsyncTokenBucket:
+    """Token bucket shared by concurrent coroutines: `rate` requests/sec, bursts up to `capacity`."""
+
+    def __init__(self, *, rate: float, capacity: int):
+        self.rate = max(rate, 0.001)
+        self.capacity = max(capacity, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+class AsyncKiriClient(_KiriResponseParser):
+    """asyncio client for status/model lookups over one pooled HTTP connection set.
+
+    Submissions stay on the blocking KiriClient, which streams multipart bodies.
+    Create and use an instance on a single event loop.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        base_url: str = KIRI_BASE_URL,
+        status_timeout: float = STATUS_TIMEOUT_SECONDS,
+        max_connections: int | None = None,
+        rate_per_second: float | None = None,
+        burst: int | None = None,
+        max_attempts: int = GET_RETRY_ATTEMPTS,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.status_timeout = status_timeout
+        self.max_attempts = max(1, max_attempts)
+        connections = max_connections or int(_env_float("KIRI_MAX_CONNECTIONS", 20))
+        self.max_concurrency = connections
+        self.bucket = AsyncTokenBucket(
+            rate=rate_per_second or _env_float("KIRI_RATE_LIMIT_PER_SECOND", 10.0),
+            capacity=burst or int(_env_float("KIRI_RATE_LIMIT_BURST", 20)),
+        )
+        self.client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {api_key}"},
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+            timeout=httpx.Timeout(status_timeout, connect=10.0),
+            transport=transport,
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncKiriClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def get_status(self, *, serialize: str) -> KiriModelStatus:
+        payload = await self._get("/v1/open/model/getStatus", params={"serialize": serialize})
+        return KiriModelStatus(serialize=str(payload["serialize"]), status=int(payload["status"]))
+
+    async def get_model_zip(self, *, serialize: str) -> KiriModelZip:
+        payload = await self._get("/v1/open/model/getModelZip", params={"serialize": serialize})
+        return KiriModelZip(serialize=str(payload["serialize"]), model_url=str(payload["modelUrl"]))
+
+    async def get_statuses(
+        self,
+        serializes: Iterable[str],
+        *,
+        concurrency: int | None = None,
+    ) -> dict[str, KiriModelStatus | KiriApiError]:
+        """Fetch many statuses concurrently; each serialize maps to its status or its error."""
+        unique = list(dict.fromkeys(serializes))
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.max_concurrency))
+
+        async def _one(serialize: str) -> KiriModelStatus | KiriApiError:
+            async with semaphore:
+                try:
+                    return await self.get_status(serialize=serialize)
+                except KiriApiError as exc:
+                    return exc
+                except (KeyError, TypeError, ValueError) as exc:
+                    # A malformed payload fails this serialize, not the whole batch.
+                    return KiriApiError(f"Unexpected KIRI status payload: {exc!r}")
+
+        results = await asyncio.gather(*(_one(serialize) for serialize in unique))
+        return dict(zip(unique, results))
+
+    async def _get(self, path: str, *, params: dict) -> dict:
+        for attempt in range(self.max_attempts):
+            await self.bucket.acquire()
+            started = time.perf_counter()
+            try:
+                response = await self.client.get(f"{self.base_url}{path}", params=params)
+            except httpx.TransportError as exc:
+                _record_kiri_attempt(path, started, "transport_error")
+                if attempt == self.max_attempts - 1:
+                    raise KiriApiError(f"KIRI request failed: {exc}") from exc
+                _record_kiri_retry(path, "transport_error")
+                await asyncio.sleep(retry_delay_seconds(attempt))
+                continue
+            _record_kiri_attempt(path, started, response.status_code)
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_attempts - 1:
+                _record_kiri_retry(path, str(response.status_code))
+                await asyncio.sleep(retry_delay_seconds(attempt, retry_after=response.headers.get("Retry-After")))
+                continue
+            return self._parse_response(response)
+        raise KiriApiError("KIRI request did not complete")
@@ -1,14 +1,34 @@
 # services/api/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
+from typing import Optional
 from sqlmodel import SQLModel
 
+import metrics
+
+
+def _seed_default_metadata():
+    # Seed once at startup so GET /metadata/* stays a pure (cached) read; if this
+    # fails (e.g. migrations have not run yet) the first read retries it.
+    from database import get_engine
+    from routers.metadata import seed_default_metadata
+    from sqlmodel import Session
+
+    try:
+        with Session(get_engine()) as session:
+            seed_default_metadata(session)
+    except Exception as exc:
+        print(f"[startup] Metadata seed failed, will retry on first read: {exc}")
+
+
 # Simple lifecycle to create tables on startup (for dev simplicity)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Start the menu-importer background worker
     from importer.worker import start_worker
     from ar_worker import start_worker as start_ar_worker
+    _seed_default_metadata()
     start_worker()
     start_ar_worker()
     yield
@@ -31,9 +51,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
     max_age=86400,
 )
 
+from request_profiling import install_request_profiling
+install_request_profiling(app)
+
+from compression import install_compression
+install_compression(app)
+
 if os.getenv("LOCAL_UPLOADS") == "1":
     upload_dir = Path(__file__).resolve().parent / "uploads"
     upload_dir.mkdir(parents=True, exist_ok=True)
@@ -55,3 +82,11 @@ app.include_router(auth.router)
 @app.get("/health")
 def health_check():
     return {"status": "ok", "service": "menuvium-api"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint(authorization: Optional[str] = Header(default=None)):
+    expected = os.getenv("METRICS_TOKEN")
+    if expected and authorization != f"Bearer {expected}":
+        raise HTTPException(status_code=403, detail="Invalid metrics token")
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,43 @@
+"""add_item_ar_worker_lease_fields
+
+Revision ID: s6t8u0v2w4x6
+Revises: r5s7t9u1v3w5
+Create Date: 2026-10-19 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "s6t8u0v2w4x6"
+down_revision: Union[str, Sequence[str], None] = "r5s7t9u1v3w5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("item", sa.Column("ar_next_poll_at", sa.DateTime(), nullable=True))
+    op.add_column("item", sa.Column("ar_lease_owner", sa.String(), nullable=True))
+    op.add_column("item", sa.Column("ar_lease_expires_at", sa.DateTime(), nullable=True))
+    op.create_index(op.f("ix_item_ar_next_poll_at"), "item", ["ar_next_poll_at"], unique=False)
+
+    # In-flight provider jobs become due immediately so the leased workers pick them up.
+    op.execute(
+        """
+        UPDATE item
+        SET ar_next_poll_at = CURRENT_TIMESTAMP
+        WHERE ar_provider = 'kiri'
+          AND ar_status = 'processing'
+          AND ar_stage IN ('uploading_to_kiri', 'kiri_processing', 'downloading_usdz')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_item_ar_next_poll_at"), table_name="item")
+    op.drop_column("item", "ar_lease_expires_at")
+    op.drop_column("item", "ar_lease_owner")
+    op.drop_column("item", "ar_next_poll_at")
@@ -0,0 +1,52 @@
+"""add_ar_provider_event_inbox
+
+Revision ID: t7u9v1w3x5y7
+Revises: s6t8u0v2w4x6
+Create Date: 2026-10-19 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "t7u9v1w3x5y7"
+down_revision: Union[str, Sequence[str], None] = "s6t8u0v2w4x6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "arproviderevent",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("provider", sa.String(), nullable=False),
+        sa.Column("dedupe_key", sa.String(), nullable=False),
+        sa.Column("serialize", sa.String(), nullable=False),
+        sa.Column("provider_status", sa.Integer(), nullable=False),
+        sa.Column("payload_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(), nullable=False),
+        sa.Column("lease_owner", sa.String(), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("matched", sa.Boolean(), nullable=True),
+        sa.Column("received_at", sa.DateTime(), nullable=False),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("dedupe_key", name="uq_arproviderevent_dedupe_key"),
+    )
+    op.create_index(op.f("ix_arproviderevent_serialize"), "arproviderevent", ["serialize"], unique=False)
+    op.create_index(op.f("ix_arproviderevent_status"), "arproviderevent", ["status"], unique=False)
+    op.create_index(op.f("ix_arproviderevent_available_at"), "arproviderevent", ["available_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_arproviderevent_available_at"), table_name="arproviderevent")
+    op.drop_index(op.f("ix_arproviderevent_status"), table_name="arproviderevent")
+    op.drop_index(op.f("ix_arproviderevent_serialize"), table_name="arproviderevent")
+    op.drop_table("arproviderevent")
@@ -0,0 +1,38 @@
+"""add_item_ar_provider_serialize
+
+Revision ID: u8v0w2x4y6z8
+Revises: t7u9v1w3x5y7
+Create Date: 2026-10-19 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "u8v0w2x4y6z8"
+down_revision: Union[str, Sequence[str], None] = "t7u9v1w3x5y7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # JSONB lets metadata changes be applied as partial updates (||, -).
+    op.execute("ALTER TABLE item ALTER COLUMN ar_metadata_json TYPE JSONB USING ar_metadata_json::jsonb")
+    op.add_column("item", sa.Column("ar_provider_serialize", sa.String(), nullable=True))
+    op.execute(
+        """
+        UPDATE item
+        SET ar_provider_serialize = ar_metadata_json->>'serialize'
+        WHERE ar_metadata_json->>'serialize' IS NOT NULL
+        """
+    )
+    op.create_index(op.f("ix_item_ar_provider_serialize"), "item", ["ar_provider_serialize"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_item_ar_provider_serialize"), table_name="item")
+    op.drop_column("item", "ar_provider_serialize")
+    op.execute("ALTER TABLE item ALTER COLUMN ar_metadata_json TYPE JSON USING ar_metadata_json::json")
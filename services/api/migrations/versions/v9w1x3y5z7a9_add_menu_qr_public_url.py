@@ -0,0 +1,26 @@
+"""add_menu_qr_public_url
+
+Revision ID: v9w1x3y5z7a9
+Revises: u8v0w2x4y6z8
+Create Date: 2026-10-19 18:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "v9w1x3y5z7a9"
+down_revision: Union[str, Sequence[str], None] = "u8v0w2x4y6z8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("menu", sa.Column("qr_public_url", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("menu", "qr_public_url")
@@ -0,0 +1,29 @@
+"""add_listing_keyset_indexes
+
+Revision ID: w0x2y4z6a8b0
+Revises: v9w1x3y5z7a9
+Create Date: 2026-10-19 20:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "w0x2y4z6a8b0"
+down_revision: Union[str, Sequence[str], None] = "v9w1x3y5z7a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_menu_org_id_created_at_id", "menu", ["org_id", "created_at", "id"], unique=False)
+    op.create_index("ix_category_menu_id_rank_id", "category", ["menu_id", "rank", "id"], unique=False)
+    op.create_index("ix_importjob_created_at_id", "importjob", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_importjob_created_at_id", table_name="importjob")
+    op.drop_index("ix_category_menu_id_rank_id", table_name="category")
+    op.drop_index("ix_menu_org_id_created_at_id", table_name="menu")
@@ -1,7 +1,7 @@
 import uuid
 from datetime import date, datetime, time
 from typing import Optional, List
-from sqlalchemy import UniqueConstraint, Column, JSON, Text, CheckConstraint
+from sqlalchemy import UniqueConstraint, Column, Index, JSON, Text, CheckConstraint, event
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import SQLModel, Field, Relationship
 
@@ -105,14 +105,22 @@ class AllergenBase(SQLModel):
 
 # Table Models
 class Menu(MenuBase, table=True):
+    # Keyset order of the org menu listing.
+    __table_args__ = (Index("ix_menu_org_id_created_at_id", "org_id", "created_at", "id"),)
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Public URL encoded in the stored QR, so bulk refreshes can skip codes that are still current.
+    qr_public_url: Optional[str] = None
     
     organization: Optional["Organization"] = Relationship(back_populates="menus")
     categories: List["Category"] = Relationship(back_populates="menu")
 
 
 class Category(CategoryBase, table=True):
+    # Keyset order of the category listing.
+    __table_args__ = (Index("ix_category_menu_id_rank_id", "menu_id", "rank", "id"),)
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     
     menu: Menu = Relationship(back_populates="categories")
@@ -153,6 +161,11 @@ class Item(ItemBase, table=True):
     ar_stage_detail: Optional[str] = None
     ar_progress: Optional[float] = None
     ar_job_id: Optional[uuid.UUID] = Field(default=None, index=True)
+    # Mirror of ar_metadata_json["serialize"] so webhooks and polls resolve items with an index lookup.
+    ar_provider_serialize: Optional[str] = Field(default=None, index=True)
+    ar_next_poll_at: Optional[datetime] = Field(default=None, index=True)
+    ar_lease_owner: Optional[str] = None
+    ar_lease_expires_at: Optional[datetime] = None
     ar_video_s3_key: Optional[str] = None
     ar_video_url: Optional[str] = None
     ar_model_glb_s3_key: Optional[str] = None
@@ -184,6 +197,23 @@ class Item(ItemBase, table=True):
     dietary_tags: List[DietaryTag] = Relationship(back_populates="items", link_model=ItemDietaryTagLink)
     allergens: List[Allergen] = Relationship(back_populates="items", link_model=ItemAllergenLink)
 
+
+def _provider_serialize_from_metadata(metadata) -> Optional[str]:
+    serialize = metadata.get("serialize") if isinstance(metadata, dict) else None
+    return str(serialize) if serialize else None
+
+
+@event.listens_for(Item.ar_metadata_json, "set")
+def _mirror_item_provider_serialize(target: Item, value, oldvalue, initiator):
+    target.ar_provider_serialize = _provider_serialize_from_metadata(value)
+
+
+@event.listens_for(Item, "before_insert")
+def _mirror_new_item_provider_serialize(mapper, connection, target: Item):
+    # SQLModel's constructor bypasses attribute events.
+    target.ar_provider_serialize = _provider_serialize_from_metadata(target.ar_metadata_json)
+
+
 class ItemPhoto(ItemPhotoBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     item: Item = Relationship(back_populates="photos")
@@ -225,6 +255,31 @@ class ArConversionJob(SQLModel, table=True):
     item: Optional["Item"] = Relationship(back_populates="ar_conversion_jobs")
 
 
+class ArProviderEvent(SQLModel, table=True):
+    """Inbox of provider webhook deliveries, acknowledged on receipt and applied by the AR workers."""
+
+    __table_args__ = (UniqueConstraint("dedupe_key", name="uq_arproviderevent_dedupe_key"),)
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    provider: str
+    dedupe_key: str
+    serialize: str = Field(index=True)
+    provider_status: int
+    payload_json: Optional[dict] = Field(
+        default=None,
+        sa_column=Column(JSON().with_variant(JSONB, "postgresql")),
+    )
+    status: str = Field(default="pending", index=True)
+    attempts: int = Field(default=0)
+    available_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    matched: Optional[bool] = None
+    received_at: datetime = Field(default_factory=datetime.utcnow)
+    processed_at: Optional[datetime] = None
+
+
 class ItemOptionGroupBase(SQLModel):
     item_id: uuid.UUID = Field(foreign_key="item.id", index=True)
     name: str
@@ -404,6 +459,23 @@ class CategoryRead(CategoryBase):
     id: uuid.UUID
     items: List[ItemRead] = []
 
+class CategorySummaryRead(CategoryBase):
+    id: uuid.UUID
+    item_count: int = 0
+
+class MenuSummaryRead(SQLModel):
+    id: uuid.UUID
+    name: str
+    slug: Optional[str] = None
+    is_active: bool
+    theme: str
+    timezone: str
+    show_item_images: bool
+    banner_url: Optional[str] = None
+    logo_url: Optional[str] = None
+    org_id: uuid.UUID
+    created_at: datetime
+
 class MenuRead(MenuBase):
     id: uuid.UUID
     categories: List[CategoryRead] = []
@@ -501,6 +573,8 @@ class OrgPermissionsRead(SQLModel):
 
 class ImportJob(SQLModel, table=True):
     __tablename__ = "importjob"
+    # Keyset order of the job listing (newest first).
+    __table_args__ = (Index("ix_importjob_created_at_id", "created_at", "id"),)
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     org_id: Optional[uuid.UUID] = Field(default=None, foreign_key="organization.id", index=True)
@@ -549,3 +623,22 @@ class ImportJobRead(SQLModel):
     logs: Optional[str] = None
     metadata_json: Optional[dict] = None
     created_by: str
+
+
+# ImportJobRead without the logs / metadata_json blobs, for job lists.
+class ImportJobSummaryRead(SQLModel):
+    id: uuid.UUID
+    org_id: Optional[uuid.UUID] = None
+    restaurant_name: str
+    location_hint: Optional[str] = None
+    website_override: Optional[str] = None
+    status: str
+    progress: int
+    current_step: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result_zip_key: Optional[str] = None
+    error_message: Optional[str] = None
+    created_by: str
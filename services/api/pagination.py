@@ -0,0 +1,110 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+A page is ordered by a fixed tuple of columns ending in a unique one (the
+primary key), and the next page starts strictly after the last row's values
+for those columns, so rows inserted or deleted meanwhile never shift or
+repeat pages the way OFFSET does. Cursors are opaque URL-safe tokens; list
+bodies stay plain JSON arrays and the cursor of the following page, if any,
+is returned in the X-Next-Cursor header.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import Response
+from sqlalchemy import and_, or_
+from sqlmodel import Session
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def _jsonable(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_jsonable(value) for value in values], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[Any], Any]]) -> tuple:
+    """Decode a cursor, converting each value with the matching parser."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("wrong number of cursor values")
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError, UnicodeError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+
+def keyset_order(columns: Sequence, *, descending: bool = False) -> list:
+    return [column.desc() if descending else column.asc() for column in columns]
+
+
+def keyset_after(columns: Sequence, values: Sequence[Any], *, descending: bool = False):
+    """Rows strictly after `values` in (columns) order, as an expanded OR of prefixes.
+
+    Written out instead of a row-value comparison so every backend can use
+    the index on the leading column.
+    """
+    clauses = []
+    for index, column in enumerate(columns):
+        equal_prefix = [columns[position] == values[position] for position in range(index)]
+        beyond = column < values[index] if descending else column > values[index]
+        clauses.append(and_(*equal_prefix, beyond))
+    return or_(*clauses)
+
+
+def fetch_page(
+    session: Session,
+    statement,
+    columns: Sequence,
+    *,
+    cursor: Optional[str],
+    limit: Optional[int],
+    parsers: Sequence[Callable[[Any], Any]],
+    descending: bool = False,
+) -> tuple[list, Optional[str]]:
+    """Run `statement` ordered by `columns`, one page at a time when limit is set.
+
+    Returns the rows and the cursor of the following page (None on the last
+    page, or when no limit was given and every row was returned).
+    """
+    statement = statement.order_by(*keyset_order(columns, descending=descending))
+    if cursor:
+        statement = statement.where(keyset_after(columns, decode_cursor(cursor, parsers), descending=descending))
+    if limit is None:
+        return list(session.exec(statement).all()), None
+    rows = list(session.exec(statement.limit(limit + 1)).all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column in columns])
+
+
+def next_cursor_headers(next_cursor: Optional[str]) -> dict[str, str]:
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+
+
+def model_list_response(models: Sequence, next_cursor: Optional[str]) -> Response:
+    """Serialize already-projected read models directly (skips response_model validation)."""
+    body = json.dumps([model.model_dump(mode="json") for model in models], separators=(",", ":"))
+    return Response(content=body, media_type="application/json", headers=next_cursor_headers(next_cursor))
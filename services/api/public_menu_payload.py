@@ -0,0 +1,200 @@
+"""
+Compact, diner-facing representation of a public menu.
+
+MenuRead carries every admin-side column (all ar_* fields, option positions
+and active flags, photo storage keys, full tag/allergen objects per item).
+The compact form keeps what the public page renders:
+
+- null values, empty lists and false flags (is_sold_out, is_default) are
+  omitted; a missing key means null/empty/false;
+- dietary tags and allergens are listed once per menu and items refer to
+  them by index;
+- photos are plain URLs, dropped entirely when show_item_images is off;
+- AR fields are included only for the states diners see (model URLs once
+  ready, progress while processing);
+- `fields` projects items down to the named fields (id is always kept).
+
+Input is a Menu already filtered and URL-normalized for the public route.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from models import Item, ItemOption, ItemOptionGroup, Menu
+
+
+COMPACT_FORMAT_VERSION = 1
+
+ITEM_FIELDS = frozenset(
+    {
+        "name",
+        "description",
+        "price",
+        "is_sold_out",
+        "dietary_tags",
+        "allergens",
+        "photos",
+        "option_groups",
+        "ar",
+    }
+)
+
+_AR_IN_PROGRESS = {"pending", "processing"}
+
+
+class UnknownFieldsError(ValueError):
+    def __init__(self, unknown: Iterable[str]):
+        self.unknown = sorted(unknown)
+        super().__init__(f"Unknown fields: {', '.join(self.unknown)}")
+
+
+def parse_item_fields(raw: Optional[str]) -> Optional[frozenset[str]]:
+    """Parse a comma separated `fields=` value; None means every field."""
+    if raw is None or not raw.strip():
+        return None
+    requested = {part.strip() for part in raw.split(",") if part.strip()}
+    unknown = requested - ITEM_FIELDS
+    if unknown:
+        raise UnknownFieldsError(unknown)
+    return frozenset(requested)
+
+
+def _put(target: dict, key: str, value) -> None:
+    if value is None or value is False or value == [] or value == "":
+        return
+    target[key] = value
+
+
+class _Dictionary:
+    """Assigns each distinct row a stable index in first-seen order."""
+
+    def __init__(self, encode):
+        self._encode = encode
+        self._index: dict = {}
+        self.entries: list[dict] = []
+
+    def ref(self, row) -> int:
+        index = self._index.get(row.id)
+        if index is None:
+            index = len(self.entries)
+            self._index[row.id] = index
+            self.entries.append(self._encode(row))
+        return index
+
+
+def _encode_tag(tag) -> dict:
+    entry = {"id": str(tag.id), "name": tag.name}
+    _put(entry, "icon", tag.icon)
+    return entry
+
+
+def _encode_allergen(allergen) -> dict:
+    return {"id": str(allergen.id), "name": allergen.name}
+
+
+def _encode_option(option: ItemOption) -> dict:
+    entry = {"id": str(option.id), "name": option.name}
+    _put(entry, "description", option.description)
+    _put(entry, "image_url", option.image_url)
+    _put(entry, "badge", option.badge)
+    _put(entry, "is_default", option.is_default)
+    return entry
+
+
+def _encode_group(group: ItemOptionGroup) -> dict:
+    entry = {
+        "id": str(group.id),
+        "name": group.name,
+        "selection_mode": group.selection_mode,
+        "min_select": group.min_select,
+        "display_style": group.display_style,
+    }
+    _put(entry, "description", group.description)
+    _put(entry, "max_select", group.max_select)
+    entry["options"] = [_encode_option(option) for option in group.options]
+    return entry
+
+
+def _encode_ar(item: Item) -> Optional[dict]:
+    if item.ar_status == "ready":
+        ar = {"status": "ready"}
+        _put(ar, "glb_url", item.ar_model_glb_url)
+        _put(ar, "usdz_url", item.ar_model_usdz_url)
+        _put(ar, "poster_url", item.ar_model_poster_url)
+        return ar
+    if item.ar_status in _AR_IN_PROGRESS:
+        ar = {"status": item.ar_status}
+        _put(ar, "stage_detail", item.ar_stage_detail)
+        _put(ar, "progress", item.ar_progress)
+        return ar
+    return None
+
+
+def _encode_item(
+    item: Item,
+    *,
+    fields: Optional[frozenset[str]],
+    show_images: bool,
+    tags: _Dictionary,
+    allergens: _Dictionary,
+) -> dict:
+    def wanted(name: str) -> bool:
+        return fields is None or name in fields
+
+    entry = {"id": str(item.id)}
+    if wanted("name"):
+        entry["name"] = item.name
+    if wanted("description"):
+        _put(entry, "description", item.description)
+    if wanted("price"):
+        entry["price"] = item.price
+    if wanted("is_sold_out"):
+        _put(entry, "is_sold_out", item.is_sold_out)
+    if wanted("dietary_tags"):
+        _put(entry, "dietary_tags", [tags.ref(tag) for tag in item.dietary_tags or []])
+    if wanted("allergens"):
+        _put(entry, "allergens", [allergens.ref(allergen) for allergen in item.allergens or []])
+    if wanted("photos") and show_images:
+        _put(entry, "photos", [photo.url for photo in item.photos or [] if photo.url])
+    if wanted("option_groups"):
+        _put(entry, "option_groups", [_encode_group(group) for group in item.option_groups or []])
+    if wanted("ar"):
+        _put(entry, "ar", _encode_ar(item))
+    return entry
+
+
+def serialize_compact_menu(menu: Menu, *, fields: Optional[frozenset[str]] = None) -> dict:
+    tags = _Dictionary(_encode_tag)
+    allergens = _Dictionary(_encode_allergen)
+    payload = {
+        "v": COMPACT_FORMAT_VERSION,
+        "id": str(menu.id),
+        "name": menu.name,
+        "theme": menu.theme,
+        "timezone": menu.timezone,
+        "show_item_images": menu.show_item_images,
+    }
+    _put(payload, "banner_url", menu.banner_url)
+    _put(payload, "logo_url", menu.logo_url)
+    _put(payload, "title_design_config", menu.title_design_config)
+    payload["categories"] = [
+        {
+            "id": str(category.id),
+            "name": category.name,
+            "items": [
+                _encode_item(
+                    item,
+                    fields=fields,
+                    show_images=menu.show_item_images,
+                    tags=tags,
+                    allergens=allergens,
+                )
+                for item in category.items or []
+            ],
+        }
+        for category in menu.categories or []
+    ]
+    _put(payload, "dietary_tags", tags.entries)
+    _put(payload, "allergens", allergens.entries)
+    return payload
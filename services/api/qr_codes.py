@@ -0,0 +1,131 @@
+"""
+Local QR code rendering with an in-process render cache.
+
+Codes are encoded in-process with segno (no network round trip) at error
+correction level H and without a quiet zone, scaled to whole-pixel modules no
+larger than the requested size. Rendered bytes (PNG and derived formats such
+as PDF) are kept in an LRU bounded by entry count and total bytes, keyed by
+(data, size, format).
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+import segno
+
+
+MB = 1024 * 1024
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def render_qr_png(data: str, size_px: int = 1000) -> bytes:
+    """Encode `data` as a tightly framed PNG QR code at most size_px wide."""
+    qr = segno.make(data, error="h", micro=False)
+    modules, _ = qr.symbol_size(border=0)
+    scale = max(1, int(size_px) // modules)
+    output = io.BytesIO()
+    qr.save(output, kind="png", scale=scale, border=0)
+    return output.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# Render cache
+# ---------------------------------------------------------------------------
+
+class QrRenderCache:
+    """Thread-safe LRU of rendered QR bytes bounded by entries and total size."""
+
+    def __init__(self, *, max_entries: int, max_bytes: int):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = value
+            self._bytes += len(value)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+
+    def get_or_render(self, key: Hashable, render: Callable[[], bytes]) -> bytes:
+        """Return cached bytes for key, rendering and caching them on a miss.
+
+        Concurrent misses for the same key may both render; renders are
+        deterministic, so the last write wins harmlessly.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = render()
+        self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+qr_render_cache = QrRenderCache(
+    max_entries=_env_int("QR_RENDER_CACHE_ENTRIES", 2048),
+    max_bytes=_env_int("QR_RENDER_CACHE_MB", 64) * MB,
+)
+
+
+def qr_cache_key(data: str, size_px: int, fmt: str) -> tuple[str, int, str]:
+    return (data, int(size_px), fmt)
@@ -0,0 +1,350 @@
+"""
+Opt-in per-request profiling (REQUEST_PROFILING=1).
+
+When installed, every HTTP request gets a RequestProfile (carried in a
+ContextVar, so it follows sync endpoints into the threadpool) that records:
+
+- DB round trips, rows and time, via SQLAlchemy cursor events on all engines;
+- time spent serializing responses: FastAPI's response_model validation and
+  encoding, plus explicit validation of the menu/item read models;
+- time spent in storage backend calls.
+
+Finished requests are aggregated per (method, route template) over a sliding
+window of REQUEST_PROFILING_WINDOW requests. A statement executed at least
+REQUEST_PROFILING_N_PLUS_ONE times within one request is reported as an
+N+1 suspect. The admin router exposes the report.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def profiling_enabled() -> bool:
+    return os.getenv("REQUEST_PROFILING") == "1"
+
+
+_whitespace_re = re.compile(r"\s+")
+
+
+def _normalize_statement(statement: str) -> str:
+    return _whitespace_re.sub(" ", statement).strip()[:500]
+
+
+# ---------------------------------------------------------------------------
+# Per-request profile
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RequestProfile:
+    queries: int = 0
+    rows: int = 0
+    db_seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    span_seconds: dict[str, float] = field(default_factory=dict)
+    _active_categories: Counter = field(default_factory=Counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record_query(self, statement: str, seconds: float, rowcount: int) -> None:
+        with self._lock:
+            self.queries += 1
+            self.rows += max(rowcount, 0)
+            self.db_seconds += seconds
+            self.statements[_normalize_statement(statement)] += 1
+
+    @contextmanager
+    def span(self, category: str) -> Iterator[None]:
+        """Time a block under category; nested spans of the same category count once."""
+        with self._lock:
+            outermost = self._active_categories[category] == 0
+            self._active_categories[category] += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._active_categories[category] -= 1
+                if outermost:
+                    self.span_seconds[category] = self.span_seconds.get(category, 0.0) + elapsed
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_span(category: str) -> Iterator[None]:
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    with profile.span(category):
+        yield
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _RouteSample:
+    seconds: float
+    status: int
+    queries: int
+    rows: int
+    db_seconds: float
+    span_seconds: dict[str, float]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class ProfileRegistry:
+    def __init__(self, *, window: int, n_plus_one_threshold: int):
+        self.window = max(1, window)
+        self.n_plus_one_threshold = max(2, n_plus_one_threshold)
+        self._samples: dict[tuple[str, str], deque[_RouteSample]] = {}
+        self._totals: Counter = Counter()
+        self._suspects: dict[tuple[str, str], Counter] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, route: str, status: int, seconds: float, profile: RequestProfile) -> None:
+        key = (method, route)
+        sample = _RouteSample(
+            seconds=seconds,
+            status=status,
+            queries=profile.queries,
+            rows=profile.rows,
+            db_seconds=profile.db_seconds,
+            span_seconds=dict(profile.span_seconds),
+        )
+        repeated = {
+            statement: count
+            for statement, count in profile.statements.items()
+            if count >= self.n_plus_one_threshold
+        }
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(sample)
+            self._totals[key] += 1
+            if repeated:
+                suspects = self._suspects.setdefault(key, Counter())
+                for statement, count in repeated.items():
+                    suspects[statement] = max(suspects[statement], count)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._suspects.clear()
+
+    def report(self) -> list[dict]:
+        with self._lock:
+            snapshot = {key: list(samples) for key, samples in self._samples.items()}
+            totals = dict(self._totals)
+            suspects = {key: counter.most_common(5) for key, counter in self._suspects.items()}
+        routes = []
+        for (method, route), samples in snapshot.items():
+            durations = [sample.seconds * 1000 for sample in samples]
+            queries = [float(sample.queries) for sample in samples]
+            db_ms = [sample.db_seconds * 1000 for sample in samples]
+            categories = sorted({name for sample in samples for name in sample.span_seconds})
+            routes.append(
+                {
+                    "method": method,
+                    "route": route,
+                    "requests": totals.get((method, route), len(samples)),
+                    "window": len(samples),
+                    "errors": sum(1 for sample in samples if sample.status >= 500),
+                    "p50_ms": round(_percentile(durations, 50), 2),
+                    "p95_ms": round(_percentile(durations, 95), 2),
+                    "p99_ms": round(_percentile(durations, 99), 2),
+                    "queries_p50": _percentile(queries, 50),
+                    "queries_p95": _percentile(queries, 95),
+                    "rows_mean": round(sum(sample.rows for sample in samples) / len(samples), 1),
+                    "db_p95_ms": round(_percentile(db_ms, 95), 2),
+                    "span_mean_ms": {
+                        name: round(
+                            sum(sample.span_seconds.get(name, 0.0) for sample in samples) * 1000 / len(samples),
+                            2,
+                        )
+                        for name in categories
+                    },
+                    "n_plus_one_suspects": [
+                        {"statement": statement, "max_per_request": count}
+                        for statement, count in suspects.get((method, route), [])
+                    ],
+                }
+            )
+        routes.sort(key=lambda entry: entry["p95_ms"], reverse=True)
+        return routes
+
+
+registry = ProfileRegistry(
+    window=_env_int("REQUEST_PROFILING_WINDOW", 500),
+    n_plus_one_threshold=_env_int("REQUEST_PROFILING_N_PLUS_ONE", 10),
+)
+
+
+# ---------------------------------------------------------------------------
+# Middleware and hooks
+# ---------------------------------------------------------------------------
+
+class ProfilingMiddleware:
+    """ASGI middleware that opens a RequestProfile per HTTP request and records it on completion."""
+
+    def __init__(self, app, *, profile_registry: ProfileRegistry = registry):
+        self.app = app
+        self.registry = profile_registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        status = 500
+
+        async def _send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            _current_profile.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            self.registry.record(scope.get("method", "GET"), route, status, time.perf_counter() - started, profile)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info["request_profiling_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = conn.info.pop("request_profiling_started", None)
+    if profile is None or started is None:
+        return
+    elapsed = time.perf_counter() - started
+    rowcount = getattr(cursor, "rowcount", -1)
+    profile.record_query(statement, elapsed, rowcount if isinstance(rowcount, int) else -1)
+
+
+def _wrap_in_span(function, category: str):
+    @functools.wraps(function)
+    def _wrapper(*args, **kwargs):
+        with profile_span(category):
+            return function(*args, **kwargs)
+
+    _wrapper.__profiled__ = True
+    return _wrapper
+
+
+def _instrument_response_serialization() -> None:
+    import fastapi.routing
+
+    serialize_response = fastapi.routing.serialize_response
+    if getattr(serialize_response, "__profiled__", False):
+        return
+
+    # The route handler looks this up as a module global on every request.
+    @functools.wraps(serialize_response)
+    async def _profiled_serialize_response(*args, **kwargs):
+        with profile_span("serialize"):
+            return await serialize_response(*args, **kwargs)
+
+    _profiled_serialize_response.__profiled__ = True
+    fastapi.routing.serialize_response = _profiled_serialize_response
+
+
+def _instrument_serialization() -> None:
+    from models import ItemRead, MenuRead
+
+    for model in (MenuRead, ItemRead):
+        original = model.__dict__.get("model_validate")
+        if original is not None and getattr(original.__func__, "__profiled__", False):
+            continue
+        validate = model.model_validate.__func__
+        setattr(model, "model_validate", classmethod(_wrap_in_span(validate, "serialize")))
+
+
+_STORAGE_METHODS = (
+    "presign_put",
+    "presign_get",
+    "upload_file",
+    "upload_fileobj",
+    "put_bytes",
+    "get_bytes",
+    "download_file",
+    "copy",
+    "delete",
+    "list_keys",
+    "delete_many",
+    "delete_prefix",
+    "copy_many",
+)
+
+
+def _instrument_storage() -> None:
+    import storage_backend
+
+    for backend_cls in (storage_backend.S3StorageBackend, storage_backend.LocalStorageBackend):
+        for name in _STORAGE_METHODS:
+            method = getattr(backend_cls, name, None)
+            if method is None or getattr(method, "__profiled__", False):
+                continue
+            setattr(backend_cls, name, _wrap_in_span(method, "storage"))
+
+
+_installed = False
+
+
+def install_request_profiling(app) -> bool:
+    """Attach the middleware and hooks when REQUEST_PROFILING=1; returns whether it did."""
+    global _installed
+    if not profiling_enabled():
+        return False
+    app.add_middleware(ProfilingMiddleware)
+    if not _installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _instrument_serialization()
+        _instrument_response_serialization()
+        _instrument_storage()
+        _installed = True
+    return True
@@ -1,7 +1,7 @@
 import uuid
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, HTTPException, status
 from pydantic import BaseModel
 from sqlmodel import Session, select, func
 
@@ -13,6 +13,7 @@ from ar_pipeline import (
     queue_kiri_generation,
     update_item_ar_metadata,
 )
+from ar_video_scheduler import get_video_scheduler
 from database import get_session
 from dependencies import get_admin_user
 from models import (
@@ -20,6 +21,9 @@ from models import (
     Organization, Menu, Item, ImportJob, OrganizationMember,
     Category, ItemPhoto, ItemDietaryTagLink, ItemAllergenLink
 )
+from request_profiling import profiling_enabled, registry as profiling_registry
+from storage_keys import organization_root
+from storage_utils import purge_storage_best_effort
 
 router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(get_admin_user)])
 
@@ -122,6 +126,16 @@ class AdminARJobsResponse(BaseModel):
     size: int
 
 
+class AdminARSchedulerResponse(BaseModel):
+    running: int
+    queued: int
+    max_jobs: int
+    threads_per_job: int
+    scratch_reserved_bytes: int
+    scratch_budget_bytes: int
+    completed: int
+
+
 def _resolve_cognito_user_email(username: Optional[str]) -> Optional[str]:
     """Best-effort Cognito email lookup by username/sub."""
     if not username:
@@ -648,7 +662,11 @@ def get_company_detail(org_id: uuid.UUID, session: Session = Depends(get_session
 
 
 @router.delete("/organizations/{org_id}")
-def delete_organization(org_id: uuid.UUID, session: Session = Depends(get_session)):
+def delete_organization(
+    org_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+):
     """Super Admin endpoint to completely delete an organization and all cascading data."""
     org = session.get(Organization, org_id)
     if not org:
@@ -656,6 +674,7 @@ def delete_organization(org_id: uuid.UUID, session: Session = Depends(get_sessio
 
     from sqlmodel import delete
 
+    storage_keys: list[Optional[str]] = []
     menu_ids = session.exec(select(Menu.id).where(Menu.org_id == org_id)).all()
     menu_ids = [row[0] if isinstance(row, tuple) else row for row in menu_ids]
     if menu_ids:
@@ -665,6 +684,10 @@ def delete_organization(org_id: uuid.UUID, session: Session = Depends(get_sessio
             item_ids = session.exec(select(Item.id).where(Item.category_id.in_(category_ids))).all()
             item_ids = [row[0] if isinstance(row, tuple) else row for row in item_ids]
             if item_ids:
+                # Photos uploaded before the per-org layout live outside organization_root.
+                storage_keys.extend(
+                    session.exec(select(ItemPhoto.s3_key).where(ItemPhoto.item_id.in_(item_ids))).all()
+                )
                 session.exec(delete(ItemPhoto).where(ItemPhoto.item_id.in_(item_ids)))
                 session.exec(delete(ItemDietaryTagLink).where(ItemDietaryTagLink.item_id.in_(item_ids)))
                 session.exec(delete(ItemAllergenLink).where(ItemAllergenLink.item_id.in_(item_ids)))
@@ -675,6 +698,11 @@ def delete_organization(org_id: uuid.UUID, session: Session = Depends(get_sessio
     session.exec(delete(OrganizationMember).where(OrganizationMember.org_id == org_id))
     session.delete(org)
     session.commit()
+    background_tasks.add_task(
+        purge_storage_best_effort,
+        prefixes=[organization_root(org_id)],
+        keys=storage_keys,
+    )
     return {"ok": True}
 
 
@@ -763,6 +791,20 @@ def list_ar_jobs(
         size=size
     )
 
+@router.get("/ar-jobs/scheduler", response_model=AdminARSchedulerResponse)
+def get_ar_video_scheduler():
+    """Local AR video processing slots and queue depth for this API replica."""
+    return AdminARSchedulerResponse(**get_video_scheduler().snapshot())
+
+@router.get("/profiling")
+def get_request_profile_report():
+    """Per-route latency percentiles, DB round trips and N+1 suspects (REQUEST_PROFILING=1)."""
+    return {"enabled": profiling_enabled(), "routes": profiling_registry.report()}
+
+@router.delete("/profiling", status_code=204)
+def reset_request_profile_report():
+    profiling_registry.reset()
+
 @router.post("/ar-jobs/{item_id}/retry")
 def retry_ar_job(item_id: uuid.UUID, session: Session = Depends(get_session)):
     """Retry a failed or stalled AR job."""
@@ -4,10 +4,9 @@ import uuid
 from datetime import datetime
 from typing import Literal, Optional
 
-import boto3
 from botocore.exceptions import ClientError
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from sqlmodel import Session, select
 
 from ar_pipeline import (
@@ -21,12 +20,16 @@ from ar_pipeline import (
     CONVERSION_STATUS_QUEUED,
     CONVERSION_STATUS_READY,
     KIRI_STATUS_QUEUING,
+    ar_webhook_apply_inline,
     converter_worker_token,
     fail_item_ar,
+    next_provider_poll_delay,
+    record_provider_event,
+    schedule_item_ar_poll,
     select_generation_input,
     update_item_ar_metadata,
 )
-from ar_worker import handle_kiri_status_update
+from ar_worker import apply_provider_event_inline
 from database import get_session
 from models import ArConversionJob, Category, Item, ItemRead, Menu
 from storage_keys import (
@@ -37,7 +40,8 @@ from storage_keys import (
     item_ar_run_frames_key,
     item_ar_run_provider_submit_response_key,
 )
-from storage_utils import copy_storage_key, create_upload_target, local_uploads_enabled, store_bytes
+from storage_backend import get_storage_backend
+from storage_utils import copy_storage_key, create_upload_target, store_bytes
 from url_utils import external_base_url, normalize_upload_url
 from sqlalchemy.orm import selectinload
 
@@ -83,20 +87,17 @@ def _require_kiri_webhook_secret(
 
 
 def _generate_download_url(*, key: str, request: Request) -> str:
-    bucket_name = os.getenv("S3_BUCKET_NAME")
-    if bucket_name:
-        try:
-            return boto3.client("s3").generate_presigned_url(
-                "get_object",
-                Params={"Bucket": bucket_name, "Key": key},
-                ExpiresIn=3600,
-            )
-        except ClientError as exc:
-            print(exc)
-            raise HTTPException(status_code=500, detail="Could not generate download URL")
-
-    if not local_uploads_enabled():
+    backend = get_storage_backend()
+    if backend is None:
         raise HTTPException(status_code=500, detail="Storage not configured")
+    try:
+        download_url = backend.presign_get(key, expires_in=3600)
+    except ClientError as exc:
+        print(exc)
+        raise HTTPException(status_code=500, detail="Could not generate download URL")
+    if download_url:
+        return download_url
+
     base = external_base_url(request)
     return f"{base}/uploads/{key}".replace("//uploads/", "/uploads/")
 
@@ -476,6 +477,7 @@ def mark_generation_submitted(
         provider_submit_response_s3_key=submit_response_key,
         video_frame_extraction=payload.video_frame_extraction,
     )
+    schedule_item_ar_poll(item, delay_seconds=next_provider_poll_delay(KIRI_STATUS_QUEUING, 0))
     session.add(item)
     session.commit()
     return Response(status_code=204)
@@ -646,15 +648,41 @@ def fail_conversion(job_id: uuid.UUID, payload: ConversionFailRequest, session:
 
 
 class KiriWebhookPayload(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
     status: int
     serialize: str
 
 
+# Payload fields that identify one provider notification, when KIRI sends them.
+# Timestamps are deliberately not used: they can change on every redelivery.
+_KIRI_DELIVERY_ID_FIELDS = ("eventId", "event_id", "id")
+
+
+def _kiri_delivery_id(payload: dict) -> Optional[str]:
+    for field in _KIRI_DELIVERY_ID_FIELDS:
+        value = payload.get(field)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
 @router.post("/kiri/webhook", dependencies=[Depends(_require_kiri_webhook_secret)])
-def kiri_webhook(payload: KiriWebhookPayload):
-    matched = handle_kiri_status_update(
+def kiri_webhook(payload: KiriWebhookPayload, session: Session = SessionDep):
+    # Acknowledge immediately; the AR workers apply inbox events (including
+    # model finalization) so slow work never holds the provider's request open.
+    raw_payload = payload.model_dump()
+    event, created = record_provider_event(
+        session,
+        provider=AR_PROVIDER_KIRI,
         serialize=payload.serialize,
         provider_status=payload.status,
-        source="webhook",
+        payload=raw_payload,
+        delivery_id=_kiri_delivery_id(raw_payload),
     )
-    return {"ok": True, "matched": matched}
+    if ar_webhook_apply_inline():
+        # Deployments without AR workers apply the event here. It is recorded
+        # either way, so the delivery is acknowledged even if applying it
+        # failed; it stays in the inbox for the next attempt.
+        apply_provider_event_inline(event.id)
+    return {"ok": True, "queued": created, "event_id": str(event.id)}
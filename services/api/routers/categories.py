@@ -1,10 +1,12 @@
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import func
 from sqlmodel import Session, select
 from database import get_session
-from models import Category, Menu, CategoryRead, Item, ItemOptionGroup, ItemOption
+from models import Category, Menu, CategoryRead, CategorySummaryRead, Item, ItemOptionGroup, ItemOption
 from dependencies import get_current_user
+from pagination import InvalidCursorError, fetch_page, model_list_response, next_cursor_headers
 from permissions import get_org_permissions
 from url_utils import append_version_query, normalize_upload_url
 
@@ -12,6 +14,9 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 SessionDep = Depends(get_session)
 UserDep = Depends(get_current_user)
 
+# Page size when a cursor is passed without an explicit limit.
+_DEFAULT_PAGE_SIZE = 100
+
 @router.post("/", response_model=Category)
 def create_category(category: Category, session: Session = SessionDep, user: dict = UserDep):
     # Verify menu ownership
@@ -33,25 +38,58 @@ def create_category(category: Category, session: Session = SessionDep, user: dic
     return category
 
 @router.get("/{menu_id}", response_model=List[CategoryRead])
-def list_categories(menu_id: uuid.UUID, request: Request, session: Session = SessionDep):
+def list_categories(
+    menu_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    view: Literal["full", "summary"] = Query("full"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    session: Session = SessionDep,
+):
     # Publicly accessible for now? Or protected? 
     # Let's make it protected for manager view. Public view will use a different endpoint.
+    # view=summary returns item counts instead of nested items; limit/cursor page by (rank, id).
     from sqlalchemy.orm import selectinload
-    categories = session.exec(
-        select(Category)
-        .where(Category.menu_id == menu_id)
-        .order_by(Category.rank)
-        .options(
-            selectinload(Category.items).selectinload(Item.photos),
-            selectinload(Category.items).selectinload(Item.dietary_tags),
-            selectinload(Category.items).selectinload(Item.allergens),
-            selectinload(Category.items).selectinload(Item.visibility_rules),
-            selectinload(Category.items)
-            .selectinload(Item.option_groups)
-            .selectinload(ItemOptionGroup.options)
-            .selectinload(ItemOption.visibility_rules),
+    if view == "summary":
+        statement = (
+            select(
+                *(getattr(Category, name) for name in CategorySummaryRead.model_fields if name != "item_count"),
+                func.count(Item.id).label("item_count"),
+            )
+            .outerjoin(Item, Item.category_id == Category.id)
+            .where(Category.menu_id == menu_id)
+            .group_by(Category.id)
+        )
+    else:
+        statement = (
+            select(Category)
+            .where(Category.menu_id == menu_id)
+            .options(
+                selectinload(Category.items).selectinload(Item.photos),
+                selectinload(Category.items).selectinload(Item.dietary_tags),
+                selectinload(Category.items).selectinload(Item.allergens),
+                selectinload(Category.items).selectinload(Item.visibility_rules),
+                selectinload(Category.items)
+                .selectinload(Item.option_groups)
+                .selectinload(ItemOptionGroup.options)
+                .selectinload(ItemOption.visibility_rules),
+            )
+        )
+    try:
+        categories, next_cursor = fetch_page(
+            session,
+            statement,
+            (Category.rank, Category.id),
+            cursor=cursor,
+            limit=limit or (_DEFAULT_PAGE_SIZE if cursor else None),
+            parsers=(int, uuid.UUID),
         )
-    ).all()
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if view == "summary":
+        return model_list_response([CategorySummaryRead.model_validate(row) for row in categories], next_cursor)
+    response.headers.update(next_cursor_headers(next_cursor))
     for category in categories:
         for item in category.items or []:
             version = (
@@ -23,6 +23,7 @@ from storage_keys import (
     menu_branding_logo_key,
     menu_branding_title_logo_key,
 )
+from storage_backend import get_storage_backend
 from storage_utils import store_bytes
 from url_utils import forwarded_prefix
 
@@ -106,9 +107,8 @@ def _ocr_with_textract(file: UploadFile) -> str:
     if not bucket:
         raise HTTPException(status_code=500, detail="S3_BUCKET_NAME is required for Textract OCR")
     key = f"imports/{uuid.uuid4()}-{file.filename}"
-    s3 = boto3.client("s3")
     textract = boto3.client("textract")
-    s3.upload_fileobj(file.file, bucket, key, ExtraArgs={"ContentType": file.content_type})
+    get_storage_backend().upload_fileobj(file.file, key, content_type=file.content_type)
     response = textract.detect_document_text(
         Document={"S3Object": {"Bucket": bucket, "Name": key}}
     )
@@ -303,7 +303,6 @@ def apply_imported_menu(
 # ================== Menuvium ZIP Import ==================
 
 import zipfile
-import boto3
 from pathlib import Path
 from models import DietaryTag, Allergen, ItemPhoto
 
@@ -2,7 +2,7 @@ import uuid
 import os
 from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from pydantic import BaseModel
 from sqlmodel import Session, select, delete
 from database import get_session
@@ -46,6 +46,7 @@ from storage_keys import (
     extension_for_filename,
     item_ar_capture_key,
     item_photo_original_key,
+    item_root,
     misc_upload_key,
     menu_branding_banner_key,
     menu_branding_logo_key,
@@ -54,6 +55,7 @@ from storage_keys import (
 from storage_utils import (
     create_upload_target,
     delete_storage_key_best_effort as storage_delete_storage_key_best_effort,
+    purge_storage_best_effort,
     local_upload_dir as storage_local_upload_dir,
     local_uploads_enabled as storage_local_uploads_enabled,
     safe_local_path as storage_safe_local_path,
@@ -1079,24 +1081,9 @@ def delete_item_photos(item_id: uuid.UUID, session: Session = SessionDep, user:
         raise HTTPException(status_code=403, detail="Not authorized")
 
     photos = session.exec(select(ItemPhoto).where(ItemPhoto.item_id == item_id)).all()
-    if photos:
-        bucket_name = os.getenv("S3_BUCKET_NAME")
-        if bucket_name:
-            s3_client = boto3.client("s3")
-            for photo in photos:
-                try:
-                    if photo.s3_key:
-                        s3_client.delete_object(Bucket=bucket_name, Key=photo.s3_key)
-                except Exception:
-                    # Best-effort: removing DB link is enough to "remove" a photo in the app.
-                    pass
-        elif _local_uploads_enabled():
-            for photo in photos:
-                try:
-                    if photo.s3_key:
-                        _safe_local_path(photo.s3_key).unlink(missing_ok=True)
-                except Exception:
-                    pass
+    # Best-effort: removing DB link is enough to "remove" a photo in the app.
+    for photo in photos:
+        _delete_storage_key_best_effort(photo.s3_key)
 
     session.exec(delete(ItemPhoto).where(ItemPhoto.item_id == item_id))
     session.commit()
@@ -1155,7 +1142,12 @@ def update_item(item_id: uuid.UUID, item_update: ItemUpdate, session: Session =
     return db_item
 
 @router.delete("/{item_id}")
-def delete_item(item_id: uuid.UUID, session: Session = SessionDep, user: dict = UserDep):
+def delete_item(
+    item_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    session: Session = SessionDep,
+    user: dict = UserDep,
+):
     db_item = session.get(Item, item_id)
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
@@ -1183,6 +1175,12 @@ def delete_item(item_id: uuid.UUID, session: Session = SessionDep, user: dict =
     if group_ids:
         session.exec(delete(ItemOptionGroup).where(ItemOptionGroup.id.in_(group_ids)))
     session.exec(delete(VisibilityRule).where(VisibilityRule.item_id == db_item.id))
+    photo_keys = session.exec(select(ItemPhoto.s3_key).where(ItemPhoto.item_id == db_item.id)).all()
     session.delete(db_item)
     session.commit()
+    background_tasks.add_task(
+        purge_storage_best_effort,
+        prefixes=[item_root(menu.org_id, item_id)],
+        keys=photo_keys,
+    )
     return {"ok": True}
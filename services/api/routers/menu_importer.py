@@ -7,20 +7,21 @@ All endpoints require admin authentication via ADMIN_EMAILS allowlist.
 import json
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import Response
 from pydantic import BaseModel
-from sqlmodel import Session, select, col
+from sqlmodel import Session, select
 
 from database import get_session
 from dependencies import get_admin_user
-from models import ImportJob, ImportJobCreate, ImportJobRead, Menu, Organization
+from models import ImportJob, ImportJobCreate, ImportJobRead, ImportJobSummaryRead, Menu, Organization
 
 from importer.zipper import get_zip_data
 from importer.utils import slugify
 from routers.imports import import_menu_from_zip_bytes
+from pagination import InvalidCursorError, fetch_page, model_list_response, next_cursor_headers
 from url_utils import forwarded_prefix
 
 router = APIRouter(prefix="/admin/menu-importer", tags=["admin-menu-importer"])
@@ -75,18 +76,42 @@ async def create_job(
 
 @router.get("/jobs", response_model=List[ImportJobRead])
 async def list_jobs(
+    response: Response,
     status_filter: Optional[str] = Query(None, alias="status"),
-    limit: int = Query(50, le=200),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    view: Literal["full", "summary"] = Query("full"),
     session: Session = SessionDep,
     user: dict = AdminDep,
 ):
-    """List all import jobs, newest first. Optionally filter by status."""
-    query = select(ImportJob).order_by(col(ImportJob.created_at).desc()).limit(limit)
+    """List import jobs, newest first. Optionally filter by status.
+
+    Pages continue from the X-Next-Cursor header via ?cursor=. view=summary
+    leaves out logs and metadata_json (use GET /jobs/{id} for those).
+    """
+    if view == "summary":
+        query = select(*(getattr(ImportJob, name) for name in ImportJobSummaryRead.model_fields))
+    else:
+        query = select(ImportJob)
     if status_filter:
         allowed = {"QUEUED", "RUNNING", "NEEDS_INPUT", "FAILED", "COMPLETED", "CANCELED"}
         if status_filter.upper() in allowed:
             query = query.where(ImportJob.status == status_filter.upper())
-    jobs = session.exec(query).all()
+    try:
+        jobs, next_cursor = fetch_page(
+            session,
+            query,
+            (ImportJob.created_at, ImportJob.id),
+            cursor=cursor,
+            limit=limit,
+            parsers=(datetime.fromisoformat, uuid.UUID),
+            descending=True,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if view == "summary":
+        return model_list_response([ImportJobSummaryRead.model_validate(row) for row in jobs], next_cursor)
+    response.headers.update(next_cursor_headers(next_cursor))
     return jobs
 
 
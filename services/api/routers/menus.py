@@ -1,21 +1,28 @@
 import uuid
+import hashlib
 import json
 import os
 import io
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, NamedTuple, Optional
+from typing import List, Literal, NamedTuple, Optional
 from urllib.parse import urlparse
-from fastapi import APIRouter, Depends, HTTPException, Request, Query, Response
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlmodel import Session, select, delete
 from sqlalchemy.orm import selectinload
 from PIL import Image
 from zoneinfo import ZoneInfo
+from compression import etag_matches
 from database import get_session
 from models import (
     Menu,
     Organization,
     MenuRead,
+    MenuSummaryRead,
     MenuUpdate,
     Category,
     Item,
@@ -27,15 +34,27 @@ from models import (
     VisibilityRule,
 )
 from dependencies import get_current_user
+from pagination import InvalidCursorError, fetch_page, model_list_response, next_cursor_headers
 from permissions import get_org_permissions
-from storage_keys import menu_qr_current_key, menu_qr_version_key
-from storage_utils import store_bytes
+from public_menu_payload import UnknownFieldsError, parse_item_fields, serialize_compact_menu
+from qr_codes import qr_cache_key, qr_render_cache, render_qr_png
+from storage_backend import get_storage_backend
+from storage_keys import item_root, menu_qr_current_key, menu_qr_version_key, menu_root
+from storage_utils import purge_storage_best_effort, store_bytes
 from url_utils import append_version_query, normalize_upload_url, forwarded_prefix
 
 router = APIRouter(prefix="/menus", tags=["menus"])
 SessionDep = Depends(get_session)
 UserDep = Depends(get_current_user)
 
+# Page size when a cursor is passed without an explicit limit.
+_DEFAULT_PAGE_SIZE = 100
+
+
+def _log(message: str) -> None:
+    print(f"[menus] {message}")
+
+
 def _local_uploads_enabled() -> bool:
     import os
 
@@ -217,33 +236,6 @@ def _is_visible_with_rules(rules: List[VisibilityRule], now_local: datetime) ->
     return any(_visibility_rule_matches(rule, now_local) for rule in include_rules)
 
 
-def _fetch_qr_png(public_url: str, size_px: int = 1000) -> bytes:
-    from urllib.parse import quote
-    import httpx
-
-    qr_size = max(256, min(1000, int(size_px)))
-    qr_url = (
-        "https://api.qrserver.com/v1/create-qr-code/"
-        f"?size={qr_size}x{qr_size}&margin=0&ecc=H&format=png&data={quote(public_url, safe='')}"
-    )
-    with httpx.Client(timeout=20.0, follow_redirects=True) as client:
-        res = client.get(qr_url)
-        res.raise_for_status()
-        return res.content
-
-
-def _trim_qr_whitespace(qr_img: Image.Image) -> Image.Image:
-    """
-    Remove outer white padding to keep the exported QR tightly framed.
-    """
-    grayscale = qr_img.convert("L")
-    mask = grayscale.point(lambda px: 255 if px < 245 else 0)
-    bounds = mask.getbbox()
-    if not bounds:
-        return qr_img
-    return qr_img.crop(bounds)
-
-
 def _png_to_pdf_bytes(png_bytes: bytes) -> bytes:
     png_image = Image.open(io.BytesIO(png_bytes)).convert("RGB")
     output = io.BytesIO()
@@ -253,11 +245,43 @@ def _png_to_pdf_bytes(png_bytes: bytes) -> bytes:
 
 
 def _render_standard_qr_png(public_url: str, size_px: int = 1000) -> bytes:
-    qr_img = Image.open(io.BytesIO(_fetch_qr_png(public_url, size_px=size_px))).convert("RGB")
-    trimmed = _trim_qr_whitespace(qr_img)
-    output = io.BytesIO()
-    trimmed.save(output, format="PNG", optimize=True)
-    return output.getvalue()
+    return render_qr_png(public_url, size_px=max(256, min(1000, int(size_px))))
+
+
+class _MenuQrRef(NamedTuple):
+    """The menu columns QR rendering reads, detached from the session so worker threads can use them."""
+
+    id: uuid.UUID
+    org_id: uuid.UUID
+    name: Optional[str]
+    qr_public_url: Optional[str]
+    qr_generated_at: Optional[datetime]
+
+    @classmethod
+    def of(cls, menu: Menu) -> "_MenuQrRef":
+        return cls(menu.id, menu.org_id, menu.name, menu.qr_public_url, menu.qr_generated_at)
+
+
+def _stored_menu_qr_png(menu: _MenuQrRef, public_url: str, size_px: int) -> Optional[bytes]:
+    """The menu's current QR asset from storage, if it encodes public_url (best effort)."""
+    # The origin depends on env and request headers, so a code generated for
+    # another origin must not be served (or cached) for this one.
+    if not menu.qr_generated_at or menu.qr_public_url != public_url:
+        return None
+    backend = get_storage_backend()
+    if backend is None:
+        return None
+    try:
+        return backend.get_bytes(menu_qr_current_key(menu.org_id, menu.id, size_px=size_px))
+    except Exception:
+        return None
+
+
+def _menu_qr_png(menu: _MenuQrRef, public_url: str, size_px: int) -> bytes:
+    return qr_render_cache.get_or_render(
+        qr_cache_key(public_url, size_px, "png"),
+        lambda: _stored_menu_qr_png(menu, public_url, size_px) or _render_standard_qr_png(public_url, size_px=size_px),
+    )
 
 
 class _StoredQrAssets(NamedTuple):
@@ -266,16 +290,16 @@ class _StoredQrAssets(NamedTuple):
 
 
 def _store_generated_qr(
-    menu: Menu,
+    org_id: uuid.UUID,
+    menu_id: uuid.UUID,
     png_bytes: bytes,
-    request: Request,
     *,
+    base_url: Optional[str],
     size_px: int = 1000,
 ) -> _StoredQrAssets:
     render_id = uuid.uuid4()
-    base_url = forwarded_prefix(request) or None
-    version_key = menu_qr_version_key(menu.org_id, menu.id, render_id, size_px=size_px)
-    current_key = menu_qr_current_key(menu.org_id, menu.id, size_px=size_px)
+    version_key = menu_qr_version_key(org_id, menu_id, render_id, size_px=size_px)
+    current_key = menu_qr_current_key(org_id, menu_id, size_px=size_px)
 
     version_url = store_bytes(
         data=png_bytes,
@@ -337,11 +361,20 @@ def _regenerate_plain_menu_qr(
 ) -> RegenerateMenuQrResponse:
     public_url = f"{_public_web_origin(request)}/r/{menu.id}"
     qr_png = _render_standard_qr_png(public_url, size_px=size_px)
-    stored_assets = _store_generated_qr(menu, qr_png, request, size_px=size_px)
+    stored_assets = _store_generated_qr(
+        menu.org_id,
+        menu.id,
+        qr_png,
+        base_url=forwarded_prefix(request) or None,
+        size_px=size_px,
+    )
+    qr_render_cache.set(qr_cache_key(public_url, size_px, "png"), qr_png)
+    qr_render_cache.discard(qr_cache_key(public_url, size_px, "pdf"))
     generated_at = datetime.utcnow()
 
     menu.qr_url = stored_assets.version_url
     menu.qr_generated_at = generated_at
+    menu.qr_public_url = public_url
     session.add(menu)
     session.commit()
     session.refresh(menu)
@@ -535,31 +568,206 @@ def get_menu_qr_asset(
         raise HTTPException(status_code=400, detail="Invalid format")
 
     public_url = f"{_public_web_origin(request)}/r/{menu.id}"
-    png_bytes = _render_standard_qr_png(public_url, size_px=size)
-
     safe_name = (menu.name or "menu").strip().replace("/", "-")
+    menu_ref = _MenuQrRef.of(menu)
     if format_key == "pdf":
-        pdf_bytes = _png_to_pdf_bytes(png_bytes)
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f'attachment; filename="{safe_name}-qr.pdf"',
-                "Cache-Control": "no-store",
-            },
+        content = qr_render_cache.get_or_render(
+            qr_cache_key(public_url, size, "pdf"),
+            lambda: _png_to_pdf_bytes(_menu_qr_png(menu_ref, public_url, size)),
         )
+        media_type = "application/pdf"
+        disposition = f'attachment; filename="{safe_name}-qr.pdf"'
+    else:
+        content = _menu_qr_png(menu_ref, public_url, size)
+        media_type = "image/png"
+        disposition = f'inline; filename="{safe_name}-qr.png"'
+
+    etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+    # The encoded URL depends on the caller's origin, so shared caches must not
+    # reuse it; browsers revalidate against the ETag instead.
+    headers = {
+        "Content-Disposition": disposition,
+        "Cache-Control": "private, no-cache",
+        "ETag": etag,
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
+class BulkMenuQrRequest(BaseModel):
+    org_id: uuid.UUID
+    sizes: List[int] = [1000]
+    include_pdf: bool = True
+    output: Literal["zip", "pdf"] = "zip"
+    force: bool = False
+
+
+def _bulk_qr_concurrency() -> int:
+    try:
+        return max(1, int(os.getenv("QR_BULK_CONCURRENCY", "8")))
+    except ValueError:
+        return 8
+
+
+# Bulk archives larger than this spill from memory to a temporary file.
+_BULK_QR_SPOOL_BYTES = 16 * 1024 * 1024
+_BULK_QR_CHUNK_BYTES = 64 * 1024
+
+
+def _qr_archive_folder(menu: _MenuQrRef) -> str:
+    safe_name = (menu.name or "menu").strip().replace("/", "-") or "menu"
+    return f"{safe_name}-{str(menu.id)[:8]}"
+
+
+def _pngs_to_multipage_pdf(pngs: List[bytes], output) -> None:
+    pages = [Image.open(io.BytesIO(png)).convert("RGB") for png in pngs]
+    pages[0].save(output, format="PDF", resolution=300.0, save_all=True, append_images=pages[1:])
+
+
+def _stream_spooled(spool):
+    try:
+        spool.seek(0)
+        while chunk := spool.read(_BULK_QR_CHUNK_BYTES):
+            yield chunk
+    finally:
+        spool.close()
+
+
+@router.post("/bulk-qr")
+def bulk_generate_menu_qr(
+    payload: BulkMenuQrRequest,
+    request: Request,
+    session: Session = SessionDep,
+    user: dict = UserDep,
+):
+    """Refresh every menu QR in an organization and return them as one print-ready file.
+
+    Menus whose stored QR already encodes the current public URL are not
+    re-uploaded (unless force is set). Renders and uploads run concurrently;
+    the response is a zip (PNG per size, plus PDF) or a multipage PDF, spooled
+    to a temporary file and streamed back.
+    """
+    org = session.get(Organization, payload.org_id)
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    perms = get_org_permissions(session, payload.org_id, user)
+    if not perms.can_manage_menus:
+        raise HTTPException(status_code=403, detail="Not authorized for this organization")
+
+    sizes = sorted({max(256, min(1000, int(size))) for size in payload.sizes}) or [1000]
+    menus = session.exec(
+        select(Menu).where(Menu.org_id == payload.org_id).order_by(Menu.name, Menu.id)
+    ).all()
+    if not menus:
+        raise HTTPException(status_code=404, detail="Organization has no menus")
+
+    # Worker threads only ever see these plain snapshots, never session-bound rows.
+    refs = [_MenuQrRef.of(menu) for menu in menus]
+    origin = _public_web_origin(request)
+    base_url = forwarded_prefix(request) or None
+    public_urls = {ref.id: f"{origin}/r/{ref.id}" for ref in refs}
+    stale = [
+        ref for menu, ref in zip(menus, refs)
+        if payload.force or not menu.qr_url or ref.qr_public_url != public_urls[ref.id]
+    ]
+    stale_ids = {ref.id for ref in stale}
+
+    def _regenerate(ref: _MenuQrRef) -> _StoredQrAssets:
+        public_url = public_urls[ref.id]
+        png = _render_standard_qr_png(public_url)
+        qr_render_cache.set(qr_cache_key(public_url, 1000, "png"), png)
+        qr_render_cache.discard(qr_cache_key(public_url, 1000, "pdf"))
+        return _store_generated_qr(ref.org_id, ref.id, png, base_url=base_url)
+
+    def _render_outputs(ref: _MenuQrRef) -> dict[int, tuple[bytes, Optional[bytes]]]:
+        public_url = public_urls[ref.id]
+        outputs = {}
+        for size in sizes:
+            png = (
+                qr_render_cache.get_or_render(
+                    qr_cache_key(public_url, size, "png"),
+                    lambda: _render_standard_qr_png(public_url, size_px=size),
+                )
+                if ref.id in stale_ids
+                else _menu_qr_png(ref, public_url, size)
+            )
+            pdf = None
+            if payload.include_pdf and payload.output == "zip":
+                pdf = qr_render_cache.get_or_render(
+                    qr_cache_key(public_url, size, "pdf"),
+                    lambda: _png_to_pdf_bytes(png),
+                )
+            outputs[size] = (png, pdf)
+        return outputs
+
+    spool = tempfile.SpooledTemporaryFile(max_size=_BULK_QR_SPOOL_BYTES)
+    try:
+        with ThreadPoolExecutor(max_workers=_bulk_qr_concurrency(), thread_name_prefix="menu-qr") as executor:
+            stored_futures = {ref.id: executor.submit(_regenerate, ref) for ref in stale}
+            stored: dict[uuid.UUID, _StoredQrAssets] = {}
+            failed: List[str] = []
+            for ref in stale:
+                try:
+                    stored[ref.id] = stored_futures[ref.id].result()
+                except Exception as exc:
+                    _log(f"Bulk QR upload failed for menu {ref.id}: {exc}")
+                    failed.append(str(ref.id))
+
+            if payload.output == "pdf":
+                largest = sizes[-1]
+                _pngs_to_multipage_pdf(
+                    [outputs[largest][0] for outputs in executor.map(_render_outputs, refs)],
+                    spool,
+                )
+            else:
+                # PNG and PDF are already compressed; storing avoids spending CPU for nothing.
+                with zipfile.ZipFile(spool, "w", compression=zipfile.ZIP_STORED) as bundle:
+                    # map() yields in menu order, so each menu is written as soon as it is rendered.
+                    for ref, outputs in zip(refs, executor.map(_render_outputs, refs)):
+                        folder = _qr_archive_folder(ref)
+                        for size, (png, pdf) in outputs.items():
+                            bundle.writestr(f"{folder}/qr-{size}.png", png)
+                            if pdf is not None:
+                                bundle.writestr(f"{folder}/qr-{size}.pdf", pdf)
+    except BaseException:
+        spool.close()
+        raise
+
+    generated_at = datetime.utcnow()
+    for menu in menus:
+        assets = stored.get(menu.id)
+        if assets is None:
+            continue
+        menu.qr_url = assets.version_url
+        menu.qr_generated_at = generated_at
+        menu.qr_public_url = public_urls[menu.id]
+        session.add(menu)
+    session.commit()
+
+    org_name = (org.name or "organization").strip().replace("/", "-")
+    extension, media_type = ("pdf", "application/pdf") if payload.output == "pdf" else ("zip", "application/zip")
+    headers = {
+        "Content-Disposition": f'attachment; filename="{org_name}-qr-codes.{extension}"',
+        "Content-Length": str(spool.tell()),
+        "X-Qr-Regenerated": str(len(stored)),
+        "X-Qr-Skipped": str(len(menus) - len(stale)),
+        "X-Qr-Failed": str(len(failed)),
+    }
+    return StreamingResponse(_stream_spooled(spool), media_type=media_type, headers=headers)
 
-    return Response(
-        content=png_bytes,
-        media_type="image/png",
-        headers={
-            "Content-Disposition": f'inline; filename="{safe_name}-qr.png"',
-            "Cache-Control": "no-store",
-        },
-    )
 
 @router.get("/", response_model=List[Menu])
-def list_menus(org_id: uuid.UUID, request: Request, session: Session = SessionDep, user: dict = UserDep):
+def list_menus(
+    org_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    view: Literal["full", "summary"] = Query("full"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    session: Session = SessionDep,
+    user: dict = UserDep,
+):
+    """Menus of an org, oldest first; pass limit (and then cursor) to page through them."""
     org = session.get(Organization, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
@@ -567,11 +775,32 @@ def list_menus(org_id: uuid.UUID, request: Request, session: Session = SessionDe
     if not perms.can_view:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    menus = session.exec(select(Menu).where(Menu.org_id == org_id)).all()
+    if view == "summary":
+        statement = select(*(getattr(Menu, name) for name in MenuSummaryRead.model_fields))
+    else:
+        statement = select(Menu)
+    try:
+        menus, next_cursor = fetch_page(
+            session,
+            statement.where(Menu.org_id == org_id),
+            (Menu.created_at, Menu.id),
+            cursor=cursor,
+            limit=limit or (_DEFAULT_PAGE_SIZE if cursor else None),
+            parsers=(datetime.fromisoformat, uuid.UUID),
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if view == "summary":
+        summaries = [MenuSummaryRead.model_validate(row) for row in menus]
+        for summary in summaries:
+            summary.banner_url = normalize_upload_url(summary.banner_url, request)
+            summary.logo_url = normalize_upload_url(summary.logo_url, request)
+        return model_list_response(summaries, next_cursor)
     for menu in menus:
         menu.banner_url = normalize_upload_url(menu.banner_url, request)
         menu.logo_url = normalize_upload_url(menu.logo_url, request)
         menu.qr_url = normalize_upload_url(menu.qr_url, request)
+    response.headers.update(next_cursor_headers(next_cursor))
     return menus
 
 @router.get("/{menu_id}", response_model=Menu)
@@ -615,7 +844,12 @@ def update_menu(menu_id: uuid.UUID, menu_update: MenuUpdate, session: Session =
     return db_menu
 
 @router.delete("/{menu_id}")
-def delete_menu(menu_id: uuid.UUID, session: Session = SessionDep, user: dict = UserDep):
+def delete_menu(
+    menu_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    session: Session = SessionDep,
+    user: dict = UserDep,
+):
     db_menu = session.get(Menu, menu_id)
     if not db_menu:
         raise HTTPException(status_code=404, detail="Menu not found")
@@ -626,12 +860,19 @@ def delete_menu(menu_id: uuid.UUID, session: Session = SessionDep, user: dict =
     if not perms.can_manage_menus:
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    storage_prefixes = [menu_root(db_menu.org_id, menu_id)]
+    storage_keys: list[Optional[str]] = []
     categories = session.exec(select(Category.id).where(Category.menu_id == menu_id)).all()
     category_ids = [row[0] if isinstance(row, tuple) else row for row in categories]
     if category_ids:
         item_ids = session.exec(select(Item.id).where(Item.category_id.in_(category_ids))).all()
         item_ids = [row[0] if isinstance(row, tuple) else row for row in item_ids]
         if item_ids:
+            storage_prefixes.extend(item_root(db_menu.org_id, item_id) for item_id in item_ids)
+            # Photos uploaded before the per-org layout live outside item_root.
+            storage_keys.extend(
+                session.exec(select(ItemPhoto.s3_key).where(ItemPhoto.item_id.in_(item_ids))).all()
+            )
             option_group_ids = session.exec(
                 select(ItemOptionGroup.id).where(ItemOptionGroup.item_id.in_(item_ids))
             ).all()
@@ -657,11 +898,11 @@ def delete_menu(menu_id: uuid.UUID, session: Session = SessionDep, user: dict =
 
     session.delete(db_menu)
     session.commit()
+    background_tasks.add_task(purge_storage_best_effort, prefixes=storage_prefixes, keys=storage_keys)
     return {"ok": True}
 
-@router.get("/public/{menu_id}", response_model=MenuRead)
-def get_public_menu(menu_id: uuid.UUID, request: Request, session: Session = SessionDep):
-    # Fetch by ID now
+def _load_public_menu(menu_id: uuid.UUID, request: Request, session: Session) -> Menu:
+    """Active menu with only currently visible items/options and public URLs."""
     menu = session.get(Menu, menu_id)
     if not menu:
         raise HTTPException(status_code=404, detail="Menu not found")
@@ -691,58 +932,91 @@ def get_public_menu(menu_id: uuid.UUID, request: Request, session: Session = Ses
     ).all()
 
     now_local = datetime.now(_resolve_menu_timezone(menu))
-    for cat in categories:
-        visible_items: list[Item] = []
-        for item in sorted(cat.items or [], key=lambda item: item.position):
-            if not _is_visible_with_rules(item.visibility_rules or [], now_local):
-                continue
-            visible_groups: list[ItemOptionGroup] = []
-            for group in sorted(item.option_groups or [], key=lambda group: group.position):
-                if not group.is_active:
+    # The filtering below reshapes loaded relationships for the response only;
+    # without no_autoflush, a lazy load would flush the trimmed collections.
+    with session.no_autoflush:
+        for cat in categories:
+            visible_items: list[Item] = []
+            for item in sorted(cat.items or [], key=lambda item: item.position):
+                if not _is_visible_with_rules(item.visibility_rules or [], now_local):
                     continue
-                visible_options: list[ItemOption] = []
-                for option in sorted(group.options or [], key=lambda option: option.position):
-                    if not option.is_active:
+                visible_groups: list[ItemOptionGroup] = []
+                for group in sorted(item.option_groups or [], key=lambda group: group.position):
+                    if not group.is_active:
                         continue
-                    if not _is_visible_with_rules(option.visibility_rules or [], now_local):
+                    visible_options: list[ItemOption] = []
+                    for option in sorted(group.options or [], key=lambda option: option.position):
+                        if not option.is_active:
+                            continue
+                        if not _is_visible_with_rules(option.visibility_rules or [], now_local):
+                            continue
+                        option.image_url = normalize_upload_url(option.image_url, request)
+                        option.visibility_rules = []
+                        visible_options.append(option)
+                    if not visible_options:
                         continue
-                    option.image_url = normalize_upload_url(option.image_url, request)
-                    option.visibility_rules = []
-                    visible_options.append(option)
-                if not visible_options:
-                    continue
-                visible_count = len(visible_options)
-                group.options = visible_options
-                if group.max_select is not None:
-                    group.max_select = min(group.max_select, visible_count)
-                group.min_select = min(group.min_select, visible_count)
-                visible_groups.append(group)
-            item.option_groups = visible_groups
-            item.visibility_rules = []
-            version = (
-                str(int(item.ar_updated_at.timestamp()))
-                if item.ar_updated_at and item.ar_status in {"processing", "ready", "failed"}
-                else None
-            )
-
-            def _versioned_ar_url(url: Optional[str]) -> Optional[str]:
-                normalized = normalize_upload_url(url, request)
-                if normalized and "/ar/current/" in normalized:
-                    return append_version_query(normalized, version)
-                return normalized
-
-            for photo in item.photos or []:
-                photo.url = normalize_upload_url(photo.url, request)
-            item.ar_video_url = normalize_upload_url(item.ar_video_url, request)
-            item.ar_model_glb_url = _versioned_ar_url(item.ar_model_glb_url)
-            item.ar_model_usdz_url = _versioned_ar_url(item.ar_model_usdz_url)
-            item.ar_model_poster_url = _versioned_ar_url(item.ar_model_poster_url)
-            visible_items.append(item)
-        cat.items = visible_items
-    menu.categories = categories
+                    visible_count = len(visible_options)
+                    group.options = visible_options
+                    if group.max_select is not None:
+                        group.max_select = min(group.max_select, visible_count)
+                    group.min_select = min(group.min_select, visible_count)
+                    visible_groups.append(group)
+                item.option_groups = visible_groups
+                item.visibility_rules = []
+                version = (
+                    str(int(item.ar_updated_at.timestamp()))
+                    if item.ar_updated_at and item.ar_status in {"processing", "ready", "failed"}
+                    else None
+                )
+
+                def _versioned_ar_url(url: Optional[str]) -> Optional[str]:
+                    normalized = normalize_upload_url(url, request)
+                    if normalized and "/ar/current/" in normalized:
+                        return append_version_query(normalized, version)
+                    return normalized
+
+                for photo in item.photos or []:
+                    photo.url = normalize_upload_url(photo.url, request)
+                item.ar_video_url = normalize_upload_url(item.ar_video_url, request)
+                item.ar_model_glb_url = _versioned_ar_url(item.ar_model_glb_url)
+                item.ar_model_usdz_url = _versioned_ar_url(item.ar_model_usdz_url)
+                item.ar_model_poster_url = _versioned_ar_url(item.ar_model_poster_url)
+                visible_items.append(item)
+            cat.items = visible_items
+        menu.categories = categories
     menu.banner_url = normalize_upload_url(menu.banner_url, request)
     menu.logo_url = normalize_upload_url(menu.logo_url, request)
     menu.qr_url = normalize_upload_url(menu.qr_url, request)
+    return menu
+
 
+@router.get("/public/{menu_id}", response_model=MenuRead)
+def get_public_menu(menu_id: uuid.UUID, request: Request, session: Session = SessionDep):
+    menu = _load_public_menu(menu_id, request, session)
     # Validate explicitly so nested tag/allergen IDs are included consistently.
     return MenuRead.model_validate(menu)
+
+
+@router.get("/public/{menu_id}/compact")
+def get_public_menu_compact(
+    menu_id: uuid.UUID,
+    request: Request,
+    fields: Optional[str] = Query(default=None, description="Comma separated item fields to include"),
+    session: Session = SessionDep,
+):
+    """Diner-facing menu without admin-only fields; see public_menu_payload."""
+    try:
+        item_fields = parse_item_fields(fields)
+    except UnknownFieldsError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    menu = _load_public_menu(menu_id, request, session)
+    body = json.dumps(
+        serialize_compact_menu(menu, fields=item_fields),
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
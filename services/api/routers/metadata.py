@@ -1,13 +1,159 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, List, NamedTuple, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession, object_session
 from sqlmodel import Session, select, delete
 from pydantic import BaseModel
+from compression import etag_matches
 from database import get_session
 from models import DietaryTag, Allergen, ItemDietaryTagLink, ItemAllergenLink
 
 router = APIRouter(prefix="/metadata", tags=["metadata"])
 SessionDep = Depends(get_session)
 
+DEFAULT_DIETARY_TAGS = [
+    "Vegetarian",
+    "Vegan",
+    "Eggless",
+    "Halal",
+    "Jain",
+    "Mild",
+    "Spicy",
+    "Extra Spicy",
+    "Bestseller",
+    "Chef's Special",
+    "New",
+]
+DEFAULT_ALLERGENS = ["Contains Nuts", "Contains Dairy", "Contains Gluten"]
+
+DIETARY_TAGS_KIND = "dietary-tags"
+ALLERGENS_KIND = "allergens"
+
+
+# Set once a seed has committed; until then the list endpoints retry it.
+_default_metadata_seeded = threading.Event()
+_seed_lock = threading.Lock()
+
+
+def seed_default_metadata(session: Session) -> None:
+    """Insert the default dietary tags / allergens into empty tables (run at startup)."""
+    if not session.exec(select(DietaryTag.id).limit(1)).first():
+        for name in DEFAULT_DIETARY_TAGS:
+            session.add(DietaryTag(name=name))
+    if not session.exec(select(Allergen.id).limit(1)).first():
+        for name in DEFAULT_ALLERGENS:
+            session.add(Allergen(name=name))
+    session.commit()
+    _default_metadata_seeded.set()
+
+
+def _ensure_default_metadata(session: Session) -> None:
+    """Retry a failed startup seed (e.g. the app booted before migrations ran) on the first read."""
+    if _default_metadata_seeded.is_set():
+        return
+    with _seed_lock:
+        if not _default_metadata_seeded.is_set():
+            seed_default_metadata(session)
+
+
+# ---------------------------------------------------------------------------
+# Pre-serialized response cache
+# ---------------------------------------------------------------------------
+
+class _CachedPayload(NamedTuple):
+    body: bytes
+    etag: str
+    version: int
+    loaded_at: float
+
+
+class _MetadataCache:
+    """Serialized list responses per kind, dropped whenever a committed write touches that kind.
+
+    Invalidation is per process; METADATA_CACHE_TTL_SECONDS bounds how long
+    another replica's writes can go unseen.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, _CachedPayload] = {}
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _ttl_seconds(self) -> float:
+        try:
+            return float(os.getenv("METADATA_CACHE_TTL_SECONDS", "300"))
+        except ValueError:
+            return 300.0
+
+    def get(self, kind: str, load: Callable[[], list]) -> _CachedPayload:
+        with self._lock:
+            entry = self._entries.get(kind)
+            version = self._versions.get(kind, 0)
+        if entry is not None and entry.version == version and time.monotonic() - entry.loaded_at < self._ttl_seconds():
+            return entry
+        body = json.dumps(load(), separators=(",", ":")).encode("utf-8")
+        entry = _CachedPayload(
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            version=version,
+            loaded_at=time.monotonic(),
+        )
+        with self._lock:
+            # A write committed while loading bumps the version; don't cache the stale read.
+            if self._versions.get(kind, 0) == version:
+                self._entries[kind] = entry
+        return entry
+
+    def invalidate(self, *kinds: str) -> None:
+        with self._lock:
+            for kind in kinds or tuple(self._entries):
+                self._versions[kind] = self._versions.get(kind, 0) + 1
+                self._entries.pop(kind, None)
+
+
+metadata_cache = _MetadataCache()
+_DIRTY_KINDS_KEY = "metadata_cache_dirty_kinds"
+
+
+def _mark_dirty(kind: str):
+    def _listener(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(_DIRTY_KINDS_KEY, set()).add(kind)
+
+    return _listener
+
+
+for _model, _kind in ((DietaryTag, DIETARY_TAGS_KIND), (Allergen, ALLERGENS_KIND)):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _mark_dirty(_kind))
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_metadata_after_commit(session: OrmSession) -> None:
+    kinds = session.info.pop(_DIRTY_KINDS_KEY, None)
+    if kinds:
+        metadata_cache.invalidate(*kinds)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _forget_metadata_writes_after_rollback(session: OrmSession) -> None:
+    session.info.pop(_DIRTY_KINDS_KEY, None)
+
+
+def _cached_list_response(request: Request, payload: _CachedPayload) -> Response:
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+
 class DietaryTagCreate(BaseModel):
     name: str
     icon: Optional[str] = None
@@ -16,29 +162,13 @@ class AllergenCreate(BaseModel):
     name: str
 
 @router.get("/dietary-tags", response_model=List[DietaryTag])
-def list_dietary_tags(session: Session = SessionDep):
-    tags = session.exec(select(DietaryTag)).all()
-    # Seed if empty?
-    if not tags:
-        seed_tags = [
-            "Vegetarian",
-            "Vegan",
-            "Eggless",
-            "Halal",
-            "Jain",
-            "Mild",
-            "Spicy",
-            "Extra Spicy",
-            "Bestseller",
-            "Chef's Special",
-            "New"
-        ]
-        for t in seed_tags:
-            tag = DietaryTag(name=t)
-            session.add(tag)
-        session.commit()
-        tags = session.exec(select(DietaryTag)).all()
-    return tags
+def list_dietary_tags(request: Request, session: Session = SessionDep):
+    _ensure_default_metadata(session)
+    payload = metadata_cache.get(
+        DIETARY_TAGS_KIND,
+        lambda: [tag.model_dump(mode="json") for tag in session.exec(select(DietaryTag)).all()],
+    )
+    return _cached_list_response(request, payload)
 
 @router.post("/dietary-tags", response_model=DietaryTag, status_code=201)
 def create_dietary_tag(payload: DietaryTagCreate, session: Session = SessionDep):
@@ -55,16 +185,13 @@ def create_dietary_tag(payload: DietaryTagCreate, session: Session = SessionDep)
     return tag
 
 @router.get("/allergens", response_model=List[Allergen])
-def list_allergens(session: Session = SessionDep):
-    allergens = session.exec(select(Allergen)).all()
-    if not allergens:
-        seed_allergens = ["Contains Nuts", "Contains Dairy", "Contains Gluten"]
-        for a in seed_allergens:
-            al = Allergen(name=a)
-            session.add(al)
-        session.commit()
-        allergens = session.exec(select(Allergen)).all()
-    return allergens
+def list_allergens(request: Request, session: Session = SessionDep):
+    _ensure_default_metadata(session)
+    payload = metadata_cache.get(
+        ALLERGENS_KIND,
+        lambda: [allergen.model_dump(mode="json") for allergen in session.exec(select(Allergen)).all()],
+    )
+    return _cached_list_response(request, payload)
 
 @router.post("/allergens", response_model=Allergen, status_code=201)
 def create_allergen(payload: AllergenCreate, session: Session = SessionDep):
@@ -81,7 +208,7 @@ def create_allergen(payload: AllergenCreate, session: Session = SessionDep):
     return allergen
 
 @router.delete("/dietary-tags/{tag_id}", status_code=204)
-def delete_dietary_tag(tag_id: str, session: Session = SessionDep):
+def delete_dietary_tag(tag_id: uuid.UUID, session: Session = SessionDep):
     tag = session.get(DietaryTag, tag_id)
     if not tag:
         raise HTTPException(status_code=404, detail="Tag not found")
@@ -90,7 +217,7 @@ def delete_dietary_tag(tag_id: str, session: Session = SessionDep):
     session.commit()
 
 @router.delete("/allergens/{allergen_id}", status_code=204)
-def delete_allergen(allergen_id: str, session: Session = SessionDep):
+def delete_allergen(allergen_id: uuid.UUID, session: Session = SessionDep):
     allergen = session.get(Allergen, allergen_id)
     if not allergen:
         raise HTTPException(status_code=404, detail="Allergen not found")
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 import hashlib
 import secrets
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlmodel import Session, select, delete
 from typing import List, Annotated, Optional
 import uuid
@@ -31,6 +31,8 @@ from models import (
 from dependencies import get_current_user
 from permissions import get_org_permissions
 from email_utils import EmailConfigError, send_email
+from storage_keys import organization_root
+from storage_utils import purge_storage_best_effort
 
 router = APIRouter(prefix="/organizations", tags=["organizations"])
 
@@ -511,13 +513,19 @@ def update_organization(org_id: uuid.UUID, org_update: OrganizationUpdate, sessi
 
 
 @router.delete("/{org_id}")
-def delete_organization(org_id: uuid.UUID, session: SessionDep, user: UserDep):
+def delete_organization(
+    org_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    session: SessionDep,
+    user: UserDep,
+):
     org = session.get(Organization, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
     if org.owner_id != user["sub"]:
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    storage_keys: list[Optional[str]] = []
     menu_ids = session.exec(select(Menu.id).where(Menu.org_id == org_id)).all()
     menu_ids = [row[0] if isinstance(row, tuple) else row for row in menu_ids]
     if menu_ids:
@@ -527,6 +535,10 @@ def delete_organization(org_id: uuid.UUID, session: SessionDep, user: UserDep):
             item_ids = session.exec(select(Item.id).where(Item.category_id.in_(category_ids))).all()
             item_ids = [row[0] if isinstance(row, tuple) else row for row in item_ids]
             if item_ids:
+                # Photos uploaded before the per-org layout live outside organization_root.
+                storage_keys.extend(
+                    session.exec(select(ItemPhoto.s3_key).where(ItemPhoto.item_id.in_(item_ids))).all()
+                )
                 session.exec(delete(ItemPhoto).where(ItemPhoto.item_id.in_(item_ids)))
                 session.exec(delete(ItemDietaryTagLink).where(ItemDietaryTagLink.item_id.in_(item_ids)))
                 session.exec(delete(ItemAllergenLink).where(ItemAllergenLink.item_id.in_(item_ids)))
@@ -538,6 +550,11 @@ def delete_organization(org_id: uuid.UUID, session: SessionDep, user: UserDep):
     session.exec(delete(OrganizationMember).where(OrganizationMember.org_id == org_id))
     session.delete(org)
     session.commit()
+    background_tasks.add_task(
+        purge_storage_best_effort,
+        prefixes=[organization_root(org_id)],
+        keys=storage_keys,
+    )
     return {"ok": True}
 
 
@@ -2,9 +2,13 @@
 from __future__ import annotations
 
 import argparse
+import json
 import mimetypes
 import sys
+import time
+import uuid
 from pathlib import Path
+from typing import Callable, Iterator
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -33,7 +37,10 @@ from storage_keys import (
     menu_qr_version_key,
     storage_key_from_url,
 )
-from storage_utils import build_public_url, copy_storage_key, delete_storage_key_best_effort
+from storage_utils import build_public_url, copy_storage_keys, delete_storage_keys_best_effort
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_CONCURRENCY = 16
 
 
 def _infer_content_type(name: str) -> str | None:
@@ -42,56 +49,196 @@ def _infer_content_type(name: str) -> str | None:
 
 
 class Migrator:
-    def __init__(self, *, dry_run: bool, delete_old: bool):
+    """Queues copies per chunk and runs them concurrently on flush().
+
+    Completed (source, target) pairs are appended to an optional JSONL
+    checkpoint so an interrupted run skips work it has already done.
+    """
+
+    def __init__(
+        self,
+        *,
+        dry_run: bool,
+        delete_old: bool,
+        checkpoint_path: Path | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
         self.dry_run = dry_run
         self.delete_old = delete_old
-        self.copy_pairs: set[tuple[str, str]] = set()
+        self.checkpoint_path = checkpoint_path
+        self.concurrency = max(1, concurrency)
+        self.completed_pairs: set[tuple[str, str]] = self._load_checkpoint()
+        self.pending: dict[tuple[str, str], str | None] = {}
+        self.chunk_sources: set[str] = set()
         self.sources_to_delete: set[str] = set()
+        self.retained_sources: set[str] = set()
+        self.copied = 0
+        self.resumed = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
 
     def log(self, message: str) -> None:
         print(message)
 
+    def _load_checkpoint(self) -> set[tuple[str, str]]:
+        if not self.checkpoint_path or not self.checkpoint_path.exists():
+            return set()
+        pairs: set[tuple[str, str]] = set()
+        valid_bytes = 0
+        with self.checkpoint_path.open("rb") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                    pair = (entry["source"], entry["target"])
+                except (ValueError, KeyError, TypeError):
+                    # A crash can leave a torn last line; everything before it is valid.
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                pairs.add(pair)
+                valid_bytes += len(line)
+        # Drop the torn tail so new entries are not appended onto it.
+        if valid_bytes < self.checkpoint_path.stat().st_size and not self.dry_run:
+            with self.checkpoint_path.open("r+b") as handle:
+                handle.truncate(valid_bytes)
+        return pairs
+
+    def _record_checkpoint(self, pairs: list[tuple[str, str]]) -> None:
+        if not self.checkpoint_path or not pairs:
+            return
+        with self.checkpoint_path.open("a", encoding="utf-8") as handle:
+            for source_key, target_key in pairs:
+                handle.write(json.dumps({"source": source_key, "target": target_key}) + "\n")
+
     def copy_key(self, source_key: str | None, target_key: str, *, content_type: str | None = None) -> str:
         if not source_key:
             return target_key
+        if self.delete_old and source_key != target_key:
+            self.chunk_sources.add(source_key)
         pair = (source_key, target_key)
-        if pair in self.copy_pairs:
+        if source_key == target_key or pair in self.pending:
+            return target_key
+        if pair in self.completed_pairs:
+            self.resumed += 1
             return target_key
         self.log(f"COPY {source_key} -> {target_key}")
-        if not self.dry_run:
-            copy_storage_key(source_key=source_key, destination_key=target_key, content_type=content_type)
-        self.copy_pairs.add(pair)
-        if self.delete_old and source_key != target_key:
-            self.sources_to_delete.add(source_key)
+        self.pending[pair] = content_type
         return target_key
 
+    def flush(self) -> list[tuple[str, str]]:
+        """Run queued copies; returns the pairs that failed."""
+        pending, self.pending = self.pending, {}
+        if self.dry_run or not pending:
+            return []
+        by_content_type: dict[str | None, list[tuple[str, str]]] = {}
+        for pair, content_type in pending.items():
+            by_content_type.setdefault(content_type, []).append(pair)
+
+        succeeded: list[tuple[str, str]] = []
+        failed: list[tuple[str, str]] = []
+        for content_type, pairs in by_content_type.items():
+            results = copy_storage_keys(pairs, content_type=content_type, max_workers=self.concurrency)
+            for pair in pairs:
+                error = results.get(pair)
+                if error is None:
+                    succeeded.append(pair)
+                else:
+                    failed.append(pair)
+                    self.log(f"FAILED {pair[0]} -> {pair[1]}: {error}")
+        self.completed_pairs.update(succeeded)
+        self._record_checkpoint(succeeded)
+        self.copied += len(succeeded)
+        self.failed += len(failed)
+        return failed
+
+    def commit_chunk(self) -> None:
+        self.sources_to_delete.update(self.chunk_sources)
+        self.chunk_sources = set()
+
+    def abandon_chunk(self) -> None:
+        # Rows of a rolled-back chunk still point at these keys, even when
+        # another (committed) chunk shared them.
+        self.retained_sources.update(self.chunk_sources)
+        self.pending = {}
+        self.chunk_sources = set()
+
+    def report(self, label: str) -> None:
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        self.log(
+            f"[{label}] copied={self.copied} resumed={self.resumed} failed={self.failed} "
+            f"({self.copied / elapsed:.1f} objects/sec)"
+        )
+
     def delete_sources(self) -> None:
         if self.dry_run or not self.delete_old:
             return
-        for source_key in sorted(self.sources_to_delete):
+        source_keys = sorted(self.sources_to_delete - self.retained_sources)
+        for source_key in sorted(self.sources_to_delete & self.retained_sources):
+            self.log(f"KEEP {source_key} (still referenced by a failed chunk)")
+        for source_key in source_keys:
             self.log(f"DELETE {source_key}")
-            delete_storage_key_best_effort(source_key)
+        delete_storage_keys_best_effort(source_keys)
+
+
+def _iter_chunks(session: Session, model, batch_size: int) -> Iterator[list]:
+    """Keyset-paginate a table by primary key so each chunk is a fresh query."""
+    last_id = None
+    while True:
+        query = select(model).order_by(model.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(model.id > last_id)
+        rows = session.exec(query).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield rows
+
+
+def _migrate_in_chunks(
+    session: Session,
+    migrator: Migrator,
+    *,
+    label: str,
+    model,
+    migrate_rows: Callable[[Session, Migrator, list], None],
+    batch_size: int,
+) -> int:
+    """Migrate one table chunk by chunk: queue copies, run them, then commit the chunk's rows.
+
+    A chunk with any failed copy is rolled back so its rows keep pointing at
+    the old keys; rerunning the script retries it. Returns the failed chunk count.
+    """
+    failed_chunks = 0
+    for rows in _iter_chunks(session, model, batch_size):
+        migrate_rows(session, migrator, rows)
+        failures = migrator.flush()
+        if migrator.dry_run or failures:
+            session.rollback()
+            migrator.abandon_chunk()
+            if failures:
+                failed_chunks += 1
+        else:
+            session.commit()
+            migrator.commit_chunk()
+        migrator.report(label)
+    return failed_chunks
 
 
 def _item_contexts(session: Session) -> dict[str, dict[str, str]]:
-    contexts: dict[str, dict[str, str]] = {}
-    items = session.exec(select(Item)).all()
-    for item in items:
-        category = session.get(Category, item.category_id)
-        if not category:
-            continue
-        menu = session.get(Menu, category.menu_id)
-        if not menu:
-            continue
-        contexts[str(item.id)] = {
-            "org_id": str(menu.org_id),
-            "menu_id": str(menu.id),
-        }
-    return contexts
+    rows = session.exec(
+        select(Item.id, Menu.org_id, Menu.id)
+        .join(Category, Category.id == Item.category_id)
+        .join(Menu, Menu.id == Category.menu_id)
+    ).all()
+    return {
+        str(item_id): {"org_id": str(org_id), "menu_id": str(menu_id)}
+        for item_id, org_id, menu_id in rows
+    }
 
 
 def _menu_contexts(session: Session) -> dict[str, dict[str, str]]:
-    return {str(menu.id): {"org_id": str(menu.org_id)} for menu in session.exec(select(Menu)).all()}
+    rows = session.exec(select(Menu.id, Menu.org_id)).all()
+    return {str(menu_id): {"org_id": str(org_id)} for menu_id, org_id in rows}
 
 
 def _legacy_run_id(item: Item) -> str:
@@ -114,8 +261,17 @@ def _public_url(key: str) -> str:
     return build_public_url(key)
 
 
-def _migrate_menu_assets(session: Session, migrator: Migrator, menu_contexts: dict[str, dict[str, str]]) -> None:
-    menus = session.exec(select(Menu)).all()
+def _stable_asset_id(owner_id, source_key: str) -> uuid.UUID:
+    """Asset id derived from the source, so a rerun picks the same target key and the checkpoint matches."""
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"{owner_id}/{source_key}")
+
+
+def _migrate_menu_assets(
+    session: Session,
+    migrator: Migrator,
+    menus: list[Menu],
+    menu_contexts: dict[str, dict[str, str]],
+) -> None:
     for menu in menus:
         context = menu_contexts.get(str(menu.id))
         if not context:
@@ -125,14 +281,26 @@ def _migrate_menu_assets(session: Session, migrator: Migrator, menu_contexts: di
         banner_source = storage_key_from_url(menu.banner_url)
         if banner_source:
             ext = Path(banner_source).suffix or ".jpg"
-            target_key = menu_branding_banner_key(org_id, menu.id, f"banner{ext}", content_type=_infer_content_type(banner_source))
+            target_key = menu_branding_banner_key(
+                org_id,
+                menu.id,
+                f"banner{ext}",
+                content_type=_infer_content_type(banner_source),
+                asset_id=_stable_asset_id(menu.id, banner_source),
+            )
             migrator.copy_key(banner_source, target_key, content_type=_infer_content_type(banner_source))
             menu.banner_url = _public_url(target_key)
 
         logo_source = storage_key_from_url(menu.logo_url)
         if logo_source:
             ext = Path(logo_source).suffix or ".png"
-            target_key = menu_branding_logo_key(org_id, menu.id, f"logo{ext}", content_type=_infer_content_type(logo_source))
+            target_key = menu_branding_logo_key(
+                org_id,
+                menu.id,
+                f"logo{ext}",
+                content_type=_infer_content_type(logo_source),
+                asset_id=_stable_asset_id(menu.id, logo_source),
+            )
             migrator.copy_key(logo_source, target_key, content_type=_infer_content_type(logo_source))
             menu.logo_url = _public_url(target_key)
 
@@ -161,6 +329,7 @@ def _migrate_menu_assets(session: Session, migrator: Migrator, menu_contexts: di
                         menu.id,
                         f"title-logo-{index}{ext}",
                         content_type=_infer_content_type(source),
+                        asset_id=_stable_asset_id(menu.id, f"{index}/{source}"),
                     )
                     migrator.copy_key(source, target_key, content_type=_infer_content_type(source))
                     next_logos.append(_public_url(target_key))
@@ -172,8 +341,12 @@ def _migrate_menu_assets(session: Session, migrator: Migrator, menu_contexts: di
         session.add(menu)
 
 
-def _migrate_item_assets(session: Session, migrator: Migrator, item_contexts: dict[str, dict[str, str]]) -> None:
-    items = session.exec(select(Item)).all()
+def _migrate_item_assets(
+    session: Session,
+    migrator: Migrator,
+    items: list[Item],
+    item_contexts: dict[str, dict[str, str]],
+) -> None:
     for item in items:
         context = item_contexts.get(str(item.id))
         if not context:
@@ -265,6 +438,7 @@ def _migrate_item_assets(session: Session, migrator: Migrator, item_contexts: di
                 item.id,
                 Path(current_poster_source).name,
                 content_type=_infer_content_type(current_poster_source),
+                asset_id=_stable_asset_id(item.id, current_poster_source),
             )
             migrator.copy_key(current_poster_source, current_poster_target, content_type=_infer_content_type(current_poster_source))
             item.ar_model_poster_s3_key = current_poster_target
@@ -301,7 +475,9 @@ def _migrate_item_assets(session: Session, migrator: Migrator, item_contexts: di
         item.ar_metadata_json = metadata or None
         session.add(item)
 
-    conversion_jobs = session.exec(select(ArConversionJob)).all()
+    conversion_jobs = session.exec(
+        select(ArConversionJob).where(ArConversionJob.item_id.in_([item.id for item in items]))
+    ).all()
     items_by_id = {str(item.id): item for item in items}
     for job in conversion_jobs:
         item = items_by_id.get(str(job.item_id))
@@ -324,8 +500,7 @@ def _migrate_item_assets(session: Session, migrator: Migrator, item_contexts: di
         session.add(job)
 
 
-def _migrate_import_jobs(session: Session, migrator: Migrator) -> None:
-    jobs = session.exec(select(ImportJob)).all()
+def _migrate_import_jobs(session: Session, migrator: Migrator, jobs: list[ImportJob]) -> None:
     for job in jobs:
         source_key = job.result_zip_key
         if not source_key:
@@ -337,30 +512,67 @@ def _migrate_import_jobs(session: Session, migrator: Migrator) -> None:
         session.add(job)
 
 
+def migrate(session: Session, migrator: Migrator, *, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Migrate menus, items and import jobs; returns the number of failed chunks."""
+    item_contexts = _item_contexts(session)
+    menu_contexts = _menu_contexts(session)
+    failed_chunks = _migrate_in_chunks(
+        session,
+        migrator,
+        label="menus",
+        model=Menu,
+        migrate_rows=lambda s, m, rows: _migrate_menu_assets(s, m, rows, menu_contexts),
+        batch_size=batch_size,
+    )
+    failed_chunks += _migrate_in_chunks(
+        session,
+        migrator,
+        label="items",
+        model=Item,
+        migrate_rows=lambda s, m, rows: _migrate_item_assets(s, m, rows, item_contexts),
+        batch_size=batch_size,
+    )
+    failed_chunks += _migrate_in_chunks(
+        session,
+        migrator,
+        label="imports",
+        model=ImportJob,
+        migrate_rows=_migrate_import_jobs,
+        batch_size=batch_size,
+    )
+    return failed_chunks
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Ad hoc storage layout migration for Menuvium assets")
     parser.add_argument("--dry-run", action="store_true", help="Print planned changes without copying objects or updating the database")
     parser.add_argument("--delete-old", action="store_true", help="Delete source objects after successful copies")
     parser.add_argument("--database-url", help="Optional database URL override for the migration run")
+    parser.add_argument("--checkpoint", type=Path, help="JSONL file of completed copies; reruns skip pairs listed here")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows migrated and committed per chunk")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Parallel server-side copies")
     args = parser.parse_args()
 
-    migrator = Migrator(dry_run=args.dry_run, delete_old=args.delete_old)
+    migrator = Migrator(
+        dry_run=args.dry_run,
+        delete_old=args.delete_old,
+        checkpoint_path=args.checkpoint,
+        concurrency=args.concurrency,
+    )
+    if migrator.completed_pairs:
+        migrator.log(f"Resuming with {len(migrator.completed_pairs)} completed copies from {args.checkpoint}")
     if args.database_url:
         database.settings.DATABASE_URL = args.database_url
     engine = database.get_engine()
+    batch_size = max(1, args.batch_size)
     with Session(engine) as session:
-        item_contexts = _item_contexts(session)
-        menu_contexts = _menu_contexts(session)
-        _migrate_menu_assets(session, migrator, menu_contexts)
-        _migrate_item_assets(session, migrator, item_contexts)
-        _migrate_import_jobs(session, migrator)
-
-        if args.dry_run:
-            session.rollback()
-        else:
-            session.commit()
+        failed_chunks = migrate(session, migrator, batch_size=batch_size)
 
     migrator.delete_sources()
+    migrator.report("done")
+    if failed_chunks:
+        migrator.log(f"{failed_chunks} chunk(s) had failed copies and were left unchanged; rerun to retry")
+        return 1
     return 0
 
 
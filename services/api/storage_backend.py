@@ -0,0 +1,454 @@
+"""
+Storage backends shared by routers and workers.
+
+S3 clients are expensive to build and hold their own connection pool, so one
+client per (bucket, region) is created lazily and reused by every thread.
+Backend selection follows the existing environment switches:
+
+- S3_BUCKET_NAME set      -> S3StorageBackend
+- LOCAL_UPLOADS=1         -> LocalStorageBackend rooted at the uploads dir
+- neither                 -> no backend (callers raise "Storage not configured")
+
+Tests can install an InMemoryStorageBackend with set_storage_backend().
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+MB = 1024 * 1024
+# S3 DeleteObjects accepts at most 1000 keys per request.
+DELETE_BATCH_SIZE = 1000
+
+
+class StorageBackend(ABC):
+    """Minimal object-store interface used by storage_utils and the workers."""
+
+    name = "base"
+
+    def public_url(self, key: str) -> Optional[str]:
+        """Absolute URL for a key, or None when the caller must build one from the request."""
+        return None
+
+    def presign_put(self, key: str, *, content_type: str, expires_in: int = 3600) -> Optional[str]:
+        """Direct-upload URL, or None when uploads must go through the API."""
+        return None
+
+    def presign_get(self, key: str, *, expires_in: int = 3600) -> Optional[str]:
+        return None
+
+    @abstractmethod
+    def upload_file(self, source_path: Path, key: str, *, content_type: str | None = None) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def upload_fileobj(self, fileobj: BinaryIO, key: str, *, content_type: str | None = None) -> int:
+        """Upload the rest of fileobj and return how many bytes were sent."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def put_bytes(
+        self,
+        key: str,
+        data: bytes,
+        *,
+        content_type: str | None = None,
+        cache_control: str | None = None,
+        content_disposition: str | None = None,
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_bytes(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def download_file(self, key: str, destination: Path) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def copy(self, source_key: str, destination_key: str, *, content_type: str | None = None) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_keys(self, prefix: str) -> Iterator[str]:
+        raise NotImplementedError
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete keys, returning how many were removed; missing keys are not errors."""
+        deleted = 0
+        for key in keys:
+            self.delete(key)
+            deleted += 1
+        return deleted
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every key under prefix (which must be non-empty and end with "/")."""
+        if not prefix or not prefix.endswith("/"):
+            raise ValueError("Prefix deletes need a non-empty prefix ending in '/'")
+        deleted = 0
+        batch: list[str] = []
+        for key in self.list_keys(prefix):
+            batch.append(key)
+            if len(batch) >= DELETE_BATCH_SIZE:
+                deleted += self.delete_many(batch)
+                batch = []
+        if batch:
+            deleted += self.delete_many(batch)
+        return deleted
+
+    def copy_many(
+        self,
+        pairs: Iterable[tuple[str, str]],
+        *,
+        content_type: str | None = None,
+        max_workers: int | None = None,
+    ) -> dict[tuple[str, str], Optional[Exception]]:
+        """Run server-side copies concurrently; maps each (source, destination) to its error or None."""
+        pairs = [(source, destination) for source, destination in pairs if source != destination]
+        results: dict[tuple[str, str], Optional[Exception]] = {}
+        if not pairs:
+            return results
+        workers = max_workers or max(1, _env_int("STORAGE_TRANSFER_CONCURRENCY", 8))
+
+        def _copy(pair: tuple[str, str]) -> Optional[Exception]:
+            try:
+                self.copy(pair[0], pair[1], content_type=content_type)
+            except Exception as exc:
+                return exc
+            return None
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(pairs)), thread_name_prefix="storage-copy") as pool:
+            for pair, error in zip(pairs, pool.map(_copy, pairs)):
+                results[pair] = error
+        return results
+
+
+class S3StorageBackend(StorageBackend):
+    name = "s3"
+
+    def __init__(self, bucket: str, *, region: str | None = None):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
+
+        self.bucket = bucket
+        pool_size = max(1, _env_int("STORAGE_MAX_POOL_CONNECTIONS", 32))
+        self.client = boto3.client(
+            "s3",
+            region_name=region,
+            config=Config(
+                max_pool_connections=pool_size,
+                retries={"max_attempts": 5, "mode": "standard"},
+            ),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=_env_int("STORAGE_MULTIPART_THRESHOLD_MB", 16) * MB,
+            multipart_chunksize=_env_int("STORAGE_MULTIPART_CHUNK_MB", 16) * MB,
+            max_concurrency=min(pool_size, max(1, _env_int("STORAGE_TRANSFER_CONCURRENCY", 8))),
+            use_threads=True,
+        )
+
+    def public_url(self, key: str) -> Optional[str]:
+        return f"https://{self.bucket}.s3.amazonaws.com/{key}"
+
+    def presign_put(self, key: str, *, content_type: str, expires_in: int = 3600) -> Optional[str]:
+        return self.client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": self.bucket, "Key": key, "ContentType": content_type},
+            ExpiresIn=expires_in,
+        )
+
+    def presign_get(self, key: str, *, expires_in: int = 3600) -> Optional[str]:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
+
+    def upload_file(self, source_path: Path, key: str, *, content_type: str | None = None) -> None:
+        self.client.upload_file(
+            str(source_path),
+            self.bucket,
+            key,
+            ExtraArgs={"ContentType": content_type} if content_type else {},
+            Config=self.transfer_config,
+        )
+
+    def upload_fileobj(self, fileobj: BinaryIO, key: str, *, content_type: str | None = None) -> int:
+        # The stream is passed through untouched so s3transfer can still seek
+        # it; the progress callback (called from transfer threads, negative on
+        # retried parts) does the counting.
+        sent = [0]
+        lock = threading.Lock()
+
+        def _progress(amount: int) -> None:
+            with lock:
+                sent[0] += amount
+
+        self.client.upload_fileobj(
+            fileobj,
+            self.bucket,
+            key,
+            ExtraArgs={"ContentType": content_type} if content_type else {},
+            Callback=_progress,
+            Config=self.transfer_config,
+        )
+        return sent[0]
+
+    def put_bytes(
+        self,
+        key: str,
+        data: bytes,
+        *,
+        content_type: str | None = None,
+        cache_control: str | None = None,
+        content_disposition: str | None = None,
+    ) -> None:
+        extra_args: dict[str, str] = {}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        if cache_control:
+            extra_args["CacheControl"] = cache_control
+        if content_disposition:
+            extra_args["ContentDisposition"] = content_disposition
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data, **extra_args)
+
+    def get_bytes(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+
+    def download_file(self, key: str, destination: Path) -> None:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        self.client.download_file(self.bucket, key, str(destination), Config=self.transfer_config)
+
+    def copy(self, source_key: str, destination_key: str, *, content_type: str | None = None) -> None:
+        params = {
+            "Bucket": self.bucket,
+            "Key": destination_key,
+            "CopySource": {"Bucket": self.bucket, "Key": source_key},
+        }
+        if content_type:
+            params["ContentType"] = content_type
+            params["MetadataDirective"] = "REPLACE"
+        self.client.copy_object(**params)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list_keys(self, prefix: str) -> Iterator[str]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for entry in page.get("Contents", []):
+                yield entry["Key"]
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        unique_keys = list(dict.fromkeys(key for key in keys if key))
+        deleted = 0
+        for start in range(0, len(unique_keys), DELETE_BATCH_SIZE):
+            batch = unique_keys[start:start + DELETE_BATCH_SIZE]
+            response = self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+            errors = response.get("Errors", [])
+            for error in errors[:5]:
+                print(f"[storage] delete failed for {error.get('Key')}: {error.get('Code')}")
+            deleted += len(batch) - len(errors)
+        return deleted
+
+
+class LocalStorageBackend(StorageBackend):
+    """Filesystem backend for LOCAL_UPLOADS=1; keys are confined to the root directory."""
+
+    name = "local"
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path_for(self, key: str) -> Path:
+        base = self.root.resolve()
+        target = (base / key).resolve()
+        if not str(target).startswith(str(base) + os.sep):
+            raise ValueError("Invalid upload key")
+        return target
+
+    def _writable_path(self, key: str) -> Path:
+        target = self.path_for(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        return target
+
+    def upload_file(self, source_path: Path, key: str, *, content_type: str | None = None) -> None:
+        shutil.copy2(source_path, self._writable_path(key))
+
+    def upload_fileobj(self, fileobj: BinaryIO, key: str, *, content_type: str | None = None) -> int:
+        with self._writable_path(key).open("wb") as handle:
+            shutil.copyfileobj(fileobj, handle)
+            return handle.tell()
+
+    def put_bytes(
+        self,
+        key: str,
+        data: bytes,
+        *,
+        content_type: str | None = None,
+        cache_control: str | None = None,
+        content_disposition: str | None = None,
+    ) -> None:
+        self._writable_path(key).write_bytes(data)
+
+    def get_bytes(self, key: str) -> bytes:
+        return self.path_for(key).read_bytes()
+
+    def download_file(self, key: str, destination: Path) -> None:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(self.path_for(key), destination)
+
+    def copy(self, source_key: str, destination_key: str, *, content_type: str | None = None) -> None:
+        shutil.copy2(self.path_for(source_key), self._writable_path(destination_key))
+
+    def delete(self, key: str) -> None:
+        self.path_for(key).unlink(missing_ok=True)
+
+    def list_keys(self, prefix: str) -> Iterator[str]:
+        base = self.root.resolve()
+        start = self.path_for(prefix.rstrip("/"))
+        if not start.exists():
+            return
+        for path in sorted(start.rglob("*")):
+            if path.is_file():
+                yield path.relative_to(base).as_posix()
+
+
+class InMemoryStorageBackend(StorageBackend):
+    """Dict-backed fake for tests; records content types alongside the bytes."""
+
+    name = "memory"
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.content_types: dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def _put(self, key: str, data: bytes, content_type: str | None) -> None:
+        with self._lock:
+            self.objects[key] = data
+            self.content_types[key] = content_type
+
+    def upload_file(self, source_path: Path, key: str, *, content_type: str | None = None) -> None:
+        self._put(key, Path(source_path).read_bytes(), content_type)
+
+    def upload_fileobj(self, fileobj: BinaryIO, key: str, *, content_type: str | None = None) -> int:
+        data = fileobj.read()
+        self._put(key, data, content_type)
+        return len(data)
+
+    def put_bytes(
+        self,
+        key: str,
+        data: bytes,
+        *,
+        content_type: str | None = None,
+        cache_control: str | None = None,
+        content_disposition: str | None = None,
+    ) -> None:
+        self._put(key, bytes(data), content_type)
+
+    def get_bytes(self, key: str) -> bytes:
+        with self._lock:
+            if key not in self.objects:
+                raise FileNotFoundError(key)
+            return self.objects[key]
+
+    def download_file(self, key: str, destination: Path) -> None:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(self.get_bytes(key))
+
+    def copy(self, source_key: str, destination_key: str, *, content_type: str | None = None) -> None:
+        data = self.get_bytes(source_key)
+        with self._lock:
+            resolved_type = content_type or self.content_types.get(source_key)
+        self._put(destination_key, data, resolved_type)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self.objects.pop(key, None)
+            self.content_types.pop(key, None)
+
+    def list_keys(self, prefix: str) -> Iterator[str]:
+        with self._lock:
+            keys = sorted(key for key in self.objects if key.startswith(prefix))
+        return iter(keys)
+
+
+_backend_lock = threading.Lock()
+_s3_backends: dict[tuple[str, Optional[str]], S3StorageBackend] = {}
+_local_backends: dict[Path, LocalStorageBackend] = {}
+_override: Optional[StorageBackend] = None
+
+
+def local_upload_root() -> Path:
+    return Path(__file__).resolve().parent / "uploads"
+
+
+def set_storage_backend(backend: Optional[StorageBackend]) -> None:
+    """Force every caller onto `backend` (tests); pass None to go back to env selection."""
+    global _override
+    _override = backend
+
+
+def get_s3_backend(bucket: str) -> S3StorageBackend:
+    region = os.getenv("AWS_REGION") or None
+    cache_key = (bucket, region)
+    backend = _s3_backends.get(cache_key)
+    if backend is None:
+        with _backend_lock:
+            backend = _s3_backends.get(cache_key)
+            if backend is None:
+                backend = S3StorageBackend(bucket, region=region)
+                _s3_backends[cache_key] = backend
+    return backend
+
+
+def get_storage_backend() -> Optional[StorageBackend]:
+    """Backend for the current environment, or None when storage is not configured."""
+    if _override is not None:
+        return _override
+    bucket = os.getenv("S3_BUCKET_NAME")
+    if bucket:
+        return get_s3_backend(bucket)
+    if os.getenv("LOCAL_UPLOADS") == "1":
+        root = local_upload_root()
+        backend = _local_backends.get(root)
+        if backend is None:
+            with _backend_lock:
+                backend = _local_backends.setdefault(root, LocalStorageBackend(root))
+        return backend
+    return None
+
+
+def reset_storage_backends() -> None:
+    """Drop cached clients (e.g. after credentials rotate)."""
+    with _backend_lock:
+        _s3_backends.clear()
+        _local_backends.clear()
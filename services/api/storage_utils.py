@@ -1,37 +1,62 @@
 from __future__ import annotations
 
 import os
-import shutil
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Iterable, Optional
 
-import boto3
 from botocore.exceptions import ClientError
 from fastapi import HTTPException, Request
 
+from metrics import BYTES_BUCKETS, registry as metrics_registry
+from storage_backend import LocalStorageBackend, StorageBackend, get_storage_backend, local_upload_root
 from url_utils import external_base_url, forwarded_prefix
 
 
+STORAGE_TRANSFER_BYTES_TOTAL = metrics_registry.counter(
+    "menuvium_storage_transfer_bytes_total",
+    "Bytes moved through the storage backend by direction (upload or download).",
+    ("direction",),
+)
+STORAGE_OBJECT_BYTES = metrics_registry.histogram(
+    "menuvium_storage_object_bytes",
+    "Size of individual storage uploads and downloads.",
+    ("direction",),
+    buckets=BYTES_BUCKETS,
+)
+
+
+def record_storage_transfer(direction: str, size: int) -> None:
+    STORAGE_TRANSFER_BYTES_TOTAL.inc(size, direction=direction)
+    STORAGE_OBJECT_BYTES.observe(size, direction=direction)
+
+
 def local_uploads_enabled() -> bool:
     return os.getenv("LOCAL_UPLOADS") == "1"
 
 
 def local_upload_dir() -> Path:
-    return Path(__file__).resolve().parent / "uploads"
+    return local_upload_root()
 
 
 def safe_local_path(key: str) -> Path:
-    base = local_upload_dir().resolve()
-    target = (base / key).resolve()
-    if not str(target).startswith(str(base) + os.sep):
+    try:
+        return LocalStorageBackend(local_upload_dir()).path_for(key)
+    except ValueError:
         raise HTTPException(status_code=400, detail="Invalid upload key")
-    return target
+
+
+def _require_backend() -> StorageBackend:
+    backend = get_storage_backend()
+    if backend is None:
+        raise RuntimeError("Storage not configured")
+    return backend
 
 
 def build_public_url(key: str, *, request: Request | None = None, base_url: str | None = None) -> str:
-    bucket_name = os.getenv("S3_BUCKET_NAME")
-    if bucket_name:
-        return f"https://{bucket_name}.s3.amazonaws.com/{key}"
+    backend = get_storage_backend()
+    public_url = backend.public_url(key) if backend is not None else None
+    if public_url:
+        return public_url
     if base_url:
         return f"{base_url.rstrip('/')}/uploads/{key}"
     if request is not None:
@@ -46,28 +71,23 @@ def create_upload_target(
     content_type: str,
     request: Request,
 ) -> dict:
-    bucket_name = os.getenv("S3_BUCKET_NAME")
-    if not bucket_name:
-        if local_uploads_enabled():
-            prefix = forwarded_prefix(request)
-            base = prefix or ""
-            return {
-                "upload_url": f"{base}/items/local-upload/{key}",
-                "s3_key": key,
-                "public_url": build_public_url(key, request=request),
-            }
+    backend = get_storage_backend()
+    if backend is None:
         raise HTTPException(status_code=500, detail="S3 configuration missing")
 
-    s3_client = boto3.client("s3")
     try:
-        upload_url = s3_client.generate_presigned_url(
-            "put_object",
-            Params={"Bucket": bucket_name, "Key": key, "ContentType": content_type},
-            ExpiresIn=3600,
-        )
+        upload_url = backend.presign_put(key, content_type=content_type, expires_in=3600)
     except ClientError as exc:
         print(exc)
         raise HTTPException(status_code=500, detail="Could not generate upload URL")
+    if upload_url is None:
+        prefix = forwarded_prefix(request)
+        base = prefix or ""
+        return {
+            "upload_url": f"{base}/items/local-upload/{key}",
+            "s3_key": key,
+            "public_url": build_public_url(key, request=request),
+        }
 
     return {
         "upload_url": upload_url,
@@ -76,6 +96,11 @@ def create_upload_target(
     }
 
 
+def generate_download_url(key: str, *, expires_in: int = 3600) -> str | None:
+    """Presigned GET URL, or None when the backend serves files through /uploads."""
+    return _require_backend().presign_get(key, expires_in=expires_in)
+
+
 def store_file_from_path(
     *,
     source_path: Path,
@@ -83,22 +108,21 @@ def store_file_from_path(
     content_type: str | None = None,
     base_url: str | None = None,
 ) -> str:
-    bucket_name = os.getenv("S3_BUCKET_NAME")
-    if bucket_name:
-        extra_args = {"ContentType": content_type} if content_type else None
-        boto3.client("s3").upload_file(
-            str(source_path),
-            bucket_name,
-            key,
-            ExtraArgs=extra_args or {},
-        )
-        return build_public_url(key)
-
-    if not local_uploads_enabled():
-        raise RuntimeError("Storage not configured")
-    target = safe_local_path(key)
-    target.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(source_path, target)
+    _require_backend().upload_file(source_path, key, content_type=content_type)
+    record_storage_transfer("upload", Path(source_path).stat().st_size)
+    return build_public_url(key, base_url=base_url)
+
+
+def store_fileobj(
+    *,
+    fileobj: BinaryIO,
+    key: str,
+    content_type: str | None = None,
+    base_url: str | None = None,
+) -> str:
+    """Upload from a readable stream (need not be seekable); S3 uses multipart for large bodies."""
+    size = _require_backend().upload_fileobj(fileobj, key, content_type=content_type)
+    record_storage_transfer("upload", size)
     return build_public_url(key, base_url=base_url)
 
 
@@ -110,40 +134,15 @@ def store_bytes(
     base_url: str | None = None,
     cache_control: str | None = None,
 ) -> str:
-    bucket_name = os.getenv("S3_BUCKET_NAME")
-    if bucket_name:
-        extra_args: dict[str, str] = {}
-        if content_type:
-            extra_args["ContentType"] = content_type
-        if cache_control:
-            extra_args["CacheControl"] = cache_control
-        boto3.client("s3").put_object(
-            Bucket=bucket_name,
-            Key=key,
-            Body=data,
-            **extra_args,
-        )
-        return build_public_url(key)
-
-    if not local_uploads_enabled():
-        raise RuntimeError("Storage not configured")
-    target = safe_local_path(key)
-    target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_bytes(data)
+    _require_backend().put_bytes(key, data, content_type=content_type, cache_control=cache_control)
+    record_storage_transfer("upload", len(data))
     return build_public_url(key, base_url=base_url)
 
 
 def materialize_storage_key_to_path(*, key: str, destination: Path) -> Path:
-    bucket_name = os.getenv("S3_BUCKET_NAME")
     destination.parent.mkdir(parents=True, exist_ok=True)
-    if bucket_name:
-        boto3.client("s3").download_file(bucket_name, key, str(destination))
-        return destination
-
-    if not local_uploads_enabled():
-        raise RuntimeError("Storage not configured")
-    source = safe_local_path(key)
-    shutil.copy2(source, destination)
+    _require_backend().download_file(key, destination)
+    record_storage_transfer("download", destination.stat().st_size)
     return destination
 
 
@@ -151,39 +150,67 @@ def copy_storage_key(*, source_key: str, destination_key: str, content_type: str
     if source_key == destination_key:
         return build_public_url(destination_key)
 
-    bucket_name = os.getenv("S3_BUCKET_NAME")
-    if bucket_name:
-        params = {"Bucket": bucket_name, "Key": destination_key, "CopySource": {"Bucket": bucket_name, "Key": source_key}}
-        if content_type:
-            params["ContentType"] = content_type
-            params["MetadataDirective"] = "REPLACE"
-        boto3.client("s3").copy_object(**params)
-        return build_public_url(destination_key)
-
-    if not local_uploads_enabled():
-        raise RuntimeError("Storage not configured")
-    source = safe_local_path(source_key)
-    target = safe_local_path(destination_key)
-    target.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(source, target)
+    _require_backend().copy(source_key, destination_key, content_type=content_type)
     return build_public_url(destination_key)
 
 
 def delete_storage_key_best_effort(s3_key: Optional[str]) -> None:
     if not s3_key:
         return
-    bucket_name = os.getenv("S3_BUCKET_NAME")
-    if bucket_name:
-        try:
-            boto3.client("s3").delete_object(Bucket=bucket_name, Key=s3_key)
-        except Exception:
-            pass
+    backend = get_storage_backend()
+    if backend is None:
         return
-    if local_uploads_enabled():
+    try:
+        backend.delete(s3_key)
+    except Exception:
+        pass
+
+
+def delete_storage_keys_best_effort(keys: Iterable[Optional[str]]) -> int:
+    """Batch-delete keys; errors are logged and swallowed like the single-key variant."""
+    unique_keys = list(dict.fromkeys(key for key in keys if key))
+    backend = get_storage_backend()
+    if backend is None or not unique_keys:
+        return 0
+    try:
+        return backend.delete_many(unique_keys)
+    except Exception as exc:
+        print(f"[storage] batch delete failed: {exc}")
+        return 0
+
+
+def delete_storage_prefixes_best_effort(prefixes: Iterable[str]) -> int:
+    """Delete everything under each prefix (e.g. storage_keys.menu_root()); returns the count."""
+    backend = get_storage_backend()
+    if backend is None:
+        return 0
+    deleted = 0
+    for prefix in dict.fromkeys(prefixes):
+        if not prefix:
+            continue
         try:
-            safe_local_path(s3_key).unlink(missing_ok=True)
-        except Exception:
-            pass
+            deleted += backend.delete_prefix(prefix.rstrip("/") + "/")
+        except Exception as exc:
+            print(f"[storage] prefix delete failed for {prefix}: {exc}")
+    return deleted
+
+
+def purge_storage_best_effort(*, prefixes: Iterable[str] = (), keys: Iterable[Optional[str]] = ()) -> int:
+    """Background-task entry point for teardown: prefix deletes plus stray (legacy) keys."""
+    keys = list(keys)
+    deleted = delete_storage_prefixes_best_effort(prefixes)
+    deleted += delete_storage_keys_best_effort(keys)
+    return deleted
+
+
+def copy_storage_keys(
+    pairs: Iterable[tuple[str, str]],
+    *,
+    content_type: str | None = None,
+    max_workers: int | None = None,
+) -> dict[tuple[str, str], Optional[Exception]]:
+    """Concurrent server-side copies; see StorageBackend.copy_many."""
+    return _require_backend().copy_many(pairs, content_type=content_type, max_workers=max_workers)
 
 
 def public_base_url_from_request(request: Request) -> str:
@@ -1,4 +1,5 @@
 import types
+from datetime import datetime, timedelta
 import uuid
 
 import pytest
@@ -136,3 +137,40 @@ def test_import_processed_job_allows_completed_job_without_items_metadata(
     assert body["org_id"] == str(test_org.id)
     assert body["menu_name"] == "Imported Bistro"
     assert body["items_created"] == 7
+
+
+def test_list_jobs_pages_newest_first_and_summary_omits_blobs(client: TestClient, session: Session):
+    created = datetime(2026, 1, 1, 12, 0)
+    jobs = [
+        ImportJob(
+            restaurant_name=f"Cafe {index}",
+            status="COMPLETED",
+            created_at=created + timedelta(minutes=index // 2),
+            logs='["' + "x" * 1000 + '"]',
+            metadata_json={"items_count": index},
+            created_by="admin-user-sub",
+        )
+        for index in range(5)
+    ]
+    session.add_all(jobs)
+    session.commit()
+    expected = [str(job.id) for job in sorted(jobs, key=lambda job: (job.created_at, job.id), reverse=True)]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "view": "summary", **({"cursor": cursor} if cursor else {})}
+        response = client.get("/admin/menu-importer/jobs", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert all("logs" not in job and "metadata_json" not in job for job in page)
+        seen.extend(job["id"] for job in page)
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert seen == expected
+
+    full = client.get("/admin/menu-importer/jobs", params={"limit": 2})
+    assert [job["id"] for job in full.json()] == expected[:2]
+    assert full.json()[0]["logs"].startswith('["x')
+    assert client.get("/admin/menu-importer/jobs", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -1,4 +1,5 @@
 import uuid
+from datetime import datetime, timedelta
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -591,6 +592,77 @@ def test_process_pending_video_extracts_frames_and_submits_photo_images_at_max_q
     assert captured_kwargs["is_mask"] == 1
 
 
+def test_process_pending_video_keeps_submission_when_frame_archival_fails(
+    session: Session,
+    test_item: Item,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    session.add(
+        ArCaptureAsset(
+            item_id=test_item.id,
+            kind="video",
+            position=0,
+            s3_key=f"items/ar/{test_item.id}/video/dish.mov",
+            url="https://example.com/dish.mov",
+        )
+    )
+    test_item.ar_provider = AR_PROVIDER_KIRI
+    test_item.ar_capture_mode = AR_CAPTURE_MODE_PHOTO_SCAN
+    test_item.ar_status = "processing"
+    test_item.ar_stage = "uploading_to_kiri"
+    test_item.ar_job_id = uuid.uuid4()
+    session.add(test_item)
+    session.commit()
+
+    extracted_paths = [Path(f"/tmp/frame-{index:04d}.jpg") for index in range(1, 13)]
+    stored_keys: list[str] = []
+
+    class FakeKiriClient:
+        def submit_photo_images(self, **kwargs):
+            return KiriSubmittedJob(serialize="serialize-partial-frames", calculate_type=1)
+
+    def fake_materialize_storage_key_to_path(*, key: str, destination: Path) -> Path:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(b"video")
+        return destination
+
+    def flaky_store_file_from_path(*, source_path, key, content_type=None, base_url=None):
+        if source_path.name == "frame-0003.jpg":
+            raise RuntimeError("storage unavailable")
+        stored_keys.append(key)
+        return f"https://example.com/{key}"
+
+    monkeypatch.setattr(ar_worker, "get_engine", lambda: session.get_bind())
+    monkeypatch.setattr(ar_worker, "_kiri_client", lambda: FakeKiriClient())
+    monkeypatch.setattr(ar_worker, "materialize_storage_key_to_path", fake_materialize_storage_key_to_path)
+    monkeypatch.setattr(
+        ar_worker,
+        "extract_video_frames_to_images",
+        lambda **kwargs: SimpleNamespace(
+            probe=SimpleNamespace(duration_seconds=4.0, width=1920, height=1080),
+            desired_frame_count=12,
+            frame_paths=extracted_paths,
+            used_normalized_video=False,
+        ),
+    )
+    monkeypatch.setattr(ar_worker, "store_file_from_path", flaky_store_file_from_path)
+
+    ar_worker._process_pending_item(test_item.id)
+
+    session.expire_all()
+    refreshed = session.get(Item, test_item.id)
+    assert refreshed is not None
+    assert refreshed.ar_stage == AR_STAGE_KIRI_PROCESSING
+    assert refreshed.ar_metadata_json["serialize"] == "serialize-partial-frames"
+    extraction = refreshed.ar_metadata_json["video_frame_extraction"]
+    assert [frame["index"] for frame in extraction["persisted_frames"]] == [
+        index for index in range(1, 13) if index != 3
+    ]
+    assert "frame-0003.jpg" in extraction["persist_error"]
+    # Source video plus the eleven frames that uploaded.
+    assert len(stored_keys) == 12
+
+
 def test_list_ar_debug_frames_returns_latest_persisted_frames(
     client: TestClient,
     session: Session,
@@ -646,3 +718,527 @@ def test_format_kiri_submission_error_for_video_resolution_rejection():
 
     assert "1920x1080" in message
     assert "Re-export" in message
+
+
+def test_poll_claims_are_leased_to_a_single_worker(
+    session: Session,
+    test_item: Item,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    test_item.ar_provider = AR_PROVIDER_KIRI
+    test_item.ar_status = "processing"
+    test_item.ar_stage = AR_STAGE_KIRI_PROCESSING
+    test_item.ar_metadata_json = {"serialize": "serialize-lease"}
+    test_item.ar_next_poll_at = datetime.utcnow() - timedelta(seconds=1)
+    session.add(test_item)
+    session.commit()
+
+    monkeypatch.setattr(ar_worker, "get_engine", lambda: session.get_bind())
+
+    claimed = ar_worker._claim_next_poll("worker-a")
+    assert claimed == (test_item.id, "serialize-lease")
+    assert ar_worker._claim_next_poll("worker-b") is None
+
+    ar_worker._release_lease(test_item.id, "worker-b", next_poll_delay=5)
+    session.expire_all()
+    assert session.get(Item, test_item.id).ar_lease_owner == "worker-a"
+
+    ar_worker._release_lease(test_item.id, "worker-a", next_poll_delay=5)
+    session.expire_all()
+    refreshed = session.get(Item, test_item.id)
+    assert refreshed.ar_lease_owner is None
+    assert refreshed.ar_next_poll_at > datetime.utcnow()
+    assert ar_worker._claim_next_poll("worker-b") is None
+
+
+def test_poll_claim_takes_over_expired_lease_and_skips_unsubmitted_items(
+    session: Session,
+    test_item: Item,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    now = datetime.utcnow()
+    unsubmitted = Item(
+        name="Unsubmitted",
+        price=10.0,
+        category_id=test_item.category_id,
+        ar_provider=AR_PROVIDER_KIRI,
+        ar_status="processing",
+        ar_stage=AR_STAGE_UPLOADING_TO_KIRI,
+        ar_next_poll_at=now - timedelta(seconds=30),
+    )
+    test_item.ar_provider = AR_PROVIDER_KIRI
+    test_item.ar_status = "processing"
+    test_item.ar_stage = AR_STAGE_KIRI_PROCESSING
+    test_item.ar_metadata_json = {"serialize": "serialize-expired"}
+    test_item.ar_next_poll_at = now - timedelta(seconds=1)
+    test_item.ar_lease_owner = "crashed-worker"
+    test_item.ar_lease_expires_at = now - timedelta(seconds=1)
+    session.add(unsubmitted)
+    session.add(test_item)
+    session.commit()
+
+    monkeypatch.setattr(ar_worker, "get_engine", lambda: session.get_bind())
+
+    assert ar_worker._claim_next_poll("worker-a") == (test_item.id, "serialize-expired")
+    session.expire_all()
+    assert session.get(Item, unsubmitted.id).ar_next_poll_at is None
+    assert session.get(Item, test_item.id).ar_lease_owner == "worker-a"
+
+
+def test_poll_batch_applies_concurrent_results_and_records_failures(
+    session: Session,
+    test_item: Item,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    now = datetime.utcnow()
+    failing = Item(
+        name="Failing poll",
+        price=10.0,
+        category_id=test_item.category_id,
+        ar_provider=AR_PROVIDER_KIRI,
+        ar_status="processing",
+        ar_stage=AR_STAGE_KIRI_PROCESSING,
+        ar_metadata_json={"serialize": "serialize-failing"},
+        ar_next_poll_at=now - timedelta(seconds=5),
+    )
+    test_item.ar_provider = AR_PROVIDER_KIRI
+    test_item.ar_status = "processing"
+    test_item.ar_stage = AR_STAGE_KIRI_PROCESSING
+    test_item.ar_metadata_json = {"serialize": "serialize-ok"}
+    test_item.ar_next_poll_at = now - timedelta(seconds=1)
+    session.add(failing)
+    session.add(test_item)
+    session.commit()
+
+    from kiri_client import KiriModelStatus
+
+    fetched: list[list[str]] = []
+    applied: list[tuple[str, int]] = []
+
+    def fake_fetch(serializes):
+        fetched.append(list(serializes))
+        return {
+            "serialize-failing": KiriApiError("HTTP 503"),
+            "serialize-ok": KiriModelStatus(serialize="serialize-ok", status=0),
+        }
+
+    monkeypatch.setattr(ar_worker, "get_engine", lambda: session.get_bind())
+    monkeypatch.setattr(ar_worker, "_fetch_kiri_statuses", fake_fetch)
+    monkeypatch.setattr(
+        ar_worker,
+        "handle_kiri_status_update",
+        lambda *, serialize, provider_status, source: applied.append((serialize, provider_status)) or True,
+    )
+
+    assert ar_worker._poll_next_processing_job("worker-a") is True
+
+    assert fetched == [["serialize-failing", "serialize-ok"]]
+    assert applied == [("serialize-ok", 0)]
+    session.expire_all()
+    failed = session.get(Item, failing.id)
+    assert failed.ar_metadata_json["provider_poll_errors"] == 1
+    assert "HTTP 503" in failed.ar_metadata_json["provider_message"]
+    assert failed.ar_next_poll_at > datetime.utcnow()
+    assert failed.ar_lease_owner is None
+    assert session.get(Item, test_item.id).ar_lease_owner is None
+
+
+def test_poll_batch_heartbeats_waiting_leases_while_a_model_finalizes(
+    session: Session,
+    test_item: Item,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    import time
+
+    from kiri_client import KiriModelStatus
+
+    now = datetime.utcnow()
+    items = {}
+    for serialize in ("serialize-done-a", "serialize-done-b", "serialize-running"):
+        item = Item(
+            name=serialize,
+            price=10.0,
+            category_id=test_item.category_id,
+            ar_provider=AR_PROVIDER_KIRI,
+            ar_status="processing",
+            ar_stage=AR_STAGE_KIRI_PROCESSING,
+            ar_metadata_json={"serialize": serialize},
+            ar_next_poll_at=now - timedelta(seconds=10 - len(items)),
+        )
+        session.add(item)
+        items[serialize] = item
+    session.commit()
+    waiting_id = items["serialize-done-b"].id
+
+    applied: list[str] = []
+    renewals: list[object] = []
+    real_renew = ar_worker._renew_lease
+
+    def counting_renew(item_id, worker_id):
+        renewals.append(item_id)
+        return real_renew(item_id, worker_id)
+
+    def slow_handler(*, serialize, provider_status, source):
+        applied.append(serialize)
+        if serialize == "serialize-done-a":
+            time.sleep(0.35)
+        return True
+
+    monkeypatch.setattr(ar_worker, "LEASE_SECONDS", 0.3)
+    monkeypatch.setattr(ar_worker, "get_engine", lambda: session.get_bind())
+    monkeypatch.setattr(ar_worker, "_renew_lease", counting_renew)
+    monkeypatch.setattr(ar_worker, "handle_kiri_status_update", slow_handler)
+    renewed_during_fetch: list[object] = []
+
+    def slow_fetch(serializes):
+        time.sleep(0.35)
+        renewed_during_fetch.extend(renewals)
+        return {
+            "serialize-done-a": KiriModelStatus(serialize="serialize-done-a", status=2),
+            "serialize-done-b": KiriModelStatus(serialize="serialize-done-b", status=2),
+            "serialize-running": KiriModelStatus(serialize="serialize-running", status=0),
+        }
+
+    monkeypatch.setattr(ar_worker, "_fetch_kiri_statuses", slow_fetch)
+
+    assert ar_worker._poll_next_processing_job("worker-a") is True
+
+    # Leases are kept alive while the status batch is fetched, too.
+    assert set(renewed_during_fetch) == {item.id for item in items.values()}
+    # Cheap status updates first, then finalizations, and the item queued behind
+    # the slow finalization kept its lease (renewed by the heartbeat, not just
+    # by the check right before it was applied).
+    assert applied == ["serialize-running", "serialize-done-a", "serialize-done-b"]
+    assert renewals.count(waiting_id) >= 3
+
+
+def test_status_fetch_timeout_cancels_the_batch(monkeypatch: pytest.MonkeyPatch):
+    import asyncio
+    import time
+    from concurrent.futures import TimeoutError as FutureTimeoutError
+
+    cancelled = []
+
+    class HangingClient:
+        async def get_statuses(self, serializes):
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.append(list(serializes))
+                raise
+
+    monkeypatch.setattr(ar_worker, "LEASE_SECONDS", 0.2)
+    monkeypatch.setattr(ar_worker, "_async_kiri_client", lambda: HangingClient())
+
+    with pytest.raises(FutureTimeoutError):
+        ar_worker._fetch_kiri_statuses(["serialize-slow"])
+
+    deadline = datetime.utcnow() + timedelta(seconds=2)
+    while not cancelled and datetime.utcnow() < deadline:
+        time.sleep(0.01)
+    assert cancelled == [["serialize-slow"]]
+
+
+def test_kiri_webhook_is_acknowledged_once_and_applied_by_worker(
+    client: TestClient,
+    session: Session,
+    test_item: Item,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    from models import ArProviderEvent
+
+    monkeypatch.setenv("KIRI_WEBHOOK_SECRET", "hook-secret")
+    monkeypatch.setattr(ar_worker, "get_engine", lambda: session.get_bind())
+    monkeypatch.delenv("AR_WEBHOOK_APPLY_INLINE", raising=False)
+    test_item.ar_provider = AR_PROVIDER_KIRI
+    test_item.ar_status = "processing"
+    test_item.ar_stage = AR_STAGE_KIRI_PROCESSING
+    test_item.ar_metadata_json = {"serialize": "serialize-hook"}
+    session.add(test_item)
+    session.commit()
+
+    def handler_must_not_run(**kwargs):
+        raise AssertionError("webhook requests must not apply status updates inline")
+
+    monkeypatch.setattr(ar_worker, "handle_kiri_status_update", handler_must_not_run)
+    first = client.post("/ar-jobs/kiri/webhook?token=hook-secret", json={"serialize": "serialize-hook", "status": 2})
+    again = client.post("/ar-jobs/kiri/webhook?token=hook-secret", json={"serialize": "serialize-hook", "status": 2})
+
+    assert first.status_code == 200, first.text
+    assert first.json()["queued"] is True
+    assert again.json() == {**first.json(), "queued": False}
+    assert len(session.exec(select(ArProviderEvent)).all()) == 1
+
+    # A poll worker holding the item lease defers the event instead of racing it.
+    test_item.ar_lease_owner = "poll-worker"
+    test_item.ar_lease_expires_at = datetime.utcnow() + timedelta(seconds=60)
+    session.add(test_item)
+    session.commit()
+    assert ar_worker._process_provider_events("worker-a") is True
+    session.expire_all()
+    deferred = session.exec(select(ArProviderEvent)).one()
+    assert deferred.status == "pending"
+    assert deferred.attempts == 0
+    assert deferred.available_at > datetime.utcnow()
+
+    applied: list[tuple[str, int, str]] = []
+    monkeypatch.setattr(
+        ar_worker,
+        "handle_kiri_status_update",
+        lambda *, serialize, provider_status, source: applied.append((serialize, provider_status, source)) or True,
+    )
+    refreshed = session.get(Item, test_item.id)
+    refreshed.ar_lease_owner = None
+    refreshed.ar_lease_expires_at = None
+    deferred.available_at = datetime.utcnow() - timedelta(seconds=1)
+    session.add(refreshed)
+    session.add(deferred)
+    session.commit()
+
+    assert ar_worker._process_provider_events("worker-a") is True
+    assert ar_worker._process_provider_events("worker-a") is False
+
+    assert applied == [("serialize-hook", 2, "webhook")]
+    session.expire_all()
+    processed = session.exec(select(ArProviderEvent)).one()
+    assert processed.status == "processed"
+    assert processed.matched is True
+    assert session.get(Item, test_item.id).ar_lease_owner is None
+
+
+def test_kiri_webhook_is_applied_inline_when_configured(
+    client: TestClient,
+    session: Session,
+    test_item: Item,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    from models import ArProviderEvent
+
+    monkeypatch.setenv("KIRI_WEBHOOK_SECRET", "hook-secret")
+    monkeypatch.setattr(ar_worker, "get_engine", lambda: session.get_bind())
+    monkeypatch.setenv("AR_WEBHOOK_APPLY_INLINE", "1")
+    test_item.ar_provider = AR_PROVIDER_KIRI
+    test_item.ar_status = "processing"
+    test_item.ar_stage = AR_STAGE_KIRI_PROCESSING
+    test_item.ar_metadata_json = {"serialize": "serialize-inline"}
+    session.add(test_item)
+    session.commit()
+
+    outcomes = iter([RuntimeError("storage unavailable"), True])
+    applied: list[int] = []
+
+    def flaky_handler(*, serialize, provider_status, source):
+        applied.append(provider_status)
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(ar_worker, "handle_kiri_status_update", flaky_handler)
+    # Redeliveries may carry a fresh timestamp; that must not defeat the dedupe.
+    first_body = {"serialize": "serialize-inline", "status": 0, "timestamp": 1718000000}
+    redelivered_body = {"serialize": "serialize-inline", "status": 0, "timestamp": 1718000060}
+
+    # A recorded event is acknowledged even when applying it inline failed;
+    # it stays pending and the redelivery applies it.
+    first = client.post("/ar-jobs/kiri/webhook?token=hook-secret", json=first_body)
+    assert first.status_code == 200, first.text
+    session.expire_all()
+    assert session.exec(select(ArProviderEvent)).one().status == "pending"
+
+    retried = client.post("/ar-jobs/kiri/webhook?token=hook-secret", json=redelivered_body)
+
+    assert retried.status_code == 200, retried.text
+    assert retried.json()["event_id"] == first.json()["event_id"]
+    assert applied == [0, 0]
+    session.expire_all()
+    assert session.exec(select(ArProviderEvent)).one().status == "processed"
+
+
+def test_provider_event_dedupe_keeps_repeated_statuses_apart(session: Session):
+    from ar_pipeline import record_provider_event
+
+    def deliver(status: int, **kwargs):
+        return record_provider_event(
+            session,
+            provider=AR_PROVIDER_KIRI,
+            serialize="serialize-dedupe",
+            provider_status=status,
+            **kwargs,
+        )
+
+    processing, created = deliver(0)
+    assert created is True
+    assert deliver(0) == (processing, False)
+    assert deliver(3)[1] is True
+    # Back to processing after queuing is news, not a redelivery.
+    again, created = deliver(0)
+    assert created is True and again.id != processing.id
+
+    stamped, created = deliver(0, delivery_id="1718000000")
+    assert created is True
+    assert deliver(0, delivery_id="1718000000") == (stamped, False)
+    assert deliver(0, delivery_id="1718000060")[1] is True
+
+
+def test_items_resolve_by_indexed_provider_serialize(session: Session, test_item: Item):
+    from sqlalchemy.dialects import postgresql
+
+    from ar_pipeline import item_ar_metadata_patch_statement, update_item_ar_metadata
+
+    other = Item(
+        name="Other scan",
+        price=12.0,
+        category_id=test_item.category_id,
+        ar_provider=AR_PROVIDER_KIRI,
+        ar_status="processing",
+        ar_metadata_json={"serialize": "serialize-other"},
+    )
+    test_item.ar_provider = AR_PROVIDER_KIRI
+    test_item.ar_status = "processing"
+    update_item_ar_metadata(test_item, serialize="serialize-indexed", provider_status=0)
+    session.add(other)
+    session.add(test_item)
+    session.commit()
+
+    assert other.ar_provider_serialize == "serialize-other"
+    assert ar_worker._find_item_by_serialize(session=session, serialize="serialize-indexed").id == test_item.id
+    assert ar_worker._find_item_by_serialize(session=session, serialize="serialize-other").id == other.id
+
+    update_item_ar_metadata(test_item, serialize=None)
+    session.add(test_item)
+    session.commit()
+    assert ar_worker._find_item_by_serialize(session=session, serialize="serialize-indexed") is None
+
+    sql = str(
+        item_ar_metadata_patch_statement(test_item.id, {"provider_status": 2, "provider_message": None}).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "||" in sql and " - " in sql
+
+
+def test_provider_poll_delay_backs_off_per_status_and_caps():
+    from ar_pipeline import (
+        KIRI_POLL_MAX_DELAY_SECONDS,
+        KIRI_STATUS_PROCESSING,
+        KIRI_STATUS_QUEUING,
+        next_provider_poll_delay,
+        next_provider_poll_error_delay,
+    )
+
+    first = next_provider_poll_delay(KIRI_STATUS_PROCESSING, 0)
+    third = next_provider_poll_delay(KIRI_STATUS_PROCESSING, 2)
+    assert 18 <= first <= 22
+    assert 72 <= third <= 88
+    assert next_provider_poll_delay(KIRI_STATUS_QUEUING, 0) > first * 0.9 * 1.3
+    assert next_provider_poll_delay(KIRI_STATUS_QUEUING, 50) <= KIRI_POLL_MAX_DELAY_SECONDS * 1.1
+    assert next_provider_poll_error_delay(1) < next_provider_poll_error_delay(3)
+
+
+def test_repeated_poll_status_backs_off_and_webhook_resets_schedule(
+    session: Session,
+    test_item: Item,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    from ar_pipeline import KIRI_STATUS_PROCESSING
+
+    test_item.ar_provider = AR_PROVIDER_KIRI
+    test_item.ar_status = "processing"
+    test_item.ar_stage = AR_STAGE_KIRI_PROCESSING
+    test_item.ar_metadata_json = {"serialize": "serialize-backoff", "provider_status": KIRI_STATUS_PROCESSING}
+    session.add(test_item)
+    session.commit()
+
+    monkeypatch.setattr(ar_worker, "get_engine", lambda: session.get_bind())
+
+    def next_poll_in_seconds() -> float:
+        session.expire_all()
+        refreshed = session.get(Item, test_item.id)
+        return (refreshed.ar_next_poll_at - datetime.utcnow()).total_seconds()
+
+    for _ in range(3):
+        ar_worker.handle_kiri_status_update(
+            serialize="serialize-backoff",
+            provider_status=KIRI_STATUS_PROCESSING,
+            source="poll",
+        )
+    assert next_poll_in_seconds() > 100
+    assert get_item_ar_metadata(session.get(Item, test_item.id))["provider_poll_attempt"] == 3
+
+    ar_worker.handle_kiri_status_update(
+        serialize="serialize-backoff",
+        provider_status=KIRI_STATUS_PROCESSING,
+        source="webhook",
+    )
+    assert next_poll_in_seconds() < 25
+    assert get_item_ar_metadata(session.get(Item, test_item.id))["provider_poll_attempt"] == 0
+
+
+def test_finalize_uploads_usdz_member_without_unpacking_archive(
+    session: Session,
+    test_item: Item,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    import io
+    import zipfile
+
+    from storage_backend import InMemoryStorageBackend, set_storage_backend
+    from storage_keys import item_ar_current_usdz_key
+
+    archive_buffer = io.BytesIO()
+    with zipfile.ZipFile(archive_buffer, "w") as archive:
+        archive.writestr("textures/albedo.png", b"png" * 1000)
+        archive.writestr("model/scan.usdz", b"usdz-bytes")
+    archive_bytes = archive_buffer.getvalue()
+
+    class FakeDownload:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+        def raise_for_status(self):
+            return None
+
+        def iter_content(self, chunk_size):
+            for start in range(0, len(archive_bytes), 64):
+                yield archive_bytes[start:start + 64]
+
+    class FakeKiriClient:
+        def get_model_zip(self, *, serialize):
+            return SimpleNamespace(serialize=serialize, model_url="https://kiri.example/model.zip")
+
+    test_item.ar_provider = AR_PROVIDER_KIRI
+    test_item.ar_status = "processing"
+    test_item.ar_stage = AR_STAGE_KIRI_PROCESSING
+    test_item.ar_job_id = uuid.uuid4()
+    session.add(test_item)
+    session.commit()
+
+    backend = InMemoryStorageBackend()
+    set_storage_backend(backend)
+    monkeypatch.setattr(ar_worker, "get_engine", lambda: session.get_bind())
+    monkeypatch.setattr(ar_worker, "_kiri_client", lambda: FakeKiriClient())
+    monkeypatch.setattr(ar_worker.requests, "get", lambda url, stream, timeout: FakeDownload())
+    monkeypatch.setattr(
+        zipfile.ZipFile,
+        "extractall",
+        lambda self, *args, **kwargs: (_ for _ in ()).throw(AssertionError("archive should not be unpacked")),
+    )
+    try:
+        ar_worker._finalize_successful_kiri_job(test_item.id, serialize="serialize-final", source="poll")
+    finally:
+        set_storage_backend(None)
+
+    session.expire_all()
+    refreshed = session.get(Item, test_item.id)
+    org_id = _org_id_for_item(session, refreshed)
+    current_key = item_ar_current_usdz_key(org_id, refreshed.id)
+    assert refreshed.ar_stage == AR_STAGE_CONVERSION_QUEUED
+    assert refreshed.ar_model_usdz_s3_key == current_key
+    assert backend.objects[current_key] == b"usdz-bytes"
+    metadata = get_item_ar_metadata(refreshed)
+    assert backend.objects[metadata["provider_usdz_s3_key"]] == b"usdz-bytes"
+    assert backend.objects[metadata["provider_model_zip_s3_key"]] == archive_bytes
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from ar_video_scheduler import MB, VideoJobScheduler
+
+
+def _run_in_thread(scheduler: VideoJobScheduler, job_id: str, events: list[str], release: threading.Event, **kwargs):
+    def _run():
+        with scheduler.admit(job_id, **kwargs):
+            events.append(f"start:{job_id}")
+            release.wait(timeout=5)
+        events.append(f"end:{job_id}")
+
+    thread = threading.Thread(target=_run)
+    thread.start()
+    return thread
+
+
+def _wait_until(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.01)
+
+
+def test_scheduler_caps_running_jobs_and_reports_queue_depth():
+    scheduler = VideoJobScheduler(max_jobs=1, scratch_budget_bytes=10 * MB, worker_cores=8)
+    assert scheduler.threads_per_job() == 8
+    events: list[str] = []
+    release_first = threading.Event()
+    release_second = threading.Event()
+    reported: list[int] = []
+
+    first = _run_in_thread(scheduler, "a", events, release_first)
+    _wait_until(lambda: "start:a" in events)
+    second = _run_in_thread(scheduler, "b", events, release_second, on_wait=reported.append)
+    _wait_until(lambda: scheduler.snapshot()["queued"] == 1)
+
+    assert scheduler.snapshot()["running"] == 1
+    assert reported == [1]
+    release_first.set()
+    _wait_until(lambda: "start:b" in events)
+    release_second.set()
+    first.join()
+    second.join()
+
+    assert events == ["start:a", "end:a", "start:b", "end:b"]
+    assert scheduler.snapshot()["completed"] == 2
+
+
+def test_scheduler_holds_jobs_that_exceed_scratch_budget():
+    scheduler = VideoJobScheduler(max_jobs=4, scratch_budget_bytes=3 * MB, worker_cores=8)
+    assert scheduler.threads_per_job() == 2
+    events: list[str] = []
+    release = threading.Event()
+
+    big = _run_in_thread(scheduler, "big", events, release, scratch_bytes=5 * MB)
+    _wait_until(lambda: "start:big" in events)
+    small = _run_in_thread(scheduler, "small", events, release, scratch_bytes=1 * MB)
+    _wait_until(lambda: scheduler.snapshot()["queued"] == 1)
+    assert "start:small" not in events
+
+    release.set()
+    big.join()
+    small.join()
+    assert events.index("end:big") < events.index("start:small")
+    assert scheduler.snapshot()["scratch_reserved_bytes"] == 0
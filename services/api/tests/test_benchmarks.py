@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from benchmarks import importer_pipeline
+from benchmarks.harness import compare_reports, load_report, write_report
+from benchmarks.public_menu import main, run_suite
+from benchmarks.synthetic import MenuShape
+
+
+TINY = MenuShape(categories=2, items_per_category=3, option_groups_per_item=1, options_per_group=2, seed=7)
+
+
+def test_public_menu_suite_runs_end_to_end_and_round_trips_json(tmp_path: Path):
+    report = run_suite(shape=TINY, iterations=2, http_requests=4, concurrency=2)
+
+    assert report["config"]["rows"]["items"] == 6
+    assert set(report["results"]) == {
+        "get_public_menu",
+        "get_public_menu_compact",
+        "list_categories",
+        "is_visible_with_rules_x250",
+        "menu_read_model_validate",
+        "http_get_public_menu",
+        "http_get_public_menu_compact",
+        "http_list_categories",
+    }
+    assert report["results"]["http_get_public_menu"]["extra"]["statuses"] == {"200": 4}
+    assert report["results"]["http_get_public_menu_compact"]["extra"]["statuses"] == {"200": 4}
+
+    path = tmp_path / "bench.json"
+    write_report(path, report)
+    assert load_report(path) == json.loads(json.dumps(report))
+
+
+def test_baseline_comparison_flags_median_regressions(tmp_path: Path):
+    baseline = {"results": {"get_public_menu": {"median_ms": 10.0}, "list_categories": {"median_ms": 10.0}}}
+    current = {"results": {"get_public_menu": {"median_ms": 13.0}, "list_categories": {"median_ms": 11.0}}}
+
+    regressions = compare_reports(current, baseline, tolerance=0.2)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("get_public_menu")
+
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"results": {"get_public_menu": {"median_ms": 1e-6}}}))
+    assert main(["--preset", "small", "--iterations", "1", "--http-requests", "0", "--baseline", str(path)]) == 1
+
+
+def test_importer_pipeline_replays_demo_menu_offline():
+    report = importer_pipeline.run_suite(cassettes=[], runs=1, latency_scale=0)
+
+    result = report["results"]["import_demo_menu"]
+    assert result["extra"]["status"] == "COMPLETED"
+    assert result["extra"]["items"] == 8
+    assert result["extra"]["replay_misses"] == []
+    assert {"stage:extract_menu", "stage:dish_stages", "dish:enhance"} <= set(result["extra"]["stages_ms"])
+    assert result["extra"]["peak_memory_mb"] > 0
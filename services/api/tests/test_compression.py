@@ -0,0 +1,134 @@
+import gzip
+
+import brotli
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from compression import (
+    COMPRESSION_CACHE_TOTAL,
+    CompressionMiddleware,
+    PrecompressedCache,
+    etag_matches,
+    negotiate_encoding,
+)
+
+
+MENU_JSON = b'{"categories":[' + b",".join(b'{"name":"Dish %d","price":12.5}' % index for index in range(200)) + b"]}"
+
+
+def _app(cache: PrecompressedCache) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache=cache, cache_paths=("/menus/public/",))
+
+    @app.get("/menus/public/{menu_id}")
+    def public_menu(menu_id: str):
+        return Response(content=MENU_JSON, media_type="application/json")
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/tagged")
+    def tagged():
+        return Response(content=MENU_JSON, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/photo")
+    def photo():
+        return Response(content=b"\x89PNG" + b"\0" * 5000, media_type="image/png")
+
+    @app.get("/export")
+    def export():
+        def chunks():
+            for index in range(50):
+                yield b"line %d of a long text export\n" % index
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+def test_negotiate_encoding_honours_q_values_and_brotli_availability():
+    assert negotiate_encoding("gzip, deflate, br", brotli_available=True) == "br"
+    assert negotiate_encoding("gzip, deflate, br", brotli_available=False) == "gzip"
+    assert negotiate_encoding("br;q=0.5, gzip", brotli_available=True) == "gzip"
+    assert negotiate_encoding("*", brotli_available=False) == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity", brotli_available=False) is None
+    assert negotiate_encoding("deflate", brotli_available=True) is None
+
+
+def test_json_is_compressed_above_threshold_and_cached_per_body():
+    cache = PrecompressedCache(max_entries=8)
+    client = TestClient(_app(cache))
+    hits_before = COMPRESSION_CACHE_TOTAL.value(result="hit")
+
+    first = client.get("/menus/public/a", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/menus/public/b", headers={"Accept-Encoding": "gzip"})
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["vary"] == "Accept-Encoding"
+    assert int(first.headers["content-length"]) < len(MENU_JSON) // 4
+    assert first.content == second.content == MENU_JSON
+    assert len(cache) == 1
+    assert COMPRESSION_CACHE_TOTAL.value(result="hit") == hits_before + 1
+
+    identity = client.get("/menus/public/a", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.content == MENU_JSON
+
+
+def test_small_and_binary_responses_pass_through():
+    client = TestClient(_app(PrecompressedCache(max_entries=8)))
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"] == "Accept-Encoding"
+    photo = client.get("/photo", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in photo.headers
+    assert "vary" not in photo.headers
+
+
+def test_streamed_bodies_are_compressed_incrementally():
+    client = TestClient(_app(PrecompressedCache(max_entries=8)))
+
+    with client.stream("GET", "/export", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw) == b"".join(b"line %d of a long text export\n" % index for index in range(50))
+
+
+def test_brotli_round_trips_whole_and_streamed_bodies():
+    cache = PrecompressedCache(max_entries=8)
+    client = TestClient(_app(cache))
+    headers = {"Accept-Encoding": "gzip, deflate, br"}
+
+    with client.stream("GET", "/menus/public/a", headers=headers) as whole:
+        raw = b"".join(whole.iter_raw())
+    assert whole.headers["content-encoding"] == "br"
+    assert int(whole.headers["content-length"]) == len(raw) < len(MENU_JSON) // 4
+    assert brotli.decompress(raw) == MENU_JSON
+    assert client.get("/menus/public/b", headers=headers).content == MENU_JSON
+    assert len(cache) == 1
+
+    with client.stream("GET", "/export", headers=headers) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(raw) == b"".join(b"line %d of a long text export\n" % index for index in range(50))
+
+
+def test_compressed_representations_get_weak_etags():
+    client = TestClient(_app(PrecompressedCache(max_entries=8)))
+
+    gzipped = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/tagged", headers={"Accept-Encoding": "identity"})
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == 'W/"v1"'
+    assert identity.headers["etag"] == '"v1"'
+    assert etag_matches('W/"v1"', '"v1"')
+    assert etag_matches('"v0", W/"v1"', '"v1"')
+    assert etag_matches("*", '"v1"')
+    assert not etag_matches('"v0"', '"v1"')
+    assert not etag_matches(None, '"v1"')
@@ -1,3 +1,5 @@
+import pytest
+
 from kiri_client import KiriApiError, KiriClient
 
 
@@ -91,3 +93,122 @@ def test_parse_response_http_error_with_success_message_is_not_reported_as_succe
         assert str(exc) != "success"
     else:
         raise AssertionError("Expected KiriApiError for HTTP 502 response")
+
+
+def test_submit_images_streams_frames_and_retries_when_the_connection_cannot_open(tmp_path, monkeypatch):
+    import requests
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+    import kiri_client
+
+    frames = []
+    for index in range(3):
+        frame = tmp_path / f"frame-{index:04d}.jpg"
+        frame.write_bytes(bytes([index + 1]) * 20000)
+        frames.append(frame)
+
+    bodies: list[bytes] = []
+
+    class FakeSession:
+        def __init__(self):
+            self.calls = 0
+
+        def post(self, url, *, data, headers, timeout):
+            self.calls += 1
+            assert headers["Content-Type"].startswith("multipart/form-data; boundary=")
+            if self.calls == 1:
+                reason = NewConnectionError(None, "Failed to establish a new connection")
+                raise requests.ConnectionError(MaxRetryError(None, url, reason))
+            body = b""
+            while True:
+                block = data.read(8192)
+                if not block:
+                    break
+                body += block
+            assert len(body) == len(data)
+            bodies.append(body)
+            return FakeResponse(
+                status_code=200,
+                payload={"ok": True, "code": 0, "msg": "success", "data": {"serialize": "s-1", "calculateType": 2}},
+            )
+
+    monkeypatch.setattr(kiri_client.time, "sleep", lambda seconds: None)
+    client = KiriClient(api_key="test-key")
+    client.session = FakeSession()
+    progress: list[tuple[int, int]] = []
+
+    submitted = client.submit_featureless_images(
+        image_paths=frames,
+        file_format="usdz",
+        progress_callback=lambda sent, total: progress.append((sent, total)),
+    )
+
+    assert submitted.serialize == "s-1"
+    assert client.session.calls == 2
+    assert bodies[0].count(b'name="imagesFiles"') == 3
+    assert bytes([3]) * 20000 in bodies[0]
+    assert progress[-1][0] == progress[-1][1] == len(bodies[0])
+
+
+def test_submit_is_not_retried_after_the_upload_started(tmp_path, monkeypatch):
+    import requests
+
+    import kiri_client
+
+    frame = tmp_path / "frame-0001.jpg"
+    frame.write_bytes(b"\xff" * 20000)
+
+    class ResettingSession:
+        calls = 0
+
+        def post(self, url, *, data, headers, timeout):
+            self.calls += 1
+            data.read(5000)
+            raise requests.ConnectionError("connection reset by peer")
+
+    monkeypatch.setattr(kiri_client.time, "sleep", lambda seconds: None)
+    client = KiriClient(api_key="test-key")
+    client.session = ResettingSession()
+
+    with pytest.raises(requests.ConnectionError):
+        client.submit_featureless_images(image_paths=[frame], file_format="usdz")
+    assert client.session.calls == 1
+
+
+def test_async_status_batch_retries_rate_limits_and_reports_errors_per_job():
+    import asyncio
+
+    import httpx
+
+    from kiri_client import AsyncKiriClient, KiriModelStatus
+
+    attempts: dict[str, int] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        serialize = request.url.params["serialize"]
+        attempts[serialize] = attempts.get(serialize, 0) + 1
+        assert request.headers["Authorization"] == "Bearer test-key"
+        if serialize == "busy" and attempts[serialize] == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"}, json={"ok": False, "code": 429})
+        if serialize == "gone":
+            return httpx.Response(200, json={"ok": False, "code": 2001, "msg": "serialize not found"})
+        if serialize == "broken":
+            return httpx.Response(200, json={"ok": True, "code": 0, "data": {"serialize": serialize}})
+        return httpx.Response(200, json={"ok": True, "code": 0, "data": {"serialize": serialize, "status": 2}})
+
+    async def run():
+        async with AsyncKiriClient(
+            api_key="test-key",
+            rate_per_second=1000,
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            return await client.get_statuses(["ready", "busy", "gone", "broken", "ready"], concurrency=2)
+
+    results = asyncio.run(run())
+
+    assert list(results) == ["ready", "busy", "gone", "broken"]
+    assert results["ready"] == KiriModelStatus(serialize="ready", status=2)
+    assert results["busy"] == KiriModelStatus(serialize="busy", status=2)
+    assert isinstance(results["gone"], KiriApiError)
+    assert isinstance(results["broken"], KiriApiError)
+    assert attempts == {"ready": 1, "busy": 2, "gone": 1, "broken": 1}
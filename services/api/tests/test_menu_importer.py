@@ -253,3 +253,216 @@ Coffee 3.50
         # Check that items have names and prices
         names = [item.name for item in result.categories[0].items]
         assert "Spring Rolls" in names or any("Spring" in n for n in names)
+
+
+class TestAIChunker:
+    """Tests for importer.ai_chunker chunking, caching and merging."""
+
+    def test_split_menu_text_keeps_short_text_whole(self):
+        from importer.ai_chunker import split_menu_text
+
+        text = "STARTERS\nSoup 5.00\nSalad 7.00"
+        assert split_menu_text(text, max_chars=1000) == [text]
+
+    def test_split_menu_text_breaks_on_category_headers(self):
+        from importer.ai_chunker import split_menu_text
+
+        starters = "STARTERS\n" + "\n".join(f"Starter {i} 5.00" for i in range(20))
+        mains = "MAINS\n" + "\n".join(f"Main {i} 15.00" for i in range(20))
+        chunks = split_menu_text(f"{starters}\n{mains}", max_chars=len(starters) + 10)
+
+        assert len(chunks) == 2
+        assert chunks[0].startswith("STARTERS")
+        assert chunks[1].startswith("MAINS")
+        assert "Main 0" not in chunks[0]
+
+    def test_split_menu_text_bounds_oversized_sections(self):
+        from importer.ai_chunker import split_menu_text
+
+        text = "\n".join(f"Dish number {i} 9.99" for i in range(200))
+        chunks = split_menu_text(text, max_chars=500)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 500 for chunk in chunks)
+        assert "\n".join(chunks).count("Dish number") == 200
+
+    def test_chunk_items_does_not_split_categories(self):
+        from importer.ai_chunker import chunk_items
+
+        items = (
+            [{"idx": i, "category": "Starters"} for i in range(3)]
+            + [{"idx": 3 + i, "category": "Mains"} for i in range(3)]
+            + [{"idx": 6 + i, "category": "Desserts"} for i in range(7)]
+        )
+        chunks = chunk_items(items, max_items=5)
+
+        assert [[item["idx"] for item in chunk] for chunk in chunks] == [
+            [0, 1, 2],
+            [3, 4, 5],
+            [6, 7, 8, 9, 10],
+            [11, 12],
+        ]
+
+    def test_chat_json_caches_by_model_and_prompt(self):
+        import asyncio
+        from types import SimpleNamespace
+        from importer.ai_chunker import chat_json, clear_response_cache
+
+        calls = []
+
+        class FakeCompletions:
+            async def create(self, **kwargs):
+                calls.append(kwargs)
+                return SimpleNamespace(
+                    choices=[SimpleNamespace(message=SimpleNamespace(content='{"ok": true}'))],
+                    usage=SimpleNamespace(total_tokens=42),
+                )
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+        clear_response_cache()
+
+        first = asyncio.run(chat_json(client, "prompt", model="m", temperature=0.1, timeout=5))
+        second = asyncio.run(chat_json(client, "prompt", model="m", temperature=0.1, timeout=5))
+        other_model = asyncio.run(chat_json(client, "prompt", model="m2", temperature=0.1, timeout=5))
+
+        assert first == ({"ok": True}, 42)
+        assert second == ({"ok": True}, 0)
+        assert other_model == ({"ok": True}, 42)
+        assert len(calls) == 2
+        clear_response_cache()
+
+    def test_merge_parsed_categories_is_ordered_and_deduplicated(self):
+        from importer.menu_extractor import ParsedCategory, ParsedItem, _merge_parsed_categories
+
+        merged = _merge_parsed_categories([
+            [ParsedCategory(name="Mains", items=[ParsedItem(name="Steak", price=30.0)])],
+            [
+                ParsedCategory(name="mains", items=[
+                    ParsedItem(name="Steak", price=30.0),
+                    ParsedItem(name="Fish", price=25.0),
+                ]),
+                ParsedCategory(name="Desserts", items=[ParsedItem(name="Cake", price=8.0)]),
+            ],
+        ])
+
+        assert [cat.name for cat in merged] == ["Mains", "Desserts"]
+        assert [item.name for item in merged[0].items] == ["Steak", "Fish"]
+
+
+class TestImporterDishStages:
+    """Tests for the overlapped search → enhance → zip stages in importer.worker."""
+
+    def test_dish_stages_stream_images_into_zip(self, monkeypatch):
+        import asyncio
+        import io
+        import zipfile
+        from importer import worker
+        from importer.menu_extractor import ParsedCategory, ParsedItem
+        from importer.zipper import ZipBuilder
+
+        async def fake_find_dish_image(dish_name, **kwargs):
+            if dish_name == "Soup":
+                return None
+            return {"data": f"raw-{dish_name}".encode(), "ext": ".jpg", "source": "website"}
+
+        async def fake_enhance_image(data, filename, log_fn=None):
+            return b"webp-" + data
+
+        monkeypatch.setattr(worker, "find_dish_image", fake_find_dish_image)
+        monkeypatch.setattr(worker, "enhance_image", fake_enhance_image)
+
+        category = ParsedCategory(
+            name="Mains",
+            items=[ParsedItem(name="Steak"), ParsedItem(name="Soup"), ParsedItem(name="Fish")],
+        )
+        all_items = [(category, item) for item in category.items]
+        counters = worker._StageCounters(total_items=len(all_items))
+        builder = ZipBuilder("Test Bistro")
+
+        async def run():
+            async def style():
+                return "style", 0
+
+            style_task = asyncio.create_task(style())
+            await worker._run_dish_stages(
+                all_items,
+                website_url="https://bistro.test",
+                restaurant_name="Test Bistro",
+                page_urls=["https://bistro.test"],
+                style_task=style_task,
+                zip_builder=builder,
+                counters=counters,
+                report=lambda: None,
+                log=lambda msg: None,
+            )
+
+        asyncio.run(run())
+        zip_data = builder.finish("{}")
+
+        with zipfile.ZipFile(io.BytesIO(zip_data)) as zf:
+            names = set(zf.namelist())
+            assert zf.read("test-bistro/images/dish_001.webp") == b"webp-raw-Steak"
+        assert names == {
+            "test-bistro/manifest.json",
+            "test-bistro/images/dish_001.webp",
+            "test-bistro/images/dish_003.webp",
+        }
+        assert [item.image_filename for item in category.items] == ["dish_001.webp", None, "dish_003.webp"]
+        assert (counters.searched, counters.images_found, counters.enhanced, counters.zipped) == (3, 2, 2, 2)
+        assert counters.progress() == 80
+
+
+class TestReplay:
+    """Tests for importer.replay cassettes"""
+
+    def test_recorded_calls_replay_offline(self, tmp_path, monkeypatch):
+        import asyncio
+        import httpx
+        import openai
+        import pytest
+        from types import SimpleNamespace
+        from importer import replay, utils
+        from importer.utils import fetch_url_text
+
+        async def live_fetch(url, *, timeout, max_retries, headers):
+            status = 404 if url.endswith("/missing") else 200
+            request = httpx.Request("GET", url)
+            response = httpx.Response(status, text=f"page {url}", headers={"content-type": "text/html"}, request=request)
+            if status >= 400:
+                raise httpx.HTTPStatusError("not found", request=request, response=response)
+            return response
+
+        class LiveCompletions:
+            async def create(self, **kwargs):
+                message = SimpleNamespace(content='{"style": "live"}')
+                return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=SimpleNamespace(total_tokens=9))
+
+        class LiveClient:
+            def __init__(self, **kwargs):
+                self.chat = SimpleNamespace(completions=LiveCompletions())
+
+        monkeypatch.setattr(utils, "_fetch_url", live_fetch)
+        monkeypatch.setattr(openai, "AsyncOpenAI", LiveClient)
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-real")
+
+        async def calls():
+            text = await fetch_url_text("https://bistro.test/menu")
+            with pytest.raises(httpx.HTTPStatusError):
+                await fetch_url_text("https://bistro.test/missing")
+            client = openai.AsyncOpenAI(api_key="sk-real")
+            response = await client.chat.completions.create(model="m", messages=[{"role": "user", "content": "p"}])
+            return text, response.choices[0].message.content, response.usage.total_tokens
+
+        cassette = replay.Cassette(tmp_path / "bistro")
+        with replay.use_cassette(cassette, mode=replay.MODE_RECORD):
+            recorded = asyncio.run(calls())
+
+        monkeypatch.setattr(utils, "_fetch_url", None)
+        loaded = replay.Cassette.load(tmp_path / "bistro")
+        assert loaded.meta["env"]["OPENAI_API_KEY"] == "replay"
+        with replay.use_cassette(loaded, latency_scale=0):
+            assert asyncio.run(calls()) == recorded == ("page https://bistro.test/menu", '{"style": "live"}', 9)
+            with pytest.raises(httpx.ConnectError):
+                asyncio.run(fetch_url_text("https://bistro.test/other"))
+        assert loaded.stats.misses == ["fetch:https://bistro.test/other"]
+        assert utils._fetch_url is None
@@ -3,12 +3,13 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 import uuid
+from datetime import time
 
 import routers.menus as menu_routes
 from main import app
 from database import get_session
 from dependencies import get_current_user
-from models import Menu, Category, Item, Organization
+from models import Allergen, Menu, Category, DietaryTag, Item, ItemPhoto, Organization, VisibilityRule
 from storage_keys import menu_qr_current_key
 
 
@@ -126,6 +127,33 @@ class TestPublicMenuEndpoint:
         assert len(data["categories"]) == 1
         assert data["categories"][0]["name"] == "Appetizers"
 
+    def test_get_public_menu_hides_items_excluded_by_visibility_rules(
+        self,
+        client: TestClient,
+        session: Session,
+        test_menu: Menu,
+        test_category: Category,
+        test_item: Item,
+    ):
+        hidden = Item(name="Late Special", price=12.0, position=1, category_id=test_category.id)
+        session.add(hidden)
+        session.add(
+            VisibilityRule(
+                item_id=hidden.id,
+                kind="exclude",
+                start_time_local=time(0, 0),
+                end_time_local=time(23, 59, 59, 999999),
+            )
+        )
+        session.commit()
+
+        response = client.get(f"/menus/public/{test_menu.id}")
+
+        assert response.status_code == 200
+        assert [item["name"] for item in response.json()["categories"][0]["items"]] == ["Spring Rolls"]
+        session.expire_all()
+        assert session.get(Item, hidden.id).category_id == test_category.id
+
     def test_get_public_menu_not_found(self, client: TestClient):
         """Test 404 for non-existent menu."""
         fake_id = str(uuid.uuid4())
@@ -147,6 +175,55 @@ class TestPublicMenuEndpoint:
         # Depending on implementation, this might be 404 or 403
         assert response.status_code in [403, 404]
 
+    def test_get_public_menu_compact_encodes_tags_once_and_omits_unused_fields(
+        self,
+        client: TestClient,
+        session: Session,
+        test_menu: Menu,
+        test_category: Category,
+        test_item: Item,
+    ):
+        spicy = DietaryTag(name="Spicy", icon="🌶")
+        nuts = Allergen(name="Contains Nuts")
+        second = Item(name="Satay", price=9.0, position=1, category_id=test_category.id, is_sold_out=True)
+        test_item.dietary_tags = [spicy]
+        second.dietary_tags = [spicy]
+        second.allergens = [nuts]
+        test_menu.show_item_images = False
+        session.add_all([test_item, second, test_menu])
+        session.add(ItemPhoto(s3_key="photos/satay.jpg", url="/uploads/photos/satay.jpg", item_id=second.id))
+        session.commit()
+
+        response = client.get(f"/menus/public/{test_menu.id}/compact")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["dietary_tags"] == [{"id": str(spicy.id), "name": "Spicy", "icon": "🌶"}]
+        assert data["allergens"] == [{"id": str(nuts.id), "name": "Contains Nuts"}]
+        first, satay = data["categories"][0]["items"]
+        assert satay == {
+            "id": str(second.id),
+            "name": "Satay",
+            "price": 9.0,
+            "is_sold_out": True,
+            "dietary_tags": [0],
+            "allergens": [0],
+        }
+        assert "is_sold_out" not in first and "ar" not in first and "photos" not in first
+        assert "qr_url" not in data and "org_id" not in data
+
+        projected = client.get(f"/menus/public/{test_menu.id}/compact", params={"fields": "name,price"})
+        assert projected.json()["categories"][0]["items"][1] == {"id": str(second.id), "name": "Satay", "price": 9.0}
+        assert "dietary_tags" not in projected.json()
+
+        cached = client.get(
+            f"/menus/public/{test_menu.id}/compact",
+            params={"fields": "name,price"},
+            headers={"If-None-Match": projected.headers["etag"]},
+        )
+        assert cached.status_code == 304
+        assert client.get(f"/menus/public/{test_menu.id}/compact", params={"fields": "name,secret"}).status_code == 400
+
 
 class TestItemEndpoints:
     """Tests for item CRUD endpoints."""
@@ -213,6 +290,58 @@ class TestCategoryEndpoints:
         assert categories[1].name == "First"
         assert categories[2].name == "Second"
 
+    def test_list_categories_pages_by_rank_with_item_count_summary(
+        self,
+        client: TestClient,
+        session: Session,
+        test_menu: Menu,
+        test_category: Category,
+        test_item: Item,
+    ):
+        session.add_all([Category(name=f"Extra {rank}", rank=rank, menu_id=test_menu.id) for rank in (1, 1, 2)])
+        session.commit()
+
+        first = client.get(f"/categories/{test_menu.id}", params={"view": "summary", "limit": 2})
+        second = client.get(
+            f"/categories/{test_menu.id}",
+            params={"view": "summary", "limit": 2, "cursor": first.headers["x-next-cursor"]},
+        )
+
+        assert first.status_code == second.status_code == 200
+        page = first.json() + second.json()
+        assert [category["rank"] for category in page] == [0, 1, 1, 2]
+        assert page[0] == {
+            "id": str(test_category.id),
+            "name": "Appetizers",
+            "rank": 0,
+            "menu_id": str(test_menu.id),
+            "item_count": 1,
+        }
+        assert "x-next-cursor" not in second.headers
+        full = client.get(f"/categories/{test_menu.id}")
+        assert len(full.json()) == 4 and full.json()[0]["items"][0]["name"] == "Spring Rolls"
+
+
+class TestMenuListing:
+    """Tests for the org menu listing."""
+
+    def test_list_menus_pages_and_summarizes(self, client: TestClient, session: Session, test_menu: Menu):
+        extra = Menu(name="Dinner Menu", org_id=test_menu.org_id, title_design_config={"font": "serif"})
+        session.add(extra)
+        session.commit()
+
+        first = client.get("/menus/", params={"org_id": str(test_menu.org_id), "limit": 1, "view": "summary"})
+        second = client.get(
+            "/menus/",
+            params={"org_id": str(test_menu.org_id), "limit": 1, "view": "summary", "cursor": first.headers["x-next-cursor"]},
+        )
+
+        assert [menu["name"] for menu in first.json() + second.json()] == ["Lunch Menu", "Dinner Menu"]
+        assert "title_design_config" not in second.json()[0] and "qr_url" not in second.json()[0]
+        assert "x-next-cursor" not in second.headers
+        full = client.get("/menus/", params={"org_id": str(test_menu.org_id)})
+        assert full.json()[1]["title_design_config"] == {"font": "serif"}
+
 
 class TestMenuQrEndpoints:
     def test_get_menu_qr_ignores_legacy_logo_variant(
@@ -221,6 +350,9 @@ class TestMenuQrEndpoints:
         test_menu: Menu,
         monkeypatch: pytest.MonkeyPatch,
     ):
+        from qr_codes import qr_render_cache
+
+        qr_render_cache.clear()
         monkeypatch.setattr(
             menu_routes,
             "_render_standard_qr_png",
@@ -237,6 +369,68 @@ class TestMenuQrEndpoints:
         assert response.headers["content-type"] == "image/png"
         assert response.headers["content-disposition"].endswith('Lunch Menu-qr.png"')
 
+    def test_menu_qr_renders_locally_and_serves_repeat_requests_from_cache(
+        self,
+        client: TestClient,
+        session: Session,
+        test_menu: Menu,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        import io
+        from datetime import datetime
+
+        from PIL import Image
+
+        from qr_codes import qr_render_cache
+        from storage_backend import InMemoryStorageBackend, set_storage_backend
+
+        qr_render_cache.clear()
+        renders: list[int] = []
+        real_render = menu_routes._render_standard_qr_png
+
+        def counting_render(public_url, size_px=1000):
+            renders.append(size_px)
+            return real_render(public_url, size_px=size_px)
+
+        monkeypatch.setattr(menu_routes, "_render_standard_qr_png", counting_render)
+
+        first = client.get(f"/menus/{test_menu.id}/qr", params={"size": 512})
+        second = client.get(f"/menus/{test_menu.id}/qr", params={"size": 512})
+        pdf = client.get(f"/menus/{test_menu.id}/qr", params={"size": 512, "format": "pdf"})
+        not_modified = client.get(
+            f"/menus/{test_menu.id}/qr",
+            params={"size": 512},
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        assert first.status_code == 200, first.text
+        image = Image.open(io.BytesIO(first.content))
+        assert image.width == image.height and 400 < image.width <= 512
+        assert second.content == first.content
+        assert first.headers["cache-control"] == "private, no-cache"
+        assert pdf.content.startswith(b"%PDF")
+        assert not_modified.status_code == 304
+        assert renders == [512]
+
+        # A generated menu QR in storage is served as-is instead of re-rendered,
+        # but only while it encodes the URL being requested.
+        backend = InMemoryStorageBackend()
+        backend.put_bytes(menu_qr_current_key(test_menu.org_id, test_menu.id, size_px=1000), b"stored-qr")
+        test_menu.qr_generated_at = datetime.utcnow()
+        test_menu.qr_public_url = f"https://menus.example/r/{test_menu.id}"
+        session.add(test_menu)
+        session.commit()
+        set_storage_backend(backend)
+        try:
+            stored = client.get(f"/menus/{test_menu.id}/qr", headers={"Origin": "https://menus.example"})
+            other_origin = client.get(f"/menus/{test_menu.id}/qr", headers={"Origin": "https://other.example"})
+        finally:
+            set_storage_backend(None)
+            qr_render_cache.clear()
+        assert stored.content == b"stored-qr"
+        assert other_origin.content.startswith(b"\x89PNG")
+        assert renders == [512, 1000]
+
     def test_regenerate_menu_qr_persists_plain_qr_assets(
         self,
         client: TestClient,
@@ -280,3 +474,90 @@ class TestMenuQrEndpoints:
         assert refreshed_menu is not None
         assert refreshed_menu.qr_url == payload["qr_url"]
         assert refreshed_menu.qr_generated_at is not None
+
+    def test_bulk_qr_refreshes_stale_menus_and_returns_one_archive(
+        self,
+        client: TestClient,
+        session: Session,
+        test_org: Organization,
+        test_menu: Menu,
+    ):
+        import io
+        import zipfile
+        from datetime import datetime
+
+        from qr_codes import qr_render_cache
+        from storage_backend import InMemoryStorageBackend, set_storage_backend
+
+        current = Menu(
+            name="Dinner Menu",
+            slug=str(uuid.uuid4()),
+            org_id=test_org.id,
+            qr_url="https://cdn.example.com/dinner.png",
+            qr_generated_at=datetime.utcnow(),
+        )
+        current.qr_public_url = f"http://testserver/r/{current.id}"
+        session.add(current)
+        session.commit()
+
+        qr_render_cache.clear()
+        backend = InMemoryStorageBackend()
+        set_storage_backend(backend)
+        try:
+            response = client.post(
+                "/menus/bulk-qr",
+                json={"org_id": str(test_org.id), "sizes": [512, 1000]},
+                headers={"Authorization": "Bearer mocktoken"},
+            )
+            pdf = client.post(
+                "/menus/bulk-qr",
+                json={"org_id": str(test_org.id), "output": "pdf"},
+                headers={"Authorization": "Bearer mocktoken"},
+            )
+        finally:
+            set_storage_backend(None)
+            qr_render_cache.clear()
+
+        assert response.status_code == 200, response.text
+        assert response.headers["x-qr-regenerated"] == "1"
+        assert response.headers["x-qr-skipped"] == "1"
+        assert int(response.headers["content-length"]) == len(response.content)
+        names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+        assert len(names) == 8
+        assert f"Lunch Menu-{str(test_menu.id)[:8]}/qr-512.pdf" in names
+
+        stored_keys = set(backend.objects)
+        assert menu_qr_current_key(test_org.id, test_menu.id) in stored_keys
+        assert menu_qr_current_key(test_org.id, current.id) not in stored_keys
+        session.refresh(test_menu)
+        assert test_menu.qr_public_url == f"http://testserver/r/{test_menu.id}"
+
+        assert pdf.status_code == 200, pdf.text
+        assert pdf.content.startswith(b"%PDF")
+        assert pdf.headers["x-qr-regenerated"] == "0"
+
+    def test_delete_menu_purges_menu_and_item_storage(
+        self,
+        client: TestClient,
+        test_menu: Menu,
+        test_item: Item,
+    ):
+        from storage_backend import InMemoryStorageBackend, set_storage_backend
+        from storage_keys import item_root, menu_root
+
+        backend = InMemoryStorageBackend()
+        backend.put_bytes(f"{menu_root(test_menu.org_id, test_menu.id)}/qr/current/qr.png", b"qr")
+        backend.put_bytes(f"{item_root(test_menu.org_id, test_item.id)}/photos/original/a.jpg", b"a")
+        other_menu_key = f"{menu_root(test_menu.org_id, uuid.uuid4())}/qr/current/qr.png"
+        backend.put_bytes(other_menu_key, b"keep")
+        set_storage_backend(backend)
+        try:
+            response = client.delete(
+                f"/menus/{test_menu.id}",
+                headers={"Authorization": "Bearer mocktoken"},
+            )
+        finally:
+            set_storage_backend(None)
+
+        assert response.status_code == 200, response.text
+        assert set(backend.objects) == {other_menu_key}
@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+from main import app
+from database import get_session
+from routers import metadata as metadata_routes
+from routers.metadata import DEFAULT_ALLERGENS, DEFAULT_DIETARY_TAGS, metadata_cache, seed_default_metadata
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session, monkeypatch):
+    def get_session_override():
+        return session
+
+    # Behave as if the startup seed ran against an empty database.
+    seeded = threading.Event()
+    seeded.set()
+    monkeypatch.setattr(metadata_routes, "_default_metadata_seeded", seeded)
+
+    app.dependency_overrides[get_session] = get_session_override
+    metadata_cache.invalidate()
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
+    metadata_cache.invalidate()
+
+
+def test_seeding_happens_once_outside_the_read_path(client: TestClient, session: Session):
+    assert client.get("/metadata/dietary-tags").json() == []
+
+    seed_default_metadata(session)
+    seed_default_metadata(session)
+
+    tags = client.get("/metadata/dietary-tags").json()
+    allergens = client.get("/metadata/allergens").json()
+    assert sorted(tag["name"] for tag in tags) == sorted(DEFAULT_DIETARY_TAGS)
+    assert sorted(allergen["name"] for allergen in allergens) == sorted(DEFAULT_ALLERGENS)
+
+
+def test_a_failed_startup_seed_is_retried_on_the_first_read(client: TestClient, session: Session):
+    metadata_routes._default_metadata_seeded.clear()
+
+    tags = client.get("/metadata/dietary-tags").json()
+    assert sorted(tag["name"] for tag in tags) == sorted(DEFAULT_DIETARY_TAGS)
+    assert metadata_routes._default_metadata_seeded.is_set()
+
+    # Once seeded, emptying a table does not bring the defaults back.
+    for allergen in client.get("/metadata/allergens").json():
+        client.delete(f"/metadata/allergens/{allergen['id']}")
+    assert client.get("/metadata/allergens").json() == []
+
+
+def test_metadata_lists_are_cached_with_etags_until_a_write_commits(client: TestClient, session: Session):
+    created = client.post("/metadata/allergens", json={"name": "Contains Soy"})
+    assert created.status_code == 201, created.text
+
+    first = client.get("/metadata/allergens")
+    etag = first.headers["etag"]
+    assert [allergen["name"] for allergen in first.json()] == ["Contains Soy"]
+    assert client.get("/metadata/allergens", headers={"If-None-Match": etag}).status_code == 304
+
+    # Writes that bypass the ORM are not seen until the cache is invalidated.
+    session.execute(text("INSERT INTO allergen (id, name) VALUES ('00000000000000000000000000000001', 'Raw')"))
+    session.commit()
+    assert client.get("/metadata/allergens").headers["etag"] == etag
+
+    client.delete(f"/metadata/allergens/{created.json()['id']}")
+    after_delete = client.get("/metadata/allergens", headers={"If-None-Match": etag})
+    assert after_delete.status_code == 200
+    assert [allergen["name"] for allergen in after_delete.json()] == ["Raw"]
@@ -0,0 +1,113 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+import database
+import metrics
+from ar_pipeline import AR_JOB_SECONDS, AR_STAGE_READY, AR_STAGE_TRANSITIONS_TOTAL, AR_STAGE_QUEUED
+from main import app
+from models import Category, ImportJob, Item, Menu, Organization
+
+
+@pytest.fixture(name="session")
+def session_fixture(monkeypatch: pytest.MonkeyPatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    monkeypatch.setattr(database, "get_engine", lambda: engine)
+    metrics.registry.reset()
+    with Session(engine) as session:
+        yield session
+    metrics.registry.reset()
+
+
+def test_histogram_renders_cumulative_buckets_and_escaped_labels():
+    histogram = metrics.Histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage='say "hi"')
+    histogram.observe(0.5, stage='say "hi"')
+    histogram.observe(5.0, stage='say "hi"')
+
+    lines = histogram.render()
+
+    assert '# TYPE demo_seconds histogram' in lines
+    assert 'demo_seconds_bucket{stage="say \\"hi\\"",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{stage="say \\"hi\\"",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{stage="say \\"hi\\"",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{stage="say \\"hi\\""} 3' in lines
+    with pytest.raises(ValueError):
+        histogram.observe(1.0)
+    with pytest.raises(ValueError):
+        metrics.Counter("not_a_counter", "Missing suffix.")
+
+
+def test_ar_stage_transitions_are_counted_at_flush(session: Session):
+    org = Organization(name="Org", slug=f"org-{uuid.uuid4().hex[:8]}", owner_id="owner")
+    session.add(org)
+    session.commit()
+    menu = Menu(name="Menu", org_id=org.id)
+    session.add(menu)
+    session.commit()
+    category = Category(name="Mains", menu_id=menu.id)
+    session.add(category)
+    session.commit()
+    item = Item(name="Burger", price=10.0, category_id=category.id, ar_stage=AR_STAGE_QUEUED)
+    item.ar_created_at = datetime.utcnow() - timedelta(minutes=3)
+    session.add(item)
+    session.commit()
+
+    # Commit expired the item; reading the stage loads the one it is leaving.
+    assert item.ar_stage == AR_STAGE_QUEUED
+    item.ar_stage = "uploading_to_kiri"
+    item.ar_stage = AR_STAGE_READY
+    session.add(item)
+    session.commit()
+
+    # Assigning without loading first is still counted, from an unknown stage.
+    item.ar_stage = AR_STAGE_QUEUED
+    session.commit()
+
+    assert AR_STAGE_TRANSITIONS_TOTAL.value(from_stage=AR_STAGE_QUEUED, to_stage=AR_STAGE_READY) == 1
+    assert AR_STAGE_TRANSITIONS_TOTAL.value(from_stage="unknown", to_stage=AR_STAGE_QUEUED) == 1
+    assert AR_STAGE_TRANSITIONS_TOTAL.value(from_stage=AR_STAGE_QUEUED, to_stage="uploading_to_kiri") == 0
+    assert AR_JOB_SECONDS.count(stage=AR_STAGE_READY) == 1
+    assert AR_JOB_SECONDS.sum(stage=AR_STAGE_READY) >= 180
+
+
+def test_metrics_endpoint_reports_queue_lag(session: Session, monkeypatch: pytest.MonkeyPatch):
+    session.add(ImportJob(restaurant_name="Old", created_by="user", created_at=datetime.utcnow() - timedelta(minutes=10)))
+    session.add(ImportJob(restaurant_name="New", created_by="user"))
+    session.add(ImportJob(restaurant_name="Done", created_by="user", status="COMPLETED", created_at=datetime.utcnow() - timedelta(days=1)))
+    session.commit()
+    client = TestClient(app)
+
+    body = client.get("/metrics")
+
+    assert body.status_code == 200
+    assert body.headers["content-type"].startswith("text/plain")
+    lines = body.text.splitlines()
+    assert 'menuvium_queue_depth{queue="import_jobs"} 2' in lines
+    assert 'menuvium_queue_depth{queue="ar_pending"} 0' in lines
+    oldest = next(line for line in lines if line.startswith('menuvium_queue_oldest_age_seconds{queue="import_jobs"}'))
+    assert 590 <= float(oldest.split()[-1]) < 700
+
+    monkeypatch.setenv("METRICS_TOKEN", "scrape-me")
+    assert client.get("/metrics").status_code == 403
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-me"}).status_code == 200
+
+
+def test_metric_types_must_implement_render_and_reset():
+    class Incomplete(metrics._Metric):
+        kind = "gauge"
+
+        def render(self):
+            return []
+
+    with pytest.raises(TypeError):
+        Incomplete("menuvium_incomplete", "Missing reset().")
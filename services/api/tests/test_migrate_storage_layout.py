@@ -0,0 +1,130 @@
+import json
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+from models import Menu, Organization
+from scripts.migrate_storage_layout import Migrator, _stable_asset_id, migrate
+from storage_backend import InMemoryStorageBackend, set_storage_backend
+from storage_keys import menu_branding_logo_key
+
+
+ORG_ID = uuid.UUID(int=1)
+FIRST_MENU_ID = uuid.UUID(int=10)
+SECOND_MENU_ID = uuid.UUID(int=20)
+
+
+class FlakyStorageBackend(InMemoryStorageBackend):
+    """In-memory backend whose copies out of `failing_sources` raise."""
+
+    def __init__(self, failing_sources: set[str]):
+        super().__init__()
+        self.failing_sources = failing_sources
+        self.copied: list[tuple[str, str]] = []
+
+    def copy(self, source_key: str, destination_key: str, *, content_type: str | None = None) -> None:
+        if source_key in self.failing_sources:
+            raise OSError(f"copy of {source_key} failed")
+        super().copy(source_key, destination_key, content_type=content_type)
+        self.copied.append((source_key, destination_key))
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Organization(id=ORG_ID, name="Gilded Fork", slug="gilded-fork", owner_id="owner"))
+        # Both menus share one legacy logo; only the second has a banner.
+        session.add(Menu(id=FIRST_MENU_ID, name="Lunch", slug="lunch", org_id=ORG_ID, logo_url="/uploads/legacy/logo.png"))
+        session.add(
+            Menu(
+                id=SECOND_MENU_ID,
+                name="Dinner",
+                slug="dinner",
+                org_id=ORG_ID,
+                logo_url="/uploads/legacy/logo.png",
+                banner_url="/uploads/legacy/banner.jpg",
+            )
+        )
+        session.commit()
+        yield session
+
+
+def _logo_target(menu_id: uuid.UUID) -> str:
+    return menu_branding_logo_key(
+        ORG_ID,
+        menu_id,
+        "logo.png",
+        content_type="image/png",
+        asset_id=_stable_asset_id(menu_id, "legacy/logo.png"),
+    )
+
+
+def _install(backend: FlakyStorageBackend):
+    backend.put_bytes("legacy/logo.png", b"logo", content_type="image/png")
+    backend.put_bytes("legacy/banner.jpg", b"banner", content_type="image/jpeg")
+    set_storage_backend(backend)
+
+
+@pytest.fixture(autouse=True)
+def reset_backend():
+    yield
+    set_storage_backend(None)
+
+
+def test_failed_chunk_is_rolled_back_and_keeps_shared_sources(session: Session):
+    backend = FlakyStorageBackend(failing_sources={"legacy/banner.jpg"})
+    _install(backend)
+    migrator = Migrator(dry_run=False, delete_old=True, concurrency=2)
+
+    failed_chunks = migrate(session, migrator, batch_size=1)
+    migrator.delete_sources()
+
+    assert failed_chunks == 1
+    first = session.get(Menu, FIRST_MENU_ID)
+    second = session.get(Menu, SECOND_MENU_ID)
+    session.refresh(first)
+    session.refresh(second)
+    assert first.logo_url.endswith(_logo_target(FIRST_MENU_ID))
+    # The failed chunk still points at the legacy keys, so none of them were deleted.
+    assert second.logo_url == "/uploads/legacy/logo.png"
+    assert second.banner_url == "/uploads/legacy/banner.jpg"
+    assert {"legacy/logo.png", "legacy/banner.jpg"} <= set(backend.objects)
+    assert migrator.failed == 1
+
+
+def test_sources_of_committed_chunks_are_deleted(session: Session):
+    backend = FlakyStorageBackend(failing_sources=set())
+    _install(backend)
+    migrator = Migrator(dry_run=False, delete_old=True, concurrency=2)
+
+    assert migrate(session, migrator, batch_size=1) == 0
+    migrator.delete_sources()
+
+    assert not any(key.startswith("legacy/") for key in backend.objects)
+
+
+def test_resume_skips_checkpointed_copies_and_repairs_a_torn_line(session: Session, tmp_path: Path):
+    backend = FlakyStorageBackend(failing_sources=set())
+    _install(backend)
+    logo_target = _logo_target(FIRST_MENU_ID)
+    backend.put_bytes(logo_target, b"logo", content_type="image/png")
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    checkpoint.write_text(json.dumps({"source": "legacy/logo.png", "target": logo_target}) + "\n" + '{"source": "legacy/ban')
+
+    migrator = Migrator(dry_run=False, delete_old=False, checkpoint_path=checkpoint, concurrency=2)
+    assert migrator.completed_pairs == {("legacy/logo.png", logo_target)}
+    assert migrate(session, migrator, batch_size=1) == 0
+
+    assert migrator.resumed == 1
+    assert ("legacy/logo.png", logo_target) not in backend.copied
+    assert migrator.copied == len(backend.copied) == 2
+    entries = [json.loads(line) for line in checkpoint.read_text().splitlines()]
+    assert len(entries) == 3
+    assert Migrator(dry_run=False, delete_old=False, checkpoint_path=checkpoint).completed_pairs == {
+        (entry["source"], entry["target"]) for entry in entries
+    }
@@ -0,0 +1,72 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlmodel import create_engine
+from sqlmodel.pool import StaticPool
+
+import request_profiling
+from request_profiling import ProfileRegistry, ProfilingMiddleware, profile_span
+
+
+def test_profiling_middleware_reports_route_percentiles_and_n_plus_one():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    registry = ProfileRegistry(window=50, n_plus_one_threshold=5)
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, profile_registry=registry)
+
+    @app.get("/orgs/{org_id}/menus")
+    def list_menus(org_id: int):
+        with engine.connect() as connection:
+            for menu_id in range(org_id):
+                connection.execute(text("SELECT :menu_id"), {"menu_id": menu_id}).all()
+        with profile_span("serialize"):
+            with profile_span("serialize"):
+                pass
+        return {"ok": True}
+
+    event.listen(Engine, "before_cursor_execute", request_profiling._before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", request_profiling._after_cursor_execute)
+    try:
+        client = TestClient(app)
+        assert client.get("/orgs/2/menus").status_code == 200
+        assert client.get("/orgs/8/menus").status_code == 200
+    finally:
+        event.remove(Engine, "before_cursor_execute", request_profiling._before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", request_profiling._after_cursor_execute)
+
+    (route,) = registry.report()
+    assert route["route"] == "/orgs/{org_id}/menus"
+    assert route["requests"] == 2
+    assert route["queries_p50"] == 2 and route["queries_p95"] == 8
+    assert route["p95_ms"] >= route["p50_ms"] > 0
+    assert set(route["span_mean_ms"]) == {"serialize"}
+    assert route["n_plus_one_suspects"] == [{"statement": "SELECT ?", "max_per_request": 8}]
+
+    # Queries outside a request are not attributed anywhere.
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1")).all()
+    registry.reset()
+    assert registry.report() == []
+
+
+def test_response_model_serialization_is_timed(monkeypatch):
+    import fastapi.routing
+    from pydantic import BaseModel
+
+    class Row(BaseModel):
+        id: int
+
+    monkeypatch.setattr(fastapi.routing, "serialize_response", fastapi.routing.serialize_response)
+    request_profiling._instrument_response_serialization()
+    registry = ProfileRegistry(window=10, n_plus_one_threshold=5)
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, profile_registry=registry)
+
+    @app.get("/rows", response_model=list[Row])
+    def list_rows():
+        return [{"id": index} for index in range(3)]
+
+    assert TestClient(app).get("/rows").json() == [{"id": 0}, {"id": 1}, {"id": 2}]
+    (route,) = registry.report()
+    assert set(route["span_mean_ms"]) == {"serialize"}
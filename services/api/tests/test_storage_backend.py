@@ -0,0 +1,145 @@
+import io
+from pathlib import Path
+
+import pytest
+
+import storage_backend
+from storage_backend import InMemoryStorageBackend, LocalStorageBackend, get_storage_backend, set_storage_backend
+from storage_utils import (
+    copy_storage_key,
+    copy_storage_keys,
+    delete_storage_key_best_effort,
+    delete_storage_prefixes_best_effort,
+    materialize_storage_key_to_path,
+    store_bytes,
+    store_file_from_path,
+)
+
+
+@pytest.fixture(name="memory_backend")
+def memory_backend_fixture():
+    backend = InMemoryStorageBackend()
+    set_storage_backend(backend)
+    yield backend
+    set_storage_backend(None)
+
+
+def test_storage_utils_round_trip_through_backend(memory_backend: InMemoryStorageBackend, tmp_path: Path):
+    url = store_bytes(data=b"logo", key="orgs/1/logo.png", content_type="image/png", base_url="https://api.test")
+    assert url == "https://api.test/uploads/orgs/1/logo.png"
+
+    source = tmp_path / "frame.jpg"
+    source.write_bytes(b"frame")
+    store_file_from_path(source_path=source, key="orgs/1/frame.jpg", content_type="image/jpeg")
+    copy_storage_key(source_key="orgs/1/frame.jpg", destination_key="orgs/1/copy.jpg")
+
+    destination = materialize_storage_key_to_path(key="orgs/1/copy.jpg", destination=tmp_path / "out" / "copy.jpg")
+    assert destination.read_bytes() == b"frame"
+    assert memory_backend.content_types["orgs/1/copy.jpg"] == "image/jpeg"
+
+    delete_storage_key_best_effort("orgs/1/logo.png")
+    delete_storage_key_best_effort("orgs/1/missing.png")
+    assert set(memory_backend.objects) == {"orgs/1/frame.jpg", "orgs/1/copy.jpg"}
+
+
+def test_local_backend_rejects_keys_outside_root(tmp_path: Path):
+    backend = LocalStorageBackend(tmp_path)
+    backend.put_bytes("menus/a.txt", b"ok")
+    assert (tmp_path / "menus" / "a.txt").read_bytes() == b"ok"
+    with pytest.raises(ValueError):
+        backend.put_bytes("../escape.txt", b"nope")
+
+
+def test_backend_selection_follows_env_and_reuses_clients(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("S3_BUCKET_NAME", raising=False)
+    monkeypatch.delenv("LOCAL_UPLOADS", raising=False)
+    assert get_storage_backend() is None
+
+    monkeypatch.setenv("LOCAL_UPLOADS", "1")
+    assert get_storage_backend() is get_storage_backend()
+    assert get_storage_backend().name == "local"
+
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+    monkeypatch.setenv("S3_BUCKET_NAME", "menuvium-test")
+    storage_backend.reset_storage_backends()
+    first = get_storage_backend()
+    assert first.name == "s3"
+    assert first is get_storage_backend()
+    assert first.public_url("a/b.png") == "https://menuvium-test.s3.amazonaws.com/a/b.png"
+    storage_backend.reset_storage_backends()
+
+
+def test_s3_delete_many_batches_by_thousand():
+    calls: list[int] = []
+
+    class FakeClient:
+        def delete_objects(self, *, Bucket, Delete):
+            calls.append(len(Delete["Objects"]))
+            return {"Errors": [{"Key": Delete["Objects"][0]["Key"], "Code": "AccessDenied"}]}
+
+    backend = storage_backend.S3StorageBackend.__new__(storage_backend.S3StorageBackend)
+    backend.bucket = "menuvium-test"
+    backend.client = FakeClient()
+
+    deleted = backend.delete_many(f"orgs/1/{index}.jpg" for index in range(2500))
+
+    assert calls == [1000, 1000, 500]
+    assert deleted == 2497
+
+
+def test_s3_fileobj_uploads_pass_the_stream_through_and_count_via_callback(tmp_path: Path):
+    class FakeClient:
+        def upload_fileobj(self, fileobj, bucket, key, *, ExtraArgs, Callback, Config):
+            # s3transfer only streams seekable sources without buffering parts.
+            assert fileobj is source and fileobj.seekable()
+            for part in iter(lambda: fileobj.read(4), b""):
+                Callback(len(part))
+            Callback(-4)  # a retried part is reported back as negative progress
+            Callback(4)
+
+    backend = storage_backend.S3StorageBackend.__new__(storage_backend.S3StorageBackend)
+    backend.bucket = "menuvium-test"
+    backend.client = FakeClient()
+    backend.transfer_config = None
+    (tmp_path / "model.usdz").write_bytes(b"0123456789")
+
+    with (tmp_path / "model.usdz").open("rb") as source:
+        assert backend.upload_fileobj(source, "orgs/1/model.usdz") == 10
+    assert LocalStorageBackend(tmp_path).upload_fileobj(io.BytesIO(b"abc"), "copy.bin") == 3
+
+
+def test_prefix_delete_and_concurrent_copies(memory_backend: InMemoryStorageBackend):
+    for name in ("a", "b", "c"):
+        memory_backend.put_bytes(f"orgs/1/items/2/{name}.jpg", name.encode())
+    memory_backend.put_bytes("orgs/1/items/20/keep.jpg", b"keep")
+
+    results = copy_storage_keys(
+        [("orgs/1/items/2/a.jpg", "orgs/1/menus/9/a.jpg"), ("orgs/1/missing.jpg", "orgs/1/menus/9/x.jpg")]
+    )
+    assert results[("orgs/1/items/2/a.jpg", "orgs/1/menus/9/a.jpg")] is None
+    assert isinstance(results[("orgs/1/missing.jpg", "orgs/1/menus/9/x.jpg")], FileNotFoundError)
+
+    assert delete_storage_prefixes_best_effort(["orgs/1/items/2"]) == 3
+    assert sorted(memory_backend.objects) == ["orgs/1/items/20/keep.jpg", "orgs/1/menus/9/a.jpg"]
+    with pytest.raises(ValueError):
+        memory_backend.delete_prefix("")
+
+
+def test_incomplete_backend_fails_at_construction():
+    class PutOnlyBackend(storage_backend.StorageBackend):
+        def put_bytes(self, key, data, **kwargs):
+            pass
+
+    with pytest.raises(TypeError):
+        PutOnlyBackend()
+
+
+def test_import_zips_go_through_the_installed_backend(memory_backend: InMemoryStorageBackend, monkeypatch: pytest.MonkeyPatch):
+    from importer.zipper import get_zip_data, store_zip
+
+    monkeypatch.delenv("LOCAL_UPLOADS", raising=False)
+    key = store_zip(b"zip-bytes", "job-1", "The Gilded Fork", org_id="org-1")
+
+    assert memory_backend.objects[key] == b"zip-bytes"
+    assert memory_backend.content_types[key] == "application/zip"
+    assert get_zip_data(key) == b"zip-bytes"
@@ -1,3 +1,4 @@
+import hashlib
 from pathlib import Path
 
 import video_frame_extractor as extractor
@@ -79,3 +80,92 @@ def test_extract_video_frames_surfaces_both_direct_and_normalized_errors(tmp_pat
     assert "Normalized retry error" in message
     assert "bad extract" in message
     assert "bad normalize" in message
+
+
+def _write_pattern_frame(path: Path, *, blur: float, shift: int) -> None:
+    from PIL import Image, ImageDraw, ImageFilter
+
+    image = Image.new("RGB", (160, 120), "white")
+    draw = ImageDraw.Draw(image)
+    for column in range(0, 160, 10):
+        draw.rectangle([column + shift, 0, column + shift + 4, 120], fill="black")
+    draw.ellipse([20 + shift * 4, 20, 80 + shift * 4, 80], fill="red")
+    if blur:
+        image = image.filter(ImageFilter.GaussianBlur(blur))
+    image.save(path, "JPEG", quality=95)
+
+
+def test_extract_frames_keeps_sharpest_candidate_per_window(tmp_path, monkeypatch):
+    output_dir = tmp_path / "frames"
+    monkeypatch.setenv("AR_VIDEO_FRAME_OVERSAMPLE", "2")
+
+    def fake_run_command(*, command, label):
+        pattern = Path(command[-1])
+        frame_limit = int(command[command.index("-frames:v") + 1])
+        for index in range(1, frame_limit + 1):
+            window = (index - 1) // 2
+            # The second candidate of every window is blurred.
+            _write_pattern_frame(
+                pattern.parent / f"candidate-{index:05d}.jpg",
+                blur=4.0 if index % 2 == 0 else 0.0,
+                shift=window % 10,
+            )
+
+    monkeypatch.setattr(extractor, "_run_command", fake_run_command)
+
+    frame_paths = extractor._extract_frames_with_ffmpeg(
+        ffmpeg_path="ffmpeg",
+        video_path=tmp_path / "input.mov",
+        output_dir=output_dir,
+        desired_frame_count=24,
+        duration_seconds=8.0,
+    )
+
+    assert [path.name for path in frame_paths] == [f"frame-{index:04d}.jpg" for index in range(1, 25)]
+    assert not (tmp_path / "frames-candidates").exists()
+    sharp = extractor._score_frame(frame_paths[0]).sharpness
+    blurred_path = tmp_path / "blurred.jpg"
+    _write_pattern_frame(blurred_path, blur=4.0, shift=0)
+    assert sharp > extractor._score_frame(blurred_path).sharpness * 2
+
+
+def test_select_sharpest_frames_skips_near_duplicates_above_minimum():
+    # Distinct scenes get fingerprints far apart in Hamming distance.
+    candidates = [
+        extractor.FrameCandidate(
+            path=Path(f"c-{index}.jpg"),
+            sharpness=float(index % 3),
+            fingerprint=int.from_bytes(hashlib.sha256(str(index // 2).encode()).digest()[:8], "big"),
+        )
+        for index in range(60)
+    ]
+    still = [
+        extractor.FrameCandidate(path=Path(f"s-{index}.jpg"), sharpness=1.0, fingerprint=0)
+        for index in range(60)
+    ]
+
+    assert len(extractor.select_sharpest_frames(candidates, 30)) == 30
+    # A static video collapses to the minimum the provider accepts, not fewer.
+    assert len(extractor.select_sharpest_frames(still, 30)) == extractor.MINIMUM_KIRI_IMAGE_COUNT
+
+
+def test_commands_run_under_nice_instead_of_a_preexec_hook(monkeypatch):
+    captured = {}
+
+    def fake_run(command, **kwargs):
+        captured["command"] = command
+        captured["kwargs"] = kwargs
+        return extractor.subprocess.CompletedProcess(command, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(extractor.subprocess, "run", fake_run)
+    monkeypatch.setattr(extractor.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setenv("AR_VIDEO_FFMPEG_NICE", "7")
+
+    extractor._run_command(command=["ffmpeg", "-version"], label="ffmpeg")
+
+    assert captured["command"] == ["/usr/bin/nice", "-n", "7", "ffmpeg", "-version"]
+    assert "preexec_fn" not in captured["kwargs"]
+
+    monkeypatch.setenv("AR_VIDEO_FFMPEG_NICE", "0")
+    extractor._run_command(command=["ffmpeg", "-version"], label="ffmpeg")
+    assert captured["command"] == ["ffmpeg", "-version"]
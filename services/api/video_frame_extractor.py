@@ -8,8 +8,13 @@ import subprocess
 from dataclasses import dataclass
 from pathlib import Path
 
+from PIL import Image, ImageFilter, ImageStat
+
 
 MINIMUM_KIRI_IMAGE_COUNT = 20
+# Scoring works on a small grayscale copy; sharpness ranks frames, not absolute blur.
+SCORING_MAX_DIMENSION = 320
+_LAPLACIAN_KERNEL = ImageFilter.Kernel((3, 3), [0, 1, 0, 1, -4, 1, 0, 1, 0], scale=1, offset=128)
 
 
 @dataclass
@@ -27,6 +32,13 @@ class ExtractedVideoFrames:
     used_normalized_video: bool = False
 
 
+@dataclass
+class FrameCandidate:
+    path: Path
+    sharpness: float
+    fingerprint: int
+
+
 def _env_int(name: str, default: int) -> int:
     raw = os.getenv(name)
     if raw is None:
@@ -70,8 +82,23 @@ def _format_process_failure(*, label: str, completed: subprocess.CompletedProces
     return RuntimeError(message)
 
 
+def _with_lower_priority(command: list[str]) -> list[str]:
+    # Run ffmpeg under nice(1) so it yields the CPU to request handling. A
+    # preexec_fn would do the same, but is unsafe in this threaded process.
+    niceness = _env_int("AR_VIDEO_FFMPEG_NICE", 10)
+    nice_path = shutil.which("nice") if niceness > 0 else None
+    if not nice_path:
+        return command
+    return [nice_path, "-n", str(niceness), *command]
+
+
 def _run_command(*, command: list[str], label: str) -> subprocess.CompletedProcess[str]:
-    completed = subprocess.run(command, capture_output=True, text=True, check=False)
+    completed = subprocess.run(
+        _with_lower_priority(command),
+        capture_output=True,
+        text=True,
+        check=False,
+    )
     if completed.returncode != 0:
         raise _format_process_failure(label=label, completed=completed)
     return completed
@@ -144,6 +171,76 @@ def _desired_frame_count(*, duration_seconds: float) -> int:
     )
 
 
+def _candidate_frame_count(desired_frame_count: int) -> int:
+    oversample = max(_env_float("AR_VIDEO_FRAME_OVERSAMPLE", 2.0), 1.0)
+    max_candidates = max(_env_int("AR_VIDEO_FRAME_MAX_CANDIDATES", 360), desired_frame_count)
+    return min(int(math.ceil(desired_frame_count * oversample)), max_candidates)
+
+
+def _duplicate_hash_distance() -> int:
+    return max(_env_int("AR_VIDEO_FRAME_DUPLICATE_DISTANCE", 4), 0)
+
+
+def _score_frame(path: Path) -> FrameCandidate:
+    """Laplacian variance (sharpness) plus a 64-bit difference hash (near-duplicate check)."""
+    with Image.open(path) as image:
+        image.draft("L", (SCORING_MAX_DIMENSION, SCORING_MAX_DIMENSION))
+        gray = image.convert("L")
+    gray.thumbnail((SCORING_MAX_DIMENSION, SCORING_MAX_DIMENSION))
+    sharpness = ImageStat.Stat(gray.filter(_LAPLACIAN_KERNEL)).var[0]
+
+    pixels = gray.resize((9, 8)).tobytes()
+    fingerprint = 0
+    for row in range(8):
+        for column in range(8):
+            left = pixels[row * 9 + column]
+            right = pixels[row * 9 + column + 1]
+            fingerprint = (fingerprint << 1) | (1 if left > right else 0)
+    return FrameCandidate(path=path, sharpness=sharpness, fingerprint=fingerprint)
+
+
+def _hash_distance(first: int, second: int) -> int:
+    return bin(first ^ second).count("1")
+
+
+def select_sharpest_frames(candidates: list[FrameCandidate], desired_frame_count: int) -> list[FrameCandidate]:
+    """Pick at most desired_frame_count frames: the sharpest of each equal time window.
+
+    Windows keep coverage of the whole orbit. A window's pick is skipped when
+    every candidate in it is a near-duplicate of the previous pick, as long as
+    the result still meets MINIMUM_KIRI_IMAGE_COUNT.
+    """
+    if not candidates:
+        return []
+    window_count = min(desired_frame_count, len(candidates))
+    skips_allowed = max(window_count - MINIMUM_KIRI_IMAGE_COUNT, 0)
+    max_distance = _duplicate_hash_distance()
+
+    selected: list[FrameCandidate] = []
+    for window in range(window_count):
+        start = window * len(candidates) // window_count
+        end = (window + 1) * len(candidates) // window_count
+        ranked = sorted(candidates[start:end], key=lambda candidate: candidate.sharpness, reverse=True)
+        if not ranked:
+            continue
+        previous = selected[-1] if selected else None
+        pick = next(
+            (
+                candidate
+                for candidate in ranked
+                if previous is None or _hash_distance(candidate.fingerprint, previous.fingerprint) > max_distance
+            ),
+            None,
+        )
+        if pick is None:
+            if skips_allowed > 0:
+                skips_allowed -= 1
+                continue
+            pick = ranked[0]
+        selected.append(pick)
+    return selected
+
+
 def _extract_frames_with_ffmpeg(
     *,
     ffmpeg_path: str,
@@ -151,13 +248,25 @@ def _extract_frames_with_ffmpeg(
     output_dir: Path,
     desired_frame_count: int,
     duration_seconds: float,
+    threads: int | None = None,
 ) -> list[Path]:
+    """Decode once, scaling inline, then keep the sharpest distinct frames.
+
+    ffmpeg samples candidate_count frames (oversampled from desired_frame_count)
+    into a scratch directory; the selected ones are renamed to frame-0001.jpg...
+    in output_dir and the rest are deleted.
+    """
     jpeg_quality = min(max(_env_int("AR_VIDEO_FRAME_JPEG_QUALITY", 2), 1), 31)
-    effective_fps = desired_frame_count / duration_seconds
-    threads = _ffmpeg_threads()
+    candidate_count = _candidate_frame_count(desired_frame_count)
+    effective_fps = candidate_count / duration_seconds
+    threads = threads or _ffmpeg_threads()
+    max_dimension = _normalized_max_dimension()
 
+    candidate_dir = output_dir.parent / f"{output_dir.name}-candidates"
+    if candidate_dir.exists():
+        shutil.rmtree(candidate_dir)
+    candidate_dir.mkdir(parents=True, exist_ok=True)
     output_dir.mkdir(parents=True, exist_ok=True)
-    output_pattern = output_dir / "frame-%04d.jpg"
     command = [
         ffmpeg_path,
         "-hide_banner",
@@ -168,17 +277,36 @@ def _extract_frames_with_ffmpeg(
         str(threads),
         "-i",
         str(video_path),
+        "-map",
+        "0:v:0",
+        "-an",
+        "-sn",
+        "-dn",
         "-vf",
-        f"fps={effective_fps:.6f}",
+        (
+            f"fps={effective_fps:.6f},"
+            f"scale=w=min(iw\\,{max_dimension}):"
+            f"h=min(ih\\,{max_dimension}):"
+            "force_original_aspect_ratio=decrease"
+        ),
         "-frames:v",
-        str(desired_frame_count),
+        str(candidate_count),
         "-q:v",
         str(jpeg_quality),
-        str(output_pattern),
+        str(candidate_dir / "candidate-%05d.jpg"),
     ]
-    _run_command(command=command, label="ffmpeg frame extraction")
+    try:
+        _run_command(command=command, label="ffmpeg frame extraction")
+        candidates = [_score_frame(path) for path in sorted(candidate_dir.glob("candidate-*.jpg"))]
+        selected = select_sharpest_frames(candidates, desired_frame_count)
+        frame_paths = []
+        for index, candidate in enumerate(selected, start=1):
+            frame_path = output_dir / f"frame-{index:04d}.jpg"
+            candidate.path.replace(frame_path)
+            frame_paths.append(frame_path)
+    finally:
+        shutil.rmtree(candidate_dir, ignore_errors=True)
 
-    frame_paths = sorted(output_dir.glob("frame-*.jpg"))
     if len(frame_paths) < MINIMUM_KIRI_IMAGE_COUNT:
         raise RuntimeError(
             f"Only {len(frame_paths)} usable frames were extracted from the uploaded video; "
@@ -192,8 +320,9 @@ def _normalize_video_for_frame_extraction(
     ffmpeg_path: str,
     source_video_path: Path,
     normalized_video_path: Path,
+    threads: int | None = None,
 ) -> Path:
-    threads = _ffmpeg_threads()
+    threads = threads or _ffmpeg_threads()
     max_dimension = _normalized_max_dimension()
     normalized_video_path.parent.mkdir(parents=True, exist_ok=True)
     command = [
@@ -236,25 +365,29 @@ def _normalize_video_for_frame_extraction(
     return normalized_video_path
 
 
-def extract_video_frames_to_images(*, video_path: Path, output_dir: Path) -> ExtractedVideoFrames:
+def extract_video_frames_to_images(
+    *,
+    video_path: Path,
+    output_dir: Path,
+    threads: int | None = None,
+) -> ExtractedVideoFrames:
+    """Probe, extract and select frames; threads overrides AR_VIDEO_FFMPEG_THREADS."""
     ffmpeg = _require_binary("ffmpeg")
     ffprobe = _require_binary("ffprobe")
 
     probe = probe_video(video_path=video_path, ffprobe_path=ffprobe)
     desired_frame_count = _desired_frame_count(duration_seconds=probe.duration_seconds)
-    normalize_before_extraction = max(probe.width, probe.height) > _normalized_max_dimension()
 
+    # Large sources are scaled inside the extraction pass; the libx264 re-encode
+    # below only runs when ffmpeg cannot decode the upload directly.
     try:
-        if normalize_before_extraction:
-            raise RuntimeError(
-                f"Source video is {probe.width}x{probe.height}; normalizing before extraction"
-            )
         frame_paths = _extract_frames_with_ffmpeg(
             ffmpeg_path=ffmpeg,
             video_path=video_path,
             output_dir=output_dir,
             desired_frame_count=desired_frame_count,
             duration_seconds=probe.duration_seconds,
+            threads=threads,
         )
         used_normalized_video = False
     except RuntimeError as direct_error:
@@ -267,6 +400,7 @@ def extract_video_frames_to_images(*, video_path: Path, output_dir: Path) -> Ext
                 ffmpeg_path=ffmpeg,
                 source_video_path=video_path,
                 normalized_video_path=normalized_video_path,
+                threads=threads,
             )
             frame_paths = _extract_frames_with_ffmpeg(
                 ffmpeg_path=ffmpeg,
@@ -274,6 +408,7 @@ def extract_video_frames_to_images(*, video_path: Path, output_dir: Path) -> Ext
                 output_dir=output_dir,
                 desired_frame_count=desired_frame_count,
                 duration_seconds=probe.duration_seconds,
+                threads=threads,
             )
             used_normalized_video = True
         except RuntimeError as normalized_error: